@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "corsheaders",
     "rest_framework",
     "drf_spectacular",
@@ -34,18 +35,28 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "platform_org.health.middleware.ProbeMiddleware",
+    "platform_org.core.middleware.MetricsMiddleware",
+    "platform_org.core.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "platform_org.core.middleware.StaticFilesMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "platform_org.tenancy.middleware.TenantMiddleware",
+    "platform_org.audit.middleware.AuditBufferMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# ---- Query profiling (opt-in; adds Server-Timing and logs N+1 candidates) ----
+QUERY_PROFILER_ENABLED = env.bool("QUERY_PROFILER_ENABLED", default=False)
+QUERY_PROFILER_N1_THRESHOLD = env.int("QUERY_PROFILER_N1_THRESHOLD", default=5)
+if QUERY_PROFILER_ENABLED:
+    MIDDLEWARE.insert(0, "platform_org.core.middleware.QueryProfilerMiddleware")
+
 ROOT_URLCONF = "config.urls"
 TEMPLATES = [
     {
@@ -62,9 +73,37 @@ TEMPLATES = [
 ]
 
 ASGI_APPLICATION = "config.asgi.application"
+# ---- Database ----
+# DATABASE_POOL switches each process to a psycopg3 connection pool (Django >= 5.1) instead of one
+# persistent connection per worker thread; persistent connections must then be off.
+DATABASE_POOL = env.bool("DATABASE_POOL", default=False)
+DATABASE_POOL_OPTIONS = {
+    "min_size": env.int("DATABASE_POOL_MIN_SIZE", default=2),
+    "max_size": env.int("DATABASE_POOL_MAX_SIZE", default=10),
+    "timeout": env.float("DATABASE_POOL_TIMEOUT", default=10.0),
+}
+# Seconds libpq waits to reach the server before a connection attempt (and the /readyz database probe) fails.
+DATABASE_CONNECT_TIMEOUT = env.int("DATABASE_CONNECT_TIMEOUT", default=5)
+
+
+def _database(url):
+    db = dj_database_url.parse(url, conn_max_age=0 if DATABASE_POOL else 600, ssl_require=False)
+    if db["ENGINE"].endswith("postgresql"):
+        db.setdefault("OPTIONS", {}).setdefault("connect_timeout", DATABASE_CONNECT_TIMEOUT)
+    if DATABASE_POOL:
+        db.setdefault("OPTIONS", {})["pool"] = dict(DATABASE_POOL_OPTIONS)
+    return db
+
+
 DATABASES = {
-    "default": dj_database_url.parse(env("DATABASE_URL"),conn_max_age=600, ssl_require=False)
+    "default": _database(env("DATABASE_URL"))
 }
+# Optional read replica: safe-method requests and read-heavy tasks read from it (platform_org.core.db).
+# After a write the client is pinned to the primary for DATABASE_REPLICA_PIN_SECONDS.
+if env("DATABASE_REPLICA_URL", default=""):
+    DATABASES["replica"] = {**_database(env("DATABASE_REPLICA_URL")), "TEST": {"MIRROR": "default"}}
+DATABASE_ROUTERS = ["platform_org.core.db.PrimaryReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=10)
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STORAGES = {
@@ -84,7 +123,15 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "platform_org.core.authentication.EntraIDAuthentication","rest_framework_simplejwt.authentication.JWTAuthentication"],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
+    "DEFAULT_FILTER_BACKENDS": ["platform_org.core.search.TenantSearchFilter"],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    # orjson-backed when the "speedups" extra is installed, DRF's stdlib encoder otherwise.
+    "DEFAULT_RENDERER_CLASSES": ["platform_org.core.renderers.FastJSONRenderer", "rest_framework.renderers.BrowsableAPIRenderer"],
+    "DEFAULT_PARSER_CLASSES": [
+        "platform_org.core.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "PAGE_SIZE": 50,
 }
 SPECTACULAR_SETTINGS = {"TITLE": "Platform Org API", "VERSION": "0.3.0"}
@@ -103,6 +150,49 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "Asia/Baghdad"
+CELERY_TASK_ROUTES = {
+    "platform_org.audit.tasks.write_audit_events": {"queue": env("AUDIT_QUEUE", default="celery")},
+}
+
+# ---- Cache ----
+# "default" is shared by every worker: CACHE_URL is redis://..., fakeredis:// (an in-process Redis for tests,
+# from the "test" extra) or locmem://. "local" is a small per-process tier in front of it, see core/caching.py.
+CACHE_URL = env("CACHE_URL", default=REDIS_URL)
+CACHE_SOCKET_TIMEOUT = env.float("CACHE_SOCKET_TIMEOUT", default=0.5)
+if CACHE_URL.startswith("locmem://"):
+    _shared_cache = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "platform-org-shared"}
+elif CACHE_URL.startswith("fakeredis://"):
+    import fakeredis
+
+    _shared_cache = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_URL.replace("fakeredis://", "redis://", 1),
+        "OPTIONS": {"connection_class": fakeredis.FakeConnection},
+    }
+else:
+    _shared_cache = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_URL,
+        "OPTIONS": {"socket_timeout": CACHE_SOCKET_TIMEOUT, "socket_connect_timeout": CACHE_SOCKET_TIMEOUT},
+    }
+CACHES = {
+    "default": {**_shared_cache, "KEY_PREFIX": "platform-org", "TIMEOUT": 300},
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "platform-org-local",
+        "TIMEOUT": 5,
+        "OPTIONS": {"MAX_ENTRIES": env.int("CACHE_LOCAL_MAX_ENTRIES", default=5000)},
+    },
+}
+
+# ---- Audit ----
+# Events are buffered per request/task and bulk-written on commit; AUDIT_ASYNC ships them to a worker instead.
+AUDIT_ASYNC = env.bool("AUDIT_ASYNC", default=False)
+AUDIT_BATCH_SIZE = env.int("AUDIT_BATCH_SIZE", default=500)
+AUDIT_PARTITIONS_AHEAD = env.int("AUDIT_PARTITIONS_AHEAD", default=3)
+AUDIT_RETENTION_MONTHS = env.int("AUDIT_RETENTION_MONTHS", default=24)
+AUDIT_RETENTION_DETACH_ONLY = env.bool("AUDIT_RETENTION_DETACH_ONLY", default=False)
+AUDIT_API_DEFAULT_DAYS = env.int("AUDIT_API_DEFAULT_DAYS", default=30)
 
 
 CELERY_BEAT_SCHEDULE = {
@@ -114,13 +204,103 @@ CELERY_BEAT_SCHEDULE = {
         "task": "platform_org.core.vam_engine.compute_autonomy_scores",
         "schedule": 86400.0,
     },
+    "dashboard-counters-hourly": {
+        "task": "platform_org.core.counters.reconcile_tenant_counters",
+        "schedule": 3600.0,
+    },
+    "ticket-sync-every-5-min": {
+        "task": "platform_org.integrations.tasks.sync_ticket_sources",
+        "schedule": 300.0,
+    },
+    "audit-partitions-daily": {
+        "task": "platform_org.audit.tasks.maintain_audit_partitions",
+        "schedule": 86400.0,
+    },
+    "sla-rollups-repair-daily": {
+        "task": "platform_org.sla.rollups.repair_sla_rollups",
+        "schedule": 86400.0,
+    },
+    "sla-partitions-daily": {
+        "task": "platform_org.sla.tasks.maintain_sla_partitions",
+        "schedule": 86400.0,
+    },
+    "sla-archive-daily": {
+        "task": "platform_org.sla.tasks.archive_closed_requests",
+        "schedule": 86400.0,
+    },
 }
 
 
+# ---- Dashboard ----
+DASHBOARD_SUMMARY_TTL = env.int("DASHBOARD_SUMMARY_TTL", default=30)
+# List views show a planner estimate instead of an exact COUNT(*) above this many rows.
+LIST_COUNT_ESTIMATE_THRESHOLD = env.int("LIST_COUNT_ESTIMATE_THRESHOLD", default=10000)
+
+
 # ---- Entra ID (Azure AD) ----
 ENTRA_TENANT_ID = os.getenv("ENTRA_TENANT_ID", "")
 ENTRA_CLIENT_ID = os.getenv("ENTRA_CLIENT_ID", "")
 ENTRA_ALLOWED_ISSUER = os.getenv("ENTRA_ALLOWED_ISSUER", "")
+# Override the JWKS location derived from the token issuer; only for load tests against a local stand-in, so it
+# is ignored unless DEBUG or LOADTEST is on.
+ENTRA_JWKS_URL = os.getenv("ENTRA_JWKS_URL", "")
+LOADTEST = env.bool("LOADTEST", default=False)
+
+# ---- Ticketing integrations (Jira / Jitbit) ----
+INTEGRATION_HTTP_TIMEOUT = env.float("INTEGRATION_HTTP_TIMEOUT", default=30.0)
+INTEGRATION_HTTP_MAX_CONNECTIONS = env.int("INTEGRATION_HTTP_MAX_CONNECTIONS", default=10)
+INTEGRATION_WEBHOOK_REDIS_URL = env("INTEGRATION_WEBHOOK_REDIS_URL", default=REDIS_URL)
+INTEGRATION_WEBHOOK_COALESCE_SECONDS = env.float("INTEGRATION_WEBHOOK_COALESCE_SECONDS", default=2.0)
+INTEGRATION_WEBHOOK_BATCH_SIZE = env.int("INTEGRATION_WEBHOOK_BATCH_SIZE", default=500)
+INTEGRATION_WEBHOOK_DEDUP_TTL = env.int("INTEGRATION_WEBHOOK_DEDUP_TTL", default=86400)
+
+# ---- Metrics ----
+# Set PROMETHEUS_MULTIPROC_DIR (a writable, per-pod directory) when running several worker processes.
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+SLA_DUE_SOON_HOURS = env.int("SLA_DUE_SOON_HOURS", default=4)
+
+# ---- Health probes ----
+# /livez only proves the process serves requests; /readyz checks DB, Redis and the Celery broker,
+# each bounded by HEALTH_CHECK_TIMEOUT seconds (reaching the database by DATABASE_CONNECT_TIMEOUT), and caches the
+# verdict per process. Failures are logged; the response only reports each check's status.
+HEALTH_CHECK_TIMEOUT = env.float("HEALTH_CHECK_TIMEOUT", default=1.0)
+HEALTH_CHECK_CACHE_SECONDS = env.float("HEALTH_CHECK_CACHE_SECONDS", default=5.0)
+
+# ---- SLA event stream (/api/async/sla/breaches/stream/) ----
+SLA_STREAM_REDIS_URL = env("SLA_STREAM_REDIS_URL", default=REDIS_URL)
+# Events buffered per client before its backlog is replaced by a "resync" event.
+SLA_STREAM_QUEUE_SIZE = env.int("SLA_STREAM_QUEUE_SIZE", default=100)
+SLA_STREAM_HEARTBEAT_SECONDS = env.float("SLA_STREAM_HEARTBEAT_SECONDS", default=15.0)
+SLA_STREAM_RETRY_MS = env.int("SLA_STREAM_RETRY_MS", default=5000)
+SLA_STREAM_REPLAY_LIMIT = env.int("SLA_STREAM_REPLAY_LIMIT", default=200)
+
+# ---- SLA business calendars ----
+SLA_CALENDAR_DEFAULT_TIMEZONE = env("SLA_CALENDAR_DEFAULT_TIMEZONE", default=CELERY_TIMEZONE)
+# Span of the precomputed business-hours index around today; wider lookups grow it on demand.
+SLA_CALENDAR_INDEX_PAST_DAYS = env.int("SLA_CALENDAR_INDEX_PAST_DAYS", default=400)
+SLA_CALENDAR_INDEX_FUTURE_DAYS = env.int("SLA_CALENDAR_INDEX_FUTURE_DAYS", default=400)
+
+# ---- SLA breach re-evaluation (reevaluate_sla_breaches) ----
+SLA_REEVALUATION_SHARDS = env.int("SLA_REEVALUATION_SHARDS", default=8)
+SLA_REEVALUATION_CHUNK_SIZE = env.int("SLA_REEVALUATION_CHUNK_SIZE", default=2000)
+
+# ---- SLA compliance rollups (/api/sla/compliance/) ----
+# Changes within this window are recomputed by one task run.
+SLA_ROLLUP_COALESCE_SECONDS = env.int("SLA_ROLLUP_COALESCE_SECONDS", default=10)
+SLA_ROLLUP_BATCH_SIZE = env.int("SLA_ROLLUP_BATCH_SIZE", default=500)
+# The daily repair recomputes every rollup opened within this many days.
+SLA_ROLLUP_REPAIR_DAYS = env.int("SLA_ROLLUP_REPAIR_DAYS", default=35)
+
+# ---- SLA table partitions ----
+# Monthly partitions of service requests and breaches kept ready by maintain_sla_partitions: this many months
+# ahead, and back for writes dated in the past (synced tickets, breaches at their deadline).
+SLA_PARTITIONS_AHEAD = env.int("SLA_PARTITIONS_AHEAD", default=3)
+SLA_PARTITIONS_BEHIND = env.int("SLA_PARTITIONS_BEHIND", default=24)
+
+# ---- SLA request archive (archive_sla_requests) ----
+# Requests resolved or closed this many days ago move to the archive; Tenant.archive_closed_after_days overrides, 0 disables.
+SLA_ARCHIVE_AFTER_DAYS = env.int("SLA_ARCHIVE_AFTER_DAYS", default=365)
+SLA_ARCHIVE_BATCH_SIZE = env.int("SLA_ARCHIVE_BATCH_SIZE", default=5000)
 
 # ---- Alerts ----
 TEAMS_WEBHOOK_URL = os.getenv("TEAMS_WEBHOOK_URL", "")
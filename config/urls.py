@@ -5,6 +5,8 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 urlpatterns = [
     path("", include(("platform_org.urls", "platform_org"), namespace="platform_org")),
     path("", include("platform_org.sla.urls")),
+    path("", include("platform_org.audit.urls")),
+    path("", include("platform_org.integrations.urls")),
     path("accounts/", include("django.contrib.auth.urls")),
     path("admin/", admin.site.urls),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -2,4 +2,8 @@ from django.contrib import admin
 from .models import AuditEvent
 @admin.register(AuditEvent)
 class AuditEventAdmin(admin.ModelAdmin):
-    list_display = ("created_at","actor","action","entity_type","entity_id","summary")
+    list_display = ("created_at","tenant","actor","action","entity_type","entity_id","summary")
+    list_filter = ("tenant", "action")
+    list_select_related = ("tenant", "actor")
+    date_hierarchy = "created_at"
+    show_full_result_count = False
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import permissions, serializers, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+from platform_org.core.permissions import IsPlatformAdmin
+from .models import AuditEvent
+
+
+class AuditEventSerializer(serializers.ModelSerializer):
+    actor_username = serializers.CharField(source="actor.username", read_only=True, default=None)
+
+    class Meta:
+        model = AuditEvent
+        fields = ["id", "created_at", "tenant", "actor", "actor_username", "action", "entity_type", "entity_id", "summary", "payload"]
+
+
+class AuditCursorPagination(CursorPagination):
+    # Keyset pagination on created_at: no COUNT(*) and no OFFSET, so page cost is flat.
+    ordering = ("-created_at", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class AuditEventViewSet(viewsets.ReadOnlyModelViewSet):
+    """Tenant-scoped audit log. Filters: since, until, action, entity_type, entity_id, actor."""
+
+    serializer_class = AuditEventSerializer
+    permission_classes = [permissions.IsAuthenticated, IsPlatformAdmin]
+    pagination_class = AuditCursorPagination
+
+    def _parse_time(self, name):
+        raw = self.request.query_params.get(name)
+        if not raw:
+            return None
+        value = parse_datetime(raw)
+        if value is None:
+            raise ValidationError({name: "Expected an ISO 8601 datetime."})
+        return value if timezone.is_aware(value) else timezone.make_aware(value)
+
+    def get_queryset(self):
+        tenant = getattr(self.request, "tenant", None)
+        if not tenant:
+            return AuditEvent.objects.none()
+        params = self.request.query_params
+        # Always bound the time range so Postgres can prune to the relevant monthly partitions.
+        since = self._parse_time("since") or timezone.now() - timedelta(days=getattr(settings, "AUDIT_API_DEFAULT_DAYS", 30))
+        qs = AuditEvent.objects.filter(tenant=tenant, created_at__gte=since).select_related("actor")
+        until = self._parse_time("until")
+        if until:
+            qs = qs.filter(created_at__lt=until)
+        for param in ("action", "entity_type", "entity_id"):
+            if params.get(param):
+                qs = qs.filter(**{param: params[param]})
+        if params.get("actor"):
+            if not params["actor"].isdigit():
+                raise ValidationError({"actor": "Expected a user id."})
+            qs = qs.filter(actor_id=int(params["actor"]))
+        return qs
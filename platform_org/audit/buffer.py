@@ -0,0 +1,83 @@
+import contextvars
+import logging
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from kombu.exceptions import OperationalError
+
+from .models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+_buffer = contextvars.ContextVar("audit_buffer", default=None)
+
+
+def record(event: AuditEvent):
+    """Queue an unsaved AuditEvent; it is only kept if the surrounding transaction commits."""
+    events = _buffer.get()
+    if events is None:
+        transaction.on_commit(partial(write, [event]))
+    else:
+        transaction.on_commit(partial(events.append, event))
+
+
+def begin():
+    return _buffer.set([])
+
+
+def pop(token):
+    events = _buffer.get()
+    _buffer.reset(token)
+    return events
+
+
+def end(token):
+    events = pop(token)
+    if events is not None:
+        # Runs immediately in autocommit, or after the outer transaction commits.
+        transaction.on_commit(partial(write, events))
+
+
+@contextmanager
+def audit_scope():
+    """Collect every event logged inside the block and write them with one bulk_create."""
+    token = begin()
+    try:
+        yield
+    finally:
+        end(token)
+
+
+def to_row(event: AuditEvent) -> dict:
+    return {
+        "created_at": event.created_at.isoformat(),
+        "tenant_id": event.tenant_id,
+        "actor_id": event.actor_id,
+        "action": event.action,
+        "entity_type": event.entity_type,
+        "entity_id": event.entity_id,
+        "summary": event.summary,
+        "payload": event.payload,
+    }
+
+
+def from_row(row: dict) -> AuditEvent:
+    return AuditEvent(**{**row, "created_at": parse_datetime(row["created_at"])})
+
+
+def write(events):
+    if not events:
+        return
+    if getattr(settings, "AUDIT_ASYNC", False):
+        from .tasks import write_audit_events
+        rows = [to_row(e) for e in events]
+        try:
+            write_audit_events.delay(rows)
+            return
+        except OperationalError:
+            # Broker unavailable: never drop events, fall back to an inline write.
+            logger.exception("Audit queue unavailable, writing %d events inline", len(events))
+    AuditEvent.objects.bulk_create(events, batch_size=getattr(settings, "AUDIT_BATCH_SIZE", 500))
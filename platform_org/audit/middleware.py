@@ -0,0 +1,21 @@
+from asgiref.sync import sync_to_async
+
+from platform_org.core.middleware import HybridMiddleware
+from .buffer import audit_scope, begin, pop, write
+
+
+class AuditBufferMiddleware(HybridMiddleware):
+    """Buffer audit events for the whole request and flush them once on commit."""
+
+    def scope(self, request):
+        return audit_scope()
+
+    async def __acall__(self, request):
+        # Async views have no open transaction here, so the buffer is written directly, off the event loop.
+        token = begin()
+        try:
+            return await self.get_response(request)
+        finally:
+            events = pop(token)
+            if events:
+                await sync_to_async(write)(events)
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+        ('tenancy', '0002_tenant_slug_alter_tenantuser_role'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditevent',
+            name='audit_audit_entity__0bff9a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditevent',
+            name='audit_audit_created_7710b7_idx',
+        ),
+        migrations.AddField(
+            model_name='auditevent',
+            name='tenant',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_events', to='tenancy.tenant'),
+        ),
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=models.Index(fields=['tenant', 'created_at'], name='audit_tenant_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=models.Index(fields=['tenant', 'entity_type', 'entity_id'], name='audit_tenant_entity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=models.Index(fields=['actor', 'created_at'], name='audit_actor_created_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def drop_default_partition(apps, schema_editor):
+    """Move rows out of audit_auditevent_default into monthly partitions and drop it (Postgres only).
+
+    Once the DEFAULT partition holds a row in a month's range, creating that month's partition fails, so
+    monthly creation would stop for good. maintain_audit_partitions keeps months ahead of time instead.
+    """
+    conn = schema_editor.connection
+    if conn.vendor != "postgresql":
+        return
+
+    from platform_org.audit.partitions import PARENT, add_months, create_partition, month_start
+
+    qn = conn.ops.quote_name
+    default = PARENT + "_default"
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s)", [default])
+        if cur.fetchone()[0] is None:
+            return
+        cur.execute(f"ALTER TABLE {qn(PARENT)} DETACH PARTITION {qn(default)}")
+        cur.execute(f"SELECT min(created_at), max(created_at) FROM {qn(default)}")
+        oldest, newest = cur.fetchone()
+        if oldest is not None:
+            month = month_start(oldest.date())
+            while month <= month_start(newest.date()):
+                create_partition(month, conn)
+                month = add_months(month, 1)
+            cur.execute(f"INSERT INTO {qn(PARENT)} SELECT * FROM {qn(default)}")
+        cur.execute(f"DROP TABLE {qn(default)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_partition_auditevent'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_default_partition, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,13 @@
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
+from platform_org.tenancy.models import Tenant
 
 class AuditEvent(models.Model):
+    """Append-only audit row. On Postgres the table is range-partitioned by month on created_at."""
+
     created_at = models.DateTimeField(default=timezone.now, editable=False)
+    tenant = models.ForeignKey(Tenant, null=True, blank=True, on_delete=models.SET_NULL, related_name="audit_events")
     actor = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
     action = models.CharField(max_length=50)
     entity_type = models.CharField(max_length=100)
@@ -13,6 +17,7 @@ class AuditEvent(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=["entity_type", "entity_id"]),
-            models.Index(fields=["created_at"]),
+            models.Index(fields=["tenant", "created_at"], name="audit_tenant_created_idx"),
+            models.Index(fields=["tenant", "entity_type", "entity_id"], name="audit_tenant_entity_idx"),
+            models.Index(fields=["actor", "created_at"], name="audit_actor_created_idx"),
         ]
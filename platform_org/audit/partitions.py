@@ -0,0 +1,94 @@
+import datetime as dt
+import logging
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+PARENT = AuditEvent._meta.db_table
+PREFIX = f"{PARENT}_p"
+
+
+def month_start(value: dt.date) -> dt.date:
+    return dt.date(value.year, value.month, 1)
+
+
+def add_months(value: dt.date, months: int) -> dt.date:
+    index = value.year * 12 + value.month - 1 + months
+    return dt.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: dt.date) -> str:
+    return f"{PREFIX}{month:%Y%m}"
+
+
+def is_partitioned(conn=connection) -> bool:
+    if conn.vendor != "postgresql":
+        return False
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s", [PARENT])
+        return cur.fetchone() is not None
+
+
+def list_partitions(conn=connection) -> list[str]:
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s ORDER BY c.relname",
+            [PARENT],
+        )
+        return [row[0] for row in cur.fetchall()]
+
+
+def create_partition(month: dt.date, conn=connection) -> str:
+    name = partition_name(month)
+    qn = conn.ops.quote_name
+    with conn.cursor() as cur:
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(PARENT)} "
+            f"FOR VALUES FROM (%s) TO (%s)",
+            [f"{month:%Y-%m-%d} 00:00:00+00", f"{add_months(month, 1):%Y-%m-%d} 00:00:00+00"],
+        )
+    return name
+
+
+def ensure_partitions(months_ahead: int = 3, conn=connection) -> list[str]:
+    """Create the current month's partition and the next `months_ahead` ones.
+
+    There is no DEFAULT partition (it would block creating any month it holds rows for), so an event can only
+    be written once its month exists."""
+    if not is_partitioned(conn):
+        return []
+    current = month_start(timezone.now().date())
+    return [create_partition(add_months(current, i), conn) for i in range(months_ahead + 1)]
+
+
+def apply_retention(retention_months: int, detach_only: bool = False, conn=connection) -> list[str]:
+    """Detach (and by default drop) whole monthly partitions older than the retention window."""
+    cutoff = add_months(month_start(timezone.now().date()), -retention_months)
+    if not is_partitioned(conn):
+        # Partition bounds are UTC midnights; match them.
+        since = dt.datetime.combine(cutoff, dt.time.min, tzinfo=dt.timezone.utc)
+        deleted, _ = AuditEvent.objects.filter(created_at__lt=since).delete()
+        logger.info("Audit retention deleted %d rows older than %s", deleted, cutoff)
+        return []
+
+    qn = conn.ops.quote_name
+    removed = []
+    for name in list_partitions(conn):
+        suffix = name[len(PREFIX):]
+        if not name.startswith(PREFIX) or not suffix.isdigit():
+            continue
+        month = dt.date(int(suffix[:4]), int(suffix[4:]), 1)
+        if add_months(month, 1) > cutoff:
+            continue
+        with transaction.atomic(using=conn.alias), conn.cursor() as cur:
+            cur.execute(f"ALTER TABLE {qn(PARENT)} DETACH PARTITION {qn(name)}")
+            if not detach_only:
+                cur.execute(f"DROP TABLE {qn(name)}")
+        removed.append(name)
+    return removed
@@ -0,0 +1,37 @@
+from celery import shared_task
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+
+from .buffer import begin, end, from_row
+from .partitions import apply_retention, ensure_partitions
+from .models import AuditEvent
+
+_task_tokens = {}
+
+
+@shared_task(ignore_result=True)
+def write_audit_events(rows: list[dict]):
+    AuditEvent.objects.bulk_create([from_row(r) for r in rows], batch_size=getattr(settings, "AUDIT_BATCH_SIZE", 500))
+    return len(rows)
+
+
+@task_prerun.connect
+def _open_audit_scope(task_id=None, **kwargs):
+    _task_tokens[task_id] = begin()
+
+
+@task_postrun.connect
+def _flush_audit_scope(task_id=None, **kwargs):
+    token = _task_tokens.pop(task_id, None)
+    if token is not None:
+        end(token)
+
+
+@shared_task
+def maintain_audit_partitions():
+    created = ensure_partitions(getattr(settings, "AUDIT_PARTITIONS_AHEAD", 3))
+    removed = apply_retention(
+        getattr(settings, "AUDIT_RETENTION_MONTHS", 24),
+        detach_only=getattr(settings, "AUDIT_RETENTION_DETACH_ONLY", False),
+    )
+    return {"ensured": created, "removed": removed}
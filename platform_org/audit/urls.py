@@ -0,0 +1,10 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .api import AuditEventViewSet
+
+router = DefaultRouter()
+router.register(r"audit/events", AuditEventViewSet, basename="audit-events")
+
+urlpatterns = [
+    path("api/", include(router.urls)),
+]
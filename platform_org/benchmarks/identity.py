@@ -0,0 +1,95 @@
+import hashlib
+import json
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import PyJWKClient
+from jwt.algorithms import RSAAlgorithm
+
+
+class LocalEntraIssuer:
+    """Offline stand-in for Entra ID: signs RS256 tokens and serves the matching JWKS.
+
+    ``with issuer.installed():`` makes EntraIDAuthentication fetch keys from this object
+    instead of login.microsoftonline.com, so auth cost can be measured without the network.
+    """
+
+    def __init__(self, directory_id="00000000-0000-0000-0000-00000000bench", kid=None, key=None):
+        self._key = key or rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        # The kid follows the key, so a long-running API only ever needs to fetch a given JWKS once.
+        public = self._key.public_key().public_bytes(serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+        self.kid = kid or f"bench-{hashlib.sha256(public).hexdigest()[:12]}"
+        self.issuer = f"https://login.microsoftonline.com/{directory_id}/v2.0"
+        self.directory_id = directory_id
+        jwk = json.loads(RSAAlgorithm.to_jwk(self._key.public_key()))
+        self.jwks = {"keys": [{**jwk, "kid": self.kid, "use": "sig", "alg": "RS256"}]}
+
+    @classmethod
+    def persistent(cls, path=None, **kwargs):
+        """Issuer whose key survives between runs.
+
+        PyJWKClient will not refetch the JWKS for an unknown kid during its cooldown, so a fresh key per
+        load test run made every token after the first run against the same API fail verification.
+        """
+        path = Path(path or Path(tempfile.gettempdir()) / "platform-org-loadtest-key.pem")
+        if path.exists():
+            key = serialization.load_pem_private_key(path.read_bytes(), password=None)
+        else:
+            key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            path.write_bytes(key.private_bytes(
+                serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+            ))
+            path.chmod(0o600)
+        return cls(key=key, **kwargs)
+
+    def token(self, username, ttl=3600, **claims):
+        now = int(time.time())
+        payload = {
+            "iss": self.issuer,
+            "tid": self.directory_id,
+            "sub": str(uuid.uuid5(uuid.NAMESPACE_DNS, username)),
+            "preferred_username": username,
+            "iat": now,
+            "nbf": now,
+            "exp": now + ttl,
+            **claims,
+        }
+        return jwt.encode(payload, self._key, algorithm="RS256", headers={"kid": self.kid})
+
+    @contextmanager
+    def installed(self):
+        with mock.patch.object(PyJWKClient, "fetch_data", lambda client: self.jwks):
+            yield self
+
+    @contextmanager
+    def serve(self, host="0.0.0.0", port=8765):
+        """Serve the JWKS over HTTP for an out-of-process API started with LOADTEST=true ENTRA_JWKS_URL=http://<host>:<port>/keys."""
+        body = json.dumps(self.jwks).encode()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://{host}:{server.server_port}/keys"
+        finally:
+            server.shutdown()
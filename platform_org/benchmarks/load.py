@@ -0,0 +1,129 @@
+"""Asyncio HTTP load generator for the API with local Entra tokens and X-Tenant routing."""
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable
+
+import httpx
+from django.contrib.auth import get_user_model
+
+from platform_org.core.models import MEContract
+from platform_org.sla.models import ServiceRequest
+from platform_org.tenancy.models import TenantUser
+
+
+@dataclass
+class TenantSession:
+    slug: str
+    token: str
+    contract_ids: list
+    request_ids: list
+
+
+@dataclass
+class Endpoint:
+    name: str
+    weight: int
+    build: Callable[[TenantSession, random.Random], tuple]  # -> (method, url, json or None)
+    write: bool = False
+
+
+def _pick(rng, ids):
+    return rng.choice(ids) if ids else 0
+
+
+ENDPOINTS = [
+    Endpoint("GET /api/micro-enterprises/", 20, lambda t, rng: ("GET", "/api/micro-enterprises/", None)),
+    Endpoint("GET /api/contracts/", 15, lambda t, rng: ("GET", "/api/contracts/", None)),
+    Endpoint("GET /api/sla/requests/", 20, lambda t, rng: ("GET", "/api/sla/requests/", None)),
+    Endpoint("GET /api/sla/requests/?q=", 5, lambda t, rng: ("GET", f"/api/sla/requests/?q={rng.choice(['vpn', 'printer', 'laptop', 'badge'])}", None)),
+    Endpoint("GET /api/sla/requests/{id}/", 15, lambda t, rng: ("GET", f"/api/sla/requests/{_pick(rng, t.request_ids)}/", None)),
+    Endpoint("GET /api/sla/breaches/", 10, lambda t, rng: ("GET", "/api/sla/breaches/", None)),
+    Endpoint("POST /api/sla/requests/", 8, lambda t, rng: ("POST", "/api/sla/requests/", {
+        "contract": _pick(rng, t.contract_ids), "title": f"Load test ticket {rng.randint(1, 10**9)}", "priority": "MEDIUM",
+    }), write=True),
+    Endpoint("PATCH /api/sla/requests/{id}/", 7, lambda t, rng: ("PATCH", f"/api/sla/requests/{_pick(rng, t.request_ids)}/", {
+        "status": rng.choice([ServiceRequest.Status.IN_PROGRESS, ServiceRequest.Status.RESOLVED]),
+    }), write=True),
+]
+
+
+# Read endpoints that have an async twin under /api/async/ (platform_org.core.asyncapi).
+ASYNC_VARIANTS = {
+    "GET /api/micro-enterprises/", "GET /api/sla/requests/", "GET /api/sla/requests/?q=", "GET /api/sla/breaches/",
+}
+
+
+def prepare_tenants(tenants, issuer, sample=500):
+    """Give every tenant a load-test admin and sample ids so requests hit real rows."""
+    sessions = []
+    for tenant in tenants:
+        username = f"load-{tenant.code}@platform-org.local"
+        user, _ = get_user_model().objects.get_or_create(username=username)
+        TenantUser.objects.update_or_create(
+            tenant=tenant, user=user, defaults={"role": TenantUser.Role.PLATFORM_ADMIN, "is_active": True}
+        )
+        sessions.append(TenantSession(
+            slug=tenant.slug,
+            token=issuer.token(username, ttl=24 * 3600),
+            contract_ids=list(MEContract.objects.filter(tenant=tenant).values_list("id", flat=True)[:sample]),
+            request_ids=list(
+                ServiceRequest.objects.filter(tenant=tenant).order_by("-id").values_list("id", flat=True)[:sample]
+            ),
+        ))
+    return sessions
+
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+def summarize(samples, duration):
+    report = {}
+    for name, rows in sorted(samples.items()):
+        latencies = sorted(ms for ms, _ in rows)
+        errors = sum(1 for _, ok in rows if not ok)
+        report[name] = {
+            "requests": len(rows),
+            "rps": round(len(rows) / duration, 1),
+            "errors": errors,
+            "error_rate": round(errors / len(rows), 4) if rows else 0.0,
+            "p50_ms": round(statistics.median(latencies), 1) if latencies else 0.0,
+            "p95_ms": round(_percentile(latencies, 95), 1),
+            "p99_ms": round(_percentile(latencies, 99), 1),
+        }
+    return report
+
+
+async def run_load(transport, base_url, sessions, concurrency, duration, read_only=False, seed=1, async_reads=False):
+    endpoints = [e for e in ENDPOINTS if not (read_only and e.write)]
+    weights = [e.weight for e in endpoints]
+    samples = defaultdict(list)
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(n):
+            rng = random.Random(f"{seed}:{n}")
+            while time.monotonic() < deadline:
+                session = rng.choice(sessions)
+                endpoint = rng.choices(endpoints, weights)[0]
+                method, url, body = endpoint.build(session, rng)
+                if async_reads and endpoint.name in ASYNC_VARIANTS:
+                    url = url.replace("/api/", "/api/async/", 1)
+                headers = {"Authorization": f"Bearer {session.token}", "X-Tenant": session.slug}
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, url, json=body, headers=headers)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                samples[endpoint.name].append(((time.perf_counter() - start) * 1000, ok))
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.monotonic() - started
+    return summarize(samples, elapsed), elapsed
@@ -0,0 +1,82 @@
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import django
+from django.db import transaction
+
+from platform_org.core.profiling import profile_queries
+from .scenarios import SCENARIOS, Context
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def measure(fn, iterations, warmup=1):
+    """Time ``fn``; every call runs in a savepoint that is rolled back so iterations see the same data."""
+    timings, queries = [], []
+    for i in range(warmup + iterations):
+        sid = transaction.savepoint()
+        try:
+            with profile_queries() as profile:
+                start = time.perf_counter()
+                fn()
+                elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            transaction.savepoint_rollback(sid)
+        if i >= warmup:
+            timings.append(elapsed)
+            queries.append(profile.count)
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "min_ms": round(timings[0], 2),
+        "median_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "queries": int(statistics.median(queries)),
+    }
+
+
+def run(tenant, names=None, iterations=5, warmup=1, log=print):
+    results = {}
+    with transaction.atomic():
+        ctx = Context.build(tenant)
+        for name in names or SCENARIOS:
+            fn = SCENARIOS[name].setup(ctx)
+            results[name] = measure(fn, iterations, warmup)
+            log(f"{name}: median {results[name]['median_ms']} ms, {results[name]['queries']} queries")
+        transaction.set_rollback(True)
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git": _git_revision(),
+            "tenant": tenant.code,
+            "requests": tenant.service_requests.count(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(current, baseline, threshold_pct):
+    """Scenarios whose median slowed by more than threshold_pct, or that now issue more queries."""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        limit = before["median_ms"] * (1 + threshold_pct / 100)
+        if result["median_ms"] > limit:
+            change = (result["median_ms"] / before["median_ms"] - 1) * 100 if before["median_ms"] else float("inf")
+            regressions.append(f"{name}: median {before['median_ms']} -> {result['median_ms']} ms (+{change:.0f}%)")
+        if result["queries"] > before["queries"]:
+            regressions.append(f"{name}: queries {before['queries']} -> {result['queries']}")
+    return regressions
@@ -0,0 +1,190 @@
+"""Fixed hot-path scenarios run against a synthetic tenant (see generate_synthetic_data).
+
+Each scenario's ``setup(ctx)`` returns a zero-argument callable, so the same scenarios can be
+timed by the run_benchmarks command or handed to pytest-benchmark's ``benchmark(fn)``.
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from functools import partial
+from itertools import count
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from platform_org.core.authentication import EntraIDAuthentication
+from platform_org.core.caching import invalidate
+from platform_org.core.models import MEContract, MEOwner, MEService
+from platform_org.core.renderers import FastJSONRenderer
+from platform_org.core.serializers import MEContractSerializer
+from platform_org.core.vam_engine import compute_autonomy_scores
+from platform_org.sla.tasks import check_sla_breaches
+from platform_org.tenancy.middleware import TenantMiddleware
+from platform_org.tenancy.models import Tenant, TenantUser
+from .identity import LocalEntraIssuer
+
+BENCH_USERNAME = "bench@platform-org.local"
+
+
+@dataclass
+class Context:
+    tenant: Tenant
+    user: object
+    issuer: LocalEntraIssuer
+    client: Client = field(default_factory=Client)
+    api: APIClient = field(default_factory=APIClient)
+
+    @classmethod
+    def build(cls, tenant):
+        """Create the benchmark user; callers run everything inside a rolled-back transaction."""
+        user, _ = get_user_model().objects.get_or_create(username=BENCH_USERNAME)
+        TenantUser.objects.update_or_create(
+            tenant=tenant, user=user, defaults={"role": TenantUser.Role.PLATFORM_ADMIN, "is_active": True}
+        )
+        consumer = tenant.micro_enterprises.order_by("id").first()
+        MEOwner.objects.get_or_create(tenant=tenant, me=consumer, user=user, defaults={"is_primary": True})
+        ctx = cls(tenant=tenant, user=user, issuer=LocalEntraIssuer())
+        ctx.client.force_login(user)
+        ctx.api.force_authenticate(user)
+        return ctx
+
+    def get(self, url):
+        response = self.client.get(url, HTTP_X_TENANT=self.tenant.slug)
+        assert response.status_code == 200, f"GET {url} -> {response.status_code}"
+        return response
+
+
+@dataclass
+class Scenario:
+    name: str
+    setup: Callable[[Context], Callable[[], object]]
+    description: str = ""
+
+
+def _sla_sweep(ctx):
+    return check_sla_breaches
+
+
+def _autonomy_scores(ctx):
+    return compute_autonomy_scores
+
+
+def _contract_form_data(ctx, provider, code):
+    services = list(MEService.objects.filter(tenant=ctx.tenant, provider_me=provider).order_by("id")[:12])
+    templates = list(ctx.tenant.sla_templates.order_by("id"))
+    data = {"code": code, "provider_me": provider.pk, "start_date": date.today().isoformat(), "selected_services": []}
+    for i, service in enumerate(services):
+        data["selected_services"].append(service.pk)
+        data[f"sla_{service.pk}"] = templates[i % len(templates)].pk if templates else ""
+        if i % 2:
+            data[f"billing_type_{service.pk}"] = "QUANTITY"
+            data[f"quantity_{service.pk}"] = str(i + 1)
+    return data
+
+
+def _contract_create(ctx):
+    provider = ctx.tenant.micro_enterprises.order_by("-id").first()
+    seq = count(1)
+    url = reverse("platform_org:contract_create")
+
+    def run():
+        data = _contract_form_data(ctx, provider, f"BENCH-{next(seq):06d}")
+        response = ctx.client.post(url, data, HTTP_X_TENANT=ctx.tenant.slug)
+        assert response.status_code == 302, f"contract create -> {response.status_code}"
+
+    return run
+
+
+def _contract_update(ctx):
+    contract = MEContract.objects.filter(tenant=ctx.tenant).order_by("id").first()
+    url = reverse("platform_org:contract_edit", args=[contract.pk])
+    data = _contract_form_data(ctx, contract.provider_me, contract.code)
+
+    def run():
+        response = ctx.client.post(url, data, HTTP_X_TENANT=ctx.tenant.slug)
+        assert response.status_code == 302, f"contract update -> {response.status_code}"
+
+    return run
+
+
+def _api_micro_enterprises(ctx):
+    def run():
+        response = ctx.api.get("/api/micro-enterprises/", HTTP_X_TENANT=ctx.tenant.slug)
+        assert response.status_code == 200, f"/api/micro-enterprises/ -> {response.status_code}"
+
+    return run
+
+
+def _tenant_and_auth(ctx):
+    factory = RequestFactory()
+    middleware = TenantMiddleware(lambda request: None)
+    auth = EntraIDAuthentication()
+    token = ctx.issuer.token(BENCH_USERNAME)
+
+    def run():
+        request = factory.get("/api/", HTTP_X_TENANT=ctx.tenant.slug, HTTP_AUTHORIZATION=f"Bearer {token}")
+        request.user = ctx.user
+        middleware.process_request(request)
+        with ctx.issuer.installed():
+            assert auth.authenticate(Request(request)) is not None
+
+    return run
+
+
+def _dashboard(ctx):
+    url = reverse("platform_org:dashboard")
+
+    def run():
+        invalidate(ctx.tenant, "dashboard")  # measure the uncached summary, not a cache hit
+        ctx.get(url)
+
+    return run
+
+
+def _contract_page(ctx, renderer_class):
+    contracts = (
+        MEContract.objects.filter(tenant=ctx.tenant)
+        .select_related("provider_me", "consumer_me")
+        .prefetch_related("contract_services__service", "contract_services__sla_template")
+        .order_by("id")[:500]
+    )
+    data = {"count": len(contracts), "results": MEContractSerializer(contracts, many=True).data}
+    renderer = renderer_class()
+    return lambda: renderer.render(data, "application/json")
+
+
+def _breach_list(ctx):
+    url = reverse("platform_org:sla_breaches")
+    return lambda: ctx.get(url)
+
+
+def _sla_compliance(ctx):
+    def run():
+        response = ctx.api.get("/api/sla/compliance/?group_by=provider_me&period=month", HTTP_X_TENANT=ctx.tenant.slug)
+        assert response.status_code == 200, f"/api/sla/compliance/ -> {response.status_code}"
+
+    return run
+
+
+SCENARIOS = {
+    s.name: s
+    for s in [
+        Scenario("sla_sweep", _sla_sweep, "check_sla_breaches over all open requests"),
+        Scenario("autonomy_scores", _autonomy_scores, "compute_autonomy_scores"),
+        Scenario("contract_create", _contract_create, "contract form POST with 12 priced service lines"),
+        Scenario("contract_update", _contract_update, "contract edit POST re-pricing 12 lines"),
+        Scenario("api_micro_enterprises", _api_micro_enterprises, "GET /api/micro-enterprises/ first page"),
+        Scenario("tenant_entra_auth", _tenant_and_auth, "TenantMiddleware + EntraIDAuthentication"),
+        Scenario("dashboard", _dashboard, "dashboard render with a cold summary cache"),
+        Scenario("breach_list", _breach_list, "SLA breach list first page"),
+        Scenario("render_contracts_stdlib", partial(_contract_page, renderer_class=JSONRenderer),
+                 "DRF JSONRenderer on a serialized 500-contract page"),
+        Scenario("render_contracts_fast", partial(_contract_page, renderer_class=FastJSONRenderer),
+                 "FastJSONRenderer (orjson when installed) on the same page"),
+        Scenario("sla_compliance", _sla_compliance, "12-month compliance by provider ME and month from the rollups"),
+    ]
+}
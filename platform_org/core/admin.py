@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     MicroEnterprise, MEOwner, SLATemplate, MEContract, VAMAgreement, MEKPI,
     MicroEnterpriseType, MicroEnterpriseStatus, MEService, ContractService, ContractStatus,
-    ServiceSLACost
+    ServiceSLACost, TenantCounter, BusinessCalendar
 )
 
 @admin.register(ServiceSLACost)
@@ -47,9 +47,15 @@ class MEOwnerAdmin(admin.ModelAdmin):
     list_filter = ("tenant", "is_primary")
     search_fields = ("me__name", "user__username")
 
+@admin.register(BusinessCalendar)
+class BusinessCalendarAdmin(admin.ModelAdmin):
+    list_display = ("name", "timezone", "tenant")
+    list_filter = ("tenant",)
+    search_fields = ("name",)
+
 @admin.register(SLATemplate)
 class SLATemplateAdmin(admin.ModelAdmin):
-    list_display = ("name", "response_time_hours", "resolution_time_hours", "availability_percent", "tenant")
+    list_display = ("name", "response_time_hours", "resolution_time_hours", "availability_percent", "calendar", "tenant")
     list_filter = ("tenant",)
     search_fields = ("name",)
 
@@ -81,3 +87,8 @@ class MEKPIAdmin(admin.ModelAdmin):
     list_display = ("code", "me", "name", "target_value", "actual_value", "tenant")
     list_filter = ("tenant", "me")
     search_fields = ("code", "name", "me__name")
+
+@admin.register(TenantCounter)
+class TenantCounterAdmin(admin.ModelAdmin):
+    list_display = ("tenant", "name", "value", "updated_at")
+    list_filter = ("tenant", "name")
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "platform_org.core"
+
+    def ready(self):
+        from . import counters  # noqa: F401  (connects counter signals)
+        from . import metrics  # noqa: F401  (connects Celery task metrics)
+        from . import profiling  # noqa: F401  (connects Celery query-profile signals)
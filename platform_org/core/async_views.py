@@ -0,0 +1,55 @@
+"""Async twins of the hottest MicroEnterprise reads (see platform_org.core.asyncapi)."""
+from django.http import Http404
+
+from .asyncapi import api_view, filter_queryset, paginate
+from .models import MEOwner, MEService, MicroEnterprise
+from .permissions import ais_platform_admin
+from .serializers import MicroEnterpriseSerializer
+from .views import MicroEnterpriseViewSet
+
+
+async def aowned_me_ids(user):
+    return [pk async for pk in MEOwner.objects.filter(user=user).values_list("me_id", flat=True)]
+
+
+async def me_queryset(request):
+    qs = MicroEnterprise.objects.filter(tenant=request.tenant).order_by("-created_at")
+    if not await ais_platform_admin(request.user):
+        qs = qs.filter(id__in=await aowned_me_ids(request.user))
+    return qs.select_related("me_type", "status").prefetch_related("owners")
+
+
+async def attach_services(mes):
+    """Load the MEs' service trees one depth level per query into the prefetch caches the serializers read."""
+    services = MEService.objects.select_related("provider_me", "parent").prefetch_related("sla_costs")
+    roots = {me.id: [] for me in mes}
+    level = [s async for s in services.filter(provider_me_id__in=roots, parent__isnull=True)]
+    for service in level:
+        roots[service.provider_me_id].append(service)
+    for me in mes:
+        me.__dict__.setdefault("_prefetched_objects_cache", {})["services"] = roots[me.id]
+    while level:
+        children = {service.id: [] for service in level}
+        next_level = [s async for s in services.filter(parent_id__in=children)]
+        for service in next_level:
+            children[service.parent_id].append(service)
+        for service in level:
+            service.__dict__.setdefault("_prefetched_objects_cache", {})["sub_services"] = children[service.id]
+        level = next_level
+
+
+@api_view
+async def micro_enterprise_list(request):
+    qs = filter_queryset(request, await me_queryset(request), MicroEnterpriseViewSet)
+    rows, envelope = await paginate(request, qs)
+    await attach_services(rows)
+    return envelope(MicroEnterpriseSerializer(rows, many=True, context={"request": request}).data)
+
+
+@api_view
+async def micro_enterprise_detail(request, pk):
+    me = await (await me_queryset(request)).filter(pk=pk).afirst()
+    if me is None:
+        raise Http404("No MicroEnterprise matches the given query.")
+    await attach_services([me])
+    return MicroEnterpriseSerializer(me, context={"request": request}).data
@@ -0,0 +1,101 @@
+"""Async counterpart of the DRF plumbing for the hot read-only endpoints.
+
+DRF views are sync, so under ASGI each one occupies a worker thread for its whole duration. These
+helpers authenticate with the configured DRF authentication classes, filter with the configured filter
+backends, paginate like LimitOffsetPagination and render with the first configured renderer, so the async
+endpoints return the same bodies and status codes as their viewset twins. Querysets must be fully prefetched:
+serializers run on the event loop, where a lazy relation access raises SynchronousOnlyOperation.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse, HttpResponseBase
+from rest_framework import exceptions
+from rest_framework.pagination import LimitOffsetPagination, _positive_int
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def render(data, status=200):
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+
+def authenticators():
+    return [cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+
+async def authenticate(request):
+    for authenticator in authenticators():
+        if hasattr(authenticator, "aauthenticate"):
+            result = await authenticator.aauthenticate(request)
+        else:
+            result = await sync_to_async(authenticator.authenticate)(request)
+        if result is not None:
+            request.user, request.auth = result
+            return
+    raise exceptions.NotAuthenticated()
+
+
+def api_view(view):
+    """GET-only async view: authenticates, then renders the data the view returns (responses pass through)."""
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return render({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+        try:
+            await authenticate(request)
+            result = await view(request, *args, **kwargs)
+            return result if isinstance(result, HttpResponseBase) else render(result)
+        except Http404 as exc:
+            return render({"detail": exceptions.NotFound(*exc.args).detail}, status=404)
+        except exceptions.APIException as exc:
+            response = render(exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}, status=exc.status_code)
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                # As in APIView: a 401 needs the first class's WWW-Authenticate challenge, otherwise it is a 403.
+                challenge = authenticators()[0].authenticate_header(request)
+                if challenge:
+                    response["WWW-Authenticate"] = challenge
+                else:
+                    response.status_code = 403
+            return response
+
+    return wrapper
+
+
+def filter_queryset(request, queryset, view):
+    """Apply DEFAULT_FILTER_BACKENDS; ``view`` only needs the attributes they read (e.g. the viewset class)."""
+    for backend in api_settings.DEFAULT_FILTER_BACKENDS:
+        queryset = backend().filter_queryset(request, queryset, view)
+    return queryset
+
+
+async def paginate(request, queryset):
+    """LimitOffsetPagination for an async view: returns (rows, envelope) where envelope(results) is the body."""
+    params = LimitOffsetPagination
+    try:
+        limit = _positive_int(request.GET[params.limit_query_param], strict=True, cutoff=params.max_limit)
+    except (KeyError, ValueError):
+        limit = api_settings.PAGE_SIZE
+    try:
+        offset = _positive_int(request.GET[params.offset_query_param])
+    except (KeyError, ValueError):
+        offset = 0
+
+    count = await queryset.acount()
+    rows = [] if count == 0 or offset > count else [obj async for obj in queryset[offset:offset + limit]]
+
+    url = replace_query_param(request.build_absolute_uri(), params.limit_query_param, limit)
+    next_link = None if offset + limit >= count else replace_query_param(url, params.offset_query_param, offset + limit)
+    if offset <= 0:
+        previous_link = None
+    elif offset - limit <= 0:
+        previous_link = remove_query_param(url, params.offset_query_param)
+    else:
+        previous_link = replace_query_param(url, params.offset_query_param, offset - limit)
+
+    def envelope(results):
+        return {"count": count, "next": next_link, "previous": previous_link, "results": results}
+
+    return rows, envelope
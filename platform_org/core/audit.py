@@ -1,10 +1,12 @@
+from platform_org.audit.buffer import record
 from platform_org.audit.models import AuditEvent
-def log_event(*, actor, action: str, entity, summary: str = "", payload: dict | None = None):
-    AuditEvent.objects.create(
+def log_event(*, actor, action: str, entity, summary: str = "", payload: dict | None = None, tenant=None):
+    record(AuditEvent(
+        tenant_id=tenant.pk if tenant is not None else getattr(entity, "tenant_id", None),
         actor=actor if getattr(actor, "is_authenticated", False) else None,
         action=action,
         entity_type=entity.__class__.__name__,
         entity_id=str(getattr(entity, "pk", "")),
         summary=summary[:255],
         payload=payload or {},
-    )
+    ))
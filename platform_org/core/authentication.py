@@ -1,5 +1,8 @@
 import os
+from functools import lru_cache
+
 import jwt
+from asgiref.sync import sync_to_async
 from jwt import PyJWKClient
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -10,6 +13,24 @@ User = get_user_model()
 def _get_setting(name: str, default: str = "") -> str:
     return getattr(settings, name, os.getenv(name, default)) or os.getenv(name, default) or default
 
+
+@lru_cache(maxsize=16)
+def _jwk_client(jwks_url: str) -> PyJWKClient:
+    # PyJWKClient caches the key set; building one per request re-downloaded the JWKS on every call. The URL comes
+    # from an unverified issuer, so the cache is bounded.
+    return PyJWKClient(jwks_url)
+
+
+def _jwks_url(iss: str) -> str:
+    # ENTRA_JWKS_URL points load tests at a local stand-in; trusting arbitrary keys is never right in production.
+    if (settings.DEBUG or getattr(settings, "LOADTEST", False)) and _get_setting("ENTRA_JWKS_URL", ""):
+        return _get_setting("ENTRA_JWKS_URL", "")
+    if iss.endswith("/v2.0"):
+        return iss.rstrip("/") + "/discovery/v2.0/keys"
+    parts = iss.rstrip("/").split("/")
+    tenant_id = parts[-1] if parts else "common"
+    return f"https://login.microsoftonline.com/{tenant_id}/discovery/v2.0/keys"
+
 class EntraIDAuthentication(authentication.BaseAuthentication):
     """Production-grade Entra ID (Azure AD) bearer token validation.
     - verifies signature (JWKS)
@@ -19,6 +40,30 @@ class EntraIDAuthentication(authentication.BaseAuthentication):
     """
 
     def authenticate(self, request):
+        payload = self.verify(request)
+        if payload is None:
+            return None
+        user, _ = User.objects.get_or_create(username=self.username(payload), defaults={"email": payload.get("email","")})
+        request.entra_claims = payload
+        return (user, None)
+
+    async def aauthenticate(self, request):
+        # A JWKS fetch (first use, key rotation) is a blocking HTTP call, so verification runs off the event loop.
+        payload = await sync_to_async(self.verify, thread_sensitive=False)(request)
+        if payload is None:
+            return None
+        user, _ = await User.objects.aget_or_create(username=self.username(payload), defaults={"email": payload.get("email","")})
+        request.entra_claims = payload
+        return (user, None)
+
+    def username(self, payload):
+        username = payload.get("preferred_username") or payload.get("upn") or payload.get("email")
+        if not username:
+            raise exceptions.AuthenticationFailed("Entra token missing preferred_username/upn/email")
+        return username
+
+    def verify(self, request):
+        """Validated claims, or None when the header is not an Entra bearer token."""
         auth = request.headers.get("Authorization", "")
         if not auth.startswith("Bearer "):
             return None
@@ -40,16 +85,12 @@ class EntraIDAuthentication(authentication.BaseAuthentication):
         client_id = _get_setting("ENTRA_CLIENT_ID", "")
         verify_aud = bool(client_id)
 
-        # Determine JWKS endpoint
-        if iss.endswith("/v2.0"):
-            jwks_url = iss.rstrip("/") + "/discovery/v2.0/keys"
-        else:
-            parts = iss.rstrip("/").split("/")
-            tenant_id = parts[-1] if parts else "common"
-            jwks_url = f"https://login.microsoftonline.com/{tenant_id}/discovery/v2.0/keys"
+        # Only the allowed issuer's keys are ever fetched (and cached).
+        if allowed_issuer and iss != allowed_issuer:
+            raise exceptions.AuthenticationFailed("Entra token issuer not allowed")
 
         try:
-            jwk_client = PyJWKClient(jwks_url)
+            jwk_client = _jwk_client(_jwks_url(iss))
             signing_key = jwk_client.get_signing_key_from_jwt(token)
 
             options = {"verify_aud": verify_aud}
@@ -70,10 +111,4 @@ class EntraIDAuthentication(authentication.BaseAuthentication):
         if allowed_issuer and payload.get("iss") != allowed_issuer:
             raise exceptions.AuthenticationFailed("Entra token issuer not allowed")
 
-        username = payload.get("preferred_username") or payload.get("upn") or payload.get("email")
-        if not username:
-            raise exceptions.AuthenticationFailed("Entra token missing preferred_username/upn/email")
-
-        user, _ = User.objects.get_or_create(username=username, defaults={"email": payload.get("email","")})
-        request.entra_claims = payload
-        return (user, None)
+        return payload
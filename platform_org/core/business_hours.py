@@ -0,0 +1,197 @@
+"""Business-hours arithmetic for SLA clocks, backed by a precomputed cumulative index per calendar.
+
+A calendar's working intervals (weekly hours minus holidays, in the calendar's timezone) are laid out
+once as sorted epoch-second ``starts``/``ends`` with the business seconds worked before each interval.
+Adding N business hours to an instant, or measuring business time between two instants, is then two
+binary searches instead of a walk over days, so sweeps can compute thousands of deadlines cheaply.
+Indexes are rebuilt when the calendar row changes (``updated_at``) and are widened when asked about an
+instant outside the span built so far. Without a calendar the SLA clock is wall-clock time.
+"""
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+# Never widen an index beyond this many days; a calendar that works less than once in that span is broken.
+MAX_SPAN_DAYS = 3660
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def default_weekly_hours():
+    # Sunday to Thursday, 08:00-16:00.
+    return {day: [["08:00", "16:00"]] for day in ("sun", "mon", "tue", "wed", "thu")}
+
+
+def default_timezone():
+    return settings.SLA_CALENDAR_DEFAULT_TIMEZONE
+
+
+def _clock(value):
+    hours, minutes = (int(part) for part in value.split(":"))
+    if not (0 <= minutes < 60 and (0 <= hours < 24 or (hours, minutes) == (24, 0))):
+        raise ValueError(value)
+    return hours * 60 + minutes
+
+
+def parse_weekly_hours(weekly_hours):
+    """``{"sun": [["08:00", "16:00"], ...], ...}`` as seven sorted lists of (start, end) minutes past midnight."""
+    if not isinstance(weekly_hours, dict) or set(weekly_hours) - set(WEEKDAYS):
+        raise ValidationError(f"Weekly hours must map weekdays ({', '.join(WEEKDAYS)}) to lists of [start, end].")
+    days = []
+    for name in WEEKDAYS:
+        try:
+            spans = sorted((_clock(start), _clock(end)) for start, end in weekly_hours.get(name, []))
+        except (TypeError, ValueError):
+            raise ValidationError(f'{name}: hours must be ["HH:MM", "HH:MM"] pairs.')
+        for i, (start, end) in enumerate(spans):
+            if start >= end or (i and start < spans[i - 1][1]):
+                raise ValidationError(f"{name}: spans must be non-empty and must not overlap.")
+        days.append(spans)
+    if not any(days):
+        raise ValidationError("A calendar needs working hours on at least one weekday.")
+    return days
+
+
+def validate_timezone(name):
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(f"Unknown timezone {name!r}.")
+
+
+def _local(midnight, minutes):
+    if minutes == 1440:
+        return int(datetime.combine(midnight.date() + timedelta(days=1), time.min, tzinfo=midnight.tzinfo).timestamp())
+    return int(midnight.replace(hour=minutes // 60, minute=minutes % 60).timestamp())
+
+
+class CalendarIndex:
+    """Working intervals of one calendar from ``first`` to ``last`` (local dates, inclusive)."""
+
+    def __init__(self, weekly_hours, holidays, tz_name, first, last):
+        self.first, self.last = first, last
+        days, holidays, zone = parse_weekly_hours(weekly_hours), set(holidays), ZoneInfo(tz_name)
+        self.starts, self.ends, self.worked = array("q"), array("q"), array("q")
+        worked = 0
+        day = first
+        while day <= last:
+            if day not in holidays:
+                midnight = datetime.combine(day, time.min, tzinfo=zone)
+                for start, end in days[day.weekday()]:
+                    # Local wall-clock times, so a DST change shortens or lengthens that day's span.
+                    lo = _local(midnight, start)
+                    hi = _local(midnight, end)
+                    if self.ends and lo <= self.ends[-1]:  # "24:00" followed by "00:00" the next day
+                        self.ends[-1] = hi
+                    else:
+                        self.starts.append(lo)
+                        self.ends.append(hi)
+                        self.worked.append(worked)
+                    worked += hi - lo
+            day += timedelta(days=1)
+        # Cumulative business seconds at the end of each interval, for the inverse lookup.
+        self.done = array("q", (w + hi - lo for w, lo, hi in zip(self.worked, self.starts, self.ends)))
+        self.lo = int(datetime.combine(first, time.min, tzinfo=zone).timestamp())
+        self.hi = int(datetime.combine(last + timedelta(days=1), time.min, tzinfo=zone).timestamp())
+
+    def covers(self, seconds):
+        return self.lo <= seconds < self.hi
+
+    def position(self, seconds):
+        """Business seconds worked from the start of the index up to the epoch instant ``seconds``."""
+        i = bisect_right(self.starts, seconds) - 1
+        if i < 0:
+            return 0
+        return self.worked[i] + min(seconds, self.ends[i]) - self.starts[i]
+
+    def instant(self, position):
+        """The earliest epoch instant by which ``position`` business seconds have been worked, or None."""
+        i = bisect_left(self.done, position)
+        if i == len(self.done):
+            return None
+        return self.starts[i] + max(0, position - self.worked[i])
+
+
+def _span(seconds, tz_name):
+    return datetime.fromtimestamp(seconds, ZoneInfo(tz_name)).date()
+
+
+def get_index(calendar, *instants):
+    """The cached index for ``calendar``, rebuilt if the calendar changed or doesn't cover ``instants``."""
+    key = calendar.pk
+    version = (calendar.updated_at, calendar.timezone)
+    cached = _indexes.get(key)
+    if cached and cached[0] == version and all(cached[1].covers(s) for s in instants):
+        return cached[1]
+    with _lock:
+        cached = _indexes.get(key)
+        if cached and cached[0] == version and all(cached[1].covers(s) for s in instants):
+            return cached[1]
+        today = datetime.now(ZoneInfo(calendar.timezone)).date()
+        first = today - timedelta(days=settings.SLA_CALENDAR_INDEX_PAST_DAYS)
+        last = today + timedelta(days=settings.SLA_CALENDAR_INDEX_FUTURE_DAYS)
+        if cached and cached[0] == version:
+            first, last = min(first, cached[1].first), max(last, cached[1].last)
+        for s in instants:
+            day = _span(s, calendar.timezone)
+            first, last = min(first, day - timedelta(days=1)), max(last, day + timedelta(days=1))
+        index = CalendarIndex(calendar.weekly_hours, calendar.holidays, calendar.timezone, first, last)
+        _indexes[key] = (version, index)
+        return index
+
+
+def _ts(value):
+    return value.timestamp()
+
+
+def _dt(seconds):
+    return datetime.fromtimestamp(seconds, dt_timezone.utc)
+
+
+def add_business_hours(calendar, start, hours):
+    """The instant ``hours`` business hours after ``start``; wall-clock when ``calendar`` is None."""
+    if calendar is None:
+        return start + timedelta(hours=hours)
+    return add_business_hours_many(calendar, [start], hours)[0]
+
+
+def add_business_hours_many(calendar, starts, hours):
+    """Deadlines for many start instants against one calendar and target, sharing one index lookup."""
+    if calendar is None:
+        return [start + timedelta(hours=hours) for start in starts]
+    if not starts:
+        return []
+    seconds = [_ts(start) for start in starts]
+    index = get_index(calendar, min(seconds), max(seconds))
+    target = int(hours * 3600)
+    deadlines = []
+    for start, s in zip(starts, seconds):
+        at = index.instant(index.position(s) + target)
+        while at is None:
+            # Past the end of the index: widen it by the target plus a margin and retry.
+            if (index.last - index.first).days > MAX_SPAN_DAYS:
+                raise ValueError(f"Calendar {calendar.pk} cannot fit {hours} business hours after {start}.")
+            index = get_index(calendar, index.hi + target * 2 + 7 * 86400)
+            at = index.instant(index.position(s) + target)
+        deadlines.append(max(start, _dt(at)))
+    return deadlines
+
+
+def business_hours_between(calendar, start, end):
+    """Business hours from ``start`` to ``end`` (negative if ``end`` comes first); wall-clock without a calendar."""
+    if calendar is None:
+        return (end - start).total_seconds() / 3600.0
+    a, b = _ts(start), _ts(end)
+    index = get_index(calendar, a, b)
+    return (index.position(b) - index.position(a)) / 3600.0
+
+
+def clear():
+    _indexes.clear()
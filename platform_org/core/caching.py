@@ -0,0 +1,134 @@
+"""Tenant-namespaced, versioned, two-tier caching on top of Django's cache framework.
+
+Keys look like ``t:<tenant>:<namespace>:<tenant version>.<namespace version>:<parts>``. Both versions are
+counters in the shared cache: ``invalidate(tenant, namespace)`` bumps one and so orphans every key of that
+namespace at once, ``invalidate(tenant)`` orphans everything cached for the tenant. Orphaned entries are
+never read again and age out by TTL. Processes keep the counters for VERSION_LOCAL_TTL seconds, which
+bounds how long another worker can serve an invalidated local entry.
+
+``get_or_load`` reads the per-process ``local`` cache, then the shared ``default`` cache (Redis), and only
+then calls the loader. A miss is recomputed by a single caller holding a lock in the shared cache while
+the others wait for its result; entries are recomputed a little before they expire, with a probability
+that grows as expiry nears and with how long the loader takes (XFetch), so a hot key does not expire for
+every worker at once. When Redis is unreachable the helper degrades to the local tier plus the loader.
+"""
+import logging
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import caches
+from redis.exceptions import RedisError
+
+from .metrics import cache_result
+
+logger = logging.getLogger(__name__)
+
+VERSION_LOCAL_TTL = 1
+LOCK_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+
+def shared():
+    return caches["default"]
+
+
+def local():
+    return caches["local"]
+
+
+def _tenant_id(tenant):
+    return getattr(tenant, "pk", tenant)
+
+
+def _version_key(tenant, namespace=None):
+    return f"t:{_tenant_id(tenant)}:ver" if namespace is None else f"t:{_tenant_id(tenant)}:{namespace}:ver"
+
+
+def versions(tenant, namespace):
+    keys = [_version_key(tenant), _version_key(tenant, namespace)]
+    found = local().get_many(keys)
+    if len(found) < len(keys):
+        try:
+            found = shared().get_many(keys)
+        except RedisError:
+            logger.warning("Shared cache unavailable; using unversioned keys for %s", namespace, exc_info=True)
+        else:
+            local().set_many({key: found.get(key, 0) for key in keys}, VERSION_LOCAL_TTL)
+    return tuple(found.get(key, 0) for key in keys)
+
+
+def tenant_key(tenant, namespace, *parts):
+    tenant_version, namespace_version = versions(tenant, namespace)
+    suffix = ":".join(str(part) for part in parts)
+    return f"t:{_tenant_id(tenant)}:{namespace}:{tenant_version}.{namespace_version}:{suffix}"
+
+
+def invalidate(tenant, namespace=None):
+    """Drop everything cached under ``namespace`` for the tenant (every namespace when None)."""
+    key = _version_key(tenant, namespace)
+    if not shared().add(key, 1, timeout=None):
+        shared().incr(key)
+    local().delete(key)
+
+
+def _expiring(entry, beta):
+    _, expires_at, delta = entry
+    # XFetch: -log(u) is exponentially distributed, so early refreshes are rare until expiry is within a
+    # few loader run times.
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+def _shared(op, *args, default=None):
+    try:
+        return getattr(shared(), op)(*args)
+    except RedisError:
+        logger.warning("Shared cache %s failed", op, exc_info=True)
+        return default
+
+
+def _remember(key, entry, local_ttl):
+    remaining = entry[1] - time.time()
+    if remaining > 0:
+        local().set(key, entry, min(local_ttl, remaining))
+
+
+def get_or_load(tenant, namespace, parts, loader, ttl=300, local_ttl=5, beta=1.0):
+    """Cached ``loader()`` for the tenant; ``parts`` identify the value within the namespace."""
+    key = tenant_key(tenant, namespace, *parts)
+    entry = local().get(key)
+    if entry is None:
+        entry = _shared("get", key)
+        if entry is not None:
+            _remember(key, entry, local_ttl)
+    if entry is not None and not _expiring(entry, beta):
+        cache_result(namespace, True)
+        return entry[0]
+    cache_result(namespace, False)
+    return _load(key, loader, ttl, local_ttl, stale=entry)
+
+
+def _load(key, loader, ttl, local_ttl, stale):
+    lock = f"{key}:lock"
+    # If the lock cannot even be attempted, Redis is down: compute locally rather than wait on nothing.
+    if _shared("add", lock, uuid.uuid4().hex, LOCK_TIMEOUT, default=True):
+        try:
+            start = time.perf_counter()
+            value = loader()
+            entry = (value, time.time() + ttl, time.perf_counter() - start)
+            _shared("set", key, entry, ttl)
+            _remember(key, entry, local_ttl)
+            return value
+        finally:
+            _shared("delete", lock)
+    if stale is not None:
+        return stale[0]  # another worker is already refreshing it
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = _shared("get", key)
+        if entry is not None:
+            _remember(key, entry, local_ttl)
+            return entry[0]
+    return loader()  # the lock holder died or is too slow; do not block the request any longer
@@ -0,0 +1,83 @@
+"""HTTP conditional GET (ETag / Last-Modified) for DRF viewsets.
+
+Validators come from an aggregate over the already filtered queryset: the row count and the newest
+``conditional_field``. A poll for unchanged data is therefore answered with 304 before pagination and
+serialization. Nested collections the serializer embeds are covered by listing them in
+``conditional_related``; each gets its own count and newest ``updated_at``, read from the related table
+alone for the listed ids, so the list is never joined to (and multiplied by) its children. A related row
+that is only read for a label (e.g. a renamed provider ME) shows up once the listed row is saved again.
+"""
+import hashlib
+from calendar import timegm
+from datetime import datetime
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def related_path(model, relation):
+    """The model at the end of ``relation`` and the lookup from it back to ``model``."""
+    back = []
+    for name in relation.split("__"):
+        field = model._meta.get_field(name)
+        back.insert(0, field.field.name if field.auto_created and not field.concrete else field.related_query_name())
+        model = field.related_model
+    return model, "__".join(back)
+
+
+class ConditionalGetMixin:
+    # Must change on every update; "id" will do for append-only tables.
+    conditional_field = "updated_at"
+    # Embedded reverse relations (TimeStampedModel) whose additions, edits and removals must change the ETag.
+    conditional_related = ()
+
+    def conditional_state(self, queryset):
+        state = list(queryset.aggregate(count=Count("pk"), newest=Max(self.conditional_field)).values())
+        ids = queryset.order_by().values("pk")
+        for relation in self.conditional_related:
+            model, back = related_path(queryset.model, relation)
+            rows = model._default_manager.filter(**{f"{back}__in": ids})
+            state += rows.aggregate(count=Count("pk"), newest=Max("updated_at")).values()
+        return state
+
+    def validators(self, *state):
+        request = self.request
+        tenant = getattr(request, "tenant", None)
+        parts = (getattr(tenant, "pk", None), request.user.pk, request.accepted_renderer.format, request.get_full_path(), *state)
+        etag = 'W/"%s"' % hashlib.sha256(":".join(map(str, parts)).encode()).hexdigest()[:32]
+        stamps = [value for value in state if isinstance(value, datetime)]
+        last_modified = timegm(max(stamps).utctimetuple()) if stamps else None
+        return etag, last_modified
+
+    def conditional(self, response, etag, last_modified):
+        response.headers["ETag"] = etag
+        if last_modified is not None:
+            response.headers["Last-Modified"] = http_date(last_modified)
+        # Browsers must revalidate every poll rather than reuse the body heuristically from Last-Modified.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag, last_modified = self.validators(*self.conditional_state(queryset))
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+            else:
+                response = Response(self.get_serializer(queryset, many=True).data)
+        return self.conditional(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        state = [instance.pk, getattr(instance, self.conditional_field)]
+        if self.conditional_related:
+            state = [instance.pk, *self.conditional_state(self.get_queryset().filter(pk=instance.pk))]
+        etag, last_modified = self.validators(*state)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self.conditional(response, etag, last_modified)
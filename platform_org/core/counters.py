@@ -0,0 +1,104 @@
+from celery import shared_task
+from django.conf import settings
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+from django.db.models.signals import post_delete, post_save
+
+from platform_org.sla.models import (
+    ArchivedServiceRequest, ArchivedSLABreachEvent, ServiceRequest, ServiceRequestHistory, SLABreachEvent,
+    SLABreachHistory,
+)
+from platform_org.tenancy.models import Tenant
+from .caching import get_or_load
+from .models import MicroEnterprise, MEService, MEContract, VAMAgreement, MEKPI, TenantCounter
+
+COUNTED_MODELS = {
+    "me_count": MicroEnterprise,
+    "service_count": MEService,
+    "contract_count": MEContract,
+    "vam_count": VAMAgreement,
+    "kpi_count": MEKPI,
+    "request_count": ServiceRequest,
+    "breach_count": SLABreachEvent,
+}
+# Archived rows still count; archiving moves them without firing the counter signals, so totals don't change.
+ARCHIVED_MODELS = {
+    "request_count": ArchivedServiceRequest,
+    "breach_count": ArchivedSLABreachEvent,
+}
+OPEN_STATUSES = [ServiceRequest.Status.OPEN, ServiceRequest.Status.IN_PROGRESS]
+
+
+def reconcile(tenant, names=None) -> dict:
+    """Recount from the tables (archive included) and overwrite the stored counters (the slow, authoritative path)."""
+    counts = {name: COUNTED_MODELS[name].objects.filter(tenant=tenant).count() for name in (names or COUNTED_MODELS)}
+    for name in counts:
+        if name in ARCHIVED_MODELS:
+            counts[name] += ARCHIVED_MODELS[name].objects.filter(tenant=tenant).count()
+    TenantCounter.objects.bulk_create(
+        [TenantCounter(tenant=tenant, name=name, value=value) for name, value in counts.items()],
+        update_conflicts=True,
+        unique_fields=["tenant", "name"],
+        update_fields=["value", "updated_at"],
+    )
+    return counts
+
+
+def get_counts(tenant) -> dict:
+    counts = dict(TenantCounter.objects.filter(tenant=tenant).values_list("name", "value"))
+    missing = [name for name in COUNTED_MODELS if name not in counts]
+    if missing:
+        counts.update(reconcile(tenant, missing))
+    return counts
+
+
+def get_summary(tenant) -> dict:
+    """Open/breached request totals and contract value by status, cached for a few seconds."""
+    ttl = getattr(settings, "DASHBOARD_SUMMARY_TTL", 30)
+    return get_or_load(tenant, "dashboard", ["summary"], lambda: _summary(tenant), ttl=ttl)
+
+
+def _summary(tenant) -> dict:
+    # Open requests are never archived; the breached total spans the archive too.
+    breached = Exists(SLABreachHistory.objects.filter(request=OuterRef("pk")))
+    summary = ServiceRequestHistory.objects.filter(tenant=tenant).aggregate(
+        open_requests=Count("id", filter=Q(status__in=OPEN_STATUSES)),
+        open_breached_requests=Count("id", filter=Q(breached, status__in=OPEN_STATUSES)),
+        breached_requests=Count("id", filter=Q(breached)),
+    )
+    summary["contracts_by_status"] = list(
+        MEContract.objects.filter(tenant=tenant)
+        .values("status")
+        .annotate(count=Count("id"), total_value=Sum("contract_value"))
+        .order_by("status")
+    )
+    return summary
+
+
+def _bump(name, tenant_id, delta):
+    TenantCounter.objects.filter(tenant_id=tenant_id, name=name).update(value=F("value") + delta)
+
+
+def _connect(name, model):
+    def on_save(sender, instance, created, raw=False, **kwargs):
+        if created and not raw:
+            _bump(name, instance.tenant_id, 1)
+
+    def on_delete(sender, instance, **kwargs):
+        _bump(name, instance.tenant_id, -1)
+
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f"counter-save-{name}")
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f"counter-delete-{name}")
+
+
+for _name, _model in COUNTED_MODELS.items():
+    _connect(_name, _model)
+
+
+@shared_task
+def reconcile_tenant_counters():
+    # bulk_create/queryset.update bypass signals, so drift is corrected here.
+    tenants = 0
+    for tenant in Tenant.objects.filter(is_active=True):
+        reconcile(tenant)
+        tenants += 1
+    return {"tenants": tenants}
@@ -0,0 +1,105 @@
+"""Primary/replica routing with read-your-writes stickiness.
+
+Reads go to the ``replica`` alias only inside ``replica_reads()`` (entered by ReplicaRoutingMiddleware
+for safe HTTP methods and by read-heavy tasks). Everything else, including any read inside an atomic
+block on the primary, stays on ``default``. Once a scope writes, its later reads are pinned to the
+primary, and the middleware carries that pin to the same client's next requests via a cookie.
+
+"Wrote" means a data-changing statement actually ran on the primary. Routing a queryset through
+db_for_write is not enough: get_or_create() does that on every authenticated request and usually only reads.
+
+``observe_queries()`` is ``connection.execute_wrapper()`` for code that spans threads: a wrapper entered
+by an async middleware also sees the queries its view runs through sync_to_async.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import partial
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+REPLICA_DB_ALIAS = "replica"
+WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "MERGE", "COPY", "TRUNCATE", "CREATE", "ALTER", "DROP")
+
+
+@dataclass
+class RoutingScope:
+    primary: bool = False  # read from the primary regardless (unsafe method, pinned client)
+    sticky: bool = True  # pin the rest of the scope to the primary after a write
+    wrote: bool = False
+
+
+_scope: ContextVar = ContextVar("platform_org_db_scope", default=None)
+_observers: ContextVar = ContextVar("platform_org_query_observers", default=())
+
+
+def _dispatch(execute, sql, params, many, context):
+    for observer in reversed(_observers.get()):
+        execute = partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+def _install(connection, **kwargs):
+    # First in the list, so execute_wrapper() blocks open around a reconnect still pop their own wrapper.
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _dispatch)
+
+
+connection_created.connect(_install, dispatch_uid="platform_org-observe-queries")
+
+
+@contextmanager
+def observe_queries(wrapper):
+    """Run ``wrapper`` (an execute wrapper) around every query of this context, on any alias and in any thread
+    the context is copied to (sync_to_async, asyncio tasks)."""
+    for conn in connections.all():
+        _install(conn)  # connections this thread opened before the receiver was connected
+    token = _observers.set(_observers.get() + (wrapper,))
+    try:
+        yield
+    finally:
+        _observers.reset(token)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in connections.settings
+
+
+@contextmanager
+def replica_reads(primary=False, sticky=True):
+    scope = RoutingScope(primary=primary, sticky=sticky)
+
+    def track_writes(execute, sql, params, many, context):
+        if (
+            not scope.wrote and context["connection"].alias == DEFAULT_DB_ALIAS
+            and isinstance(sql, str) and sql.lstrip().upper().startswith(WRITE_VERBS)
+        ):
+            scope.wrote = True
+        return execute(sql, params, many, context)
+
+    token = _scope.set(scope)
+    try:
+        with observe_queries(track_writes):
+            yield scope
+    finally:
+        _scope.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        scope = _scope.get()
+        if scope is None or scope.primary or (scope.sticky and scope.wrote) or not replica_configured():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        dbs = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in dbs and obj2._state.db in dbs:
+            return True
+        return None
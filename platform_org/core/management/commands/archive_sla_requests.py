@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from platform_org.sla.archive import archive_tenant
+from platform_org.tenancy.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Move requests resolved or closed longer ago than the tenant's archive age, with their breaches, to the archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenant", help="Tenant code; all active tenants when omitted.")
+        parser.add_argument("--batch-size", type=int, help="Requests per transaction (default SLA_ARCHIVE_BATCH_SIZE).")
+        parser.add_argument("--dry-run", action="store_true", help="Count what would move without moving it.")
+
+    def handle(self, *args, **opts):
+        tenants = Tenant.objects.filter(is_active=True)
+        if opts["tenant"]:
+            tenants = Tenant.objects.filter(code=opts["tenant"])
+            if not tenants:
+                raise CommandError(f"Unknown tenant {opts['tenant']!r}")
+        verb = "Would archive" if opts["dry_run"] else "Archived"
+        for tenant in tenants:
+            started = time.monotonic()
+            stats = archive_tenant(tenant, batch_size=opts["batch_size"], dry_run=opts["dry_run"])
+            self.stdout.write(self.style.SUCCESS(
+                f"{tenant.code}: {verb} {stats['requests']} requests and {stats['breaches']} breaches "
+                f"in {time.monotonic() - started:.1f}s"
+            ))
@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils.timezone import now
+
+from platform_org.audit.partitions import add_months, month_start
+from platform_org.core.models import ContractService, MEContract, MEKPI, MEOwner, MEService, MicroEnterprise, VAMAgreement
+from platform_org.core.plans import explain, indexes, row_estimates, scanned, seq_scans
+from platform_org.pagination import KeysetPaginationMixin
+from platform_org.sla.archive import ARCHIVABLE
+from platform_org.sla.models import ServiceRequest, SLABreachEvent
+from platform_org.sla.partitions import is_partitioned, partition_name
+from platform_org.tenancy.models import Tenant
+from platform_org.views import ServiceRequestListView, SLABreachesView
+
+OPEN = [ServiceRequest.Status.OPEN, ServiceRequest.Status.IN_PROGRESS]
+
+
+def months(table, start, end):
+    """Partitions of ``table`` a [start, end] range of instants can touch."""
+    month, last, names = month_start(start.date()), month_start(end.date()), set()
+    while month <= last:
+        names.add(partition_name(table, month))
+        month = add_months(month, 1)
+    return names
+
+
+def next_page(view, queryset, cursor):
+    keyset = KeysetPaginationMixin()
+    keyset.keyset = view.keyset
+    return queryset.filter(keyset._keyset_filter(cursor, forward=True))
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the hot list, lookup and SLA sweep queries against a tenant's data; fail when one reads an unpruned "
+        "partition or sequentially scans a large table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenant", required=True, help="Tenant code whose data the queries run against.")
+        parser.add_argument("--page-size", type=int, default=ServiceRequestListView.paginate_by)
+        parser.add_argument(
+            "--min-rows", type=int, default=10000,
+            help="Only sequential scans of tables (partitions) with at least this many rows fail.",
+        )
+
+    def handle(self, *args, **opts):
+        if not is_partitioned(ServiceRequest._meta.db_table):
+            raise CommandError("sla_servicerequest is not partitioned (Postgres only; run migrate)")
+        tenant = Tenant.objects.filter(code=opts["tenant"]).first()
+        if tenant is None:
+            raise CommandError(f"Unknown tenant {opts['tenant']!r}")
+        self.page, self.min_rows = opts["page_size"] + 1, opts["min_rows"]
+        failures = []
+        for name, problems in self.checks(tenant):
+            if problems:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"FAIL {name}: {'; '.join(problems)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"ok   {name}"))
+        if failures:
+            raise CommandError(f"{len(failures)} query plan check(s) failed: {', '.join(failures)}")
+
+    def checks(self, tenant):
+        for model, view, field in (
+            (ServiceRequest, ServiceRequestListView, "opened_at"),
+            (SLABreachEvent, SLABreachesView, "breach_at"),
+        ):
+            label, table = model._meta.model_name, model._meta.db_table
+            rows = model.objects.filter(tenant=tenant).order_by(*view.keyset)
+            newest = rows.values_list(field, flat=True).first()
+            if newest is None:
+                yield f"{label}: data", [f"{tenant.code} has no {label} rows"]
+                continue
+            yield f"{label}: first page", self.first_page(rows, table, field)
+            cursor = rows.filter(**{f"{field}__lt": newest - timedelta(days=90)}).first()
+            if cursor is not None:
+                # Months newer than the cursor are pruned when the query is planned.
+                values = [getattr(cursor, f.lstrip("-")) for f in view.keyset]
+                oldest = rows.order_by(field).values_list(field, flat=True).first()
+                yield f"{label}: next page", self.pruned(next_page(view, rows, values)[:self.page], table, oldest, values[0])
+            start = newest - timedelta(days=30)
+            yield f"{label}: 30-day window", self.pruned(
+                rows.filter(**{f"{field}__gte": start, f"{field}__lte": newest}), table, start, newest
+            )
+        yield "sweep: open requests", self.no_seq_scans(ServiceRequest.objects.filter(status__in=OPEN))
+        yield from self.lookups(tenant)
+
+    def lookups(self, tenant):
+        """The tenant-scoped queries of the API viewsets, pages and tasks, each with the index added for it."""
+        page = slice(0, self.page)
+        requests = ServiceRequest.objects.filter(tenant=tenant)
+        yield "servicerequest: status filter", self.uses(
+            requests.filter(status=ServiceRequest.Status.RESOLVED).order_by(*ServiceRequestListView.keyset)[page],
+            "request_tenant_status_idx",
+        )
+        yield "servicerequest: archive candidates", self.uses(
+            requests.filter(status__in=ARCHIVABLE, resolved_at__lt=now() - timedelta(days=180)), "request_closed_idx"
+        )
+        for model, index in (
+            (MicroEnterprise, "me_tenant_created_idx"), (MEContract, "contract_tenant_created_idx"),
+            (VAMAgreement, "vam_tenant_created_idx"), (MEKPI, "kpi_tenant_created_idx"),
+        ):
+            yield f"{model._meta.model_name}: list", self.uses(model.objects.filter(tenant=tenant).order_by("-created_at")[page], index)
+        yield "meservice: list", self.uses(MEService.objects.filter(tenant=tenant).order_by("name")[page], "meservice_tenant_name_idx")
+        me = MicroEnterprise.objects.filter(tenant=tenant).order_by("id").first()
+        if me is not None:
+            yield "meservice: top-level services of an ME", self.uses(
+                MEService.objects.filter(tenant=tenant, provider_me=me, parent__isnull=True).order_by("name"),
+                "meservice_tenant_provider_idx",
+            )
+            # An ME has one tenant, so the ``me`` foreign key index is all this needs.
+            yield "mekpi: KPIs of an ME", self.no_seq_scans(MEKPI.objects.filter(tenant=tenant, me=me))
+        contract = MEContract.objects.filter(tenant=tenant).order_by("id").first()
+        if contract is not None:
+            yield "contractservice: lines of a contract", self.uses(
+                ContractService.objects.filter(contract=contract).order_by("service"), "contractservice_contract_idx"
+            )
+            yield "servicerequest: rollup range of a contract", self.uses(
+                ServiceRequest.objects.filter(contract=contract, opened_at__gte=now() - timedelta(days=7)),
+                "request_contract_opened_idx",
+            )
+        owner = MEOwner.objects.filter(tenant=tenant).first()
+        if owner is not None:
+            yield "meowner: owned MEs", self.uses(
+                MEOwner.objects.filter(user_id=owner.user_id).values_list("me_id", flat=True), "meowner_user_me_idx"
+            )
+
+    def first_page(self, rows, table, field):
+        # Ordered Append: the newest months fill the page and the older ones are never executed.
+        plan = explain(rows[:self.page], analyze=True)
+        oldest = month_start(getattr(list(rows[:self.page])[-1], field).date())
+        older = [name for name in scanned(plan, f"{table}_p") if name < partition_name(table, oldest)]
+        problems = self.seq_problems(plan)
+        if older:
+            problems.append(f"read months older than the page: {', '.join(older)}")
+        return problems
+
+    def pruned(self, queryset, table, start, end):
+        plan = explain(queryset)
+        extra = set(scanned(plan, f"{table}_p")) - months(table, start, end)
+        problems = self.seq_problems(plan)
+        if extra:
+            problems.append(f"not pruned: {', '.join(sorted(extra))}")
+        return problems
+
+    def no_seq_scans(self, queryset):
+        return self.seq_problems(explain(queryset))
+
+    def uses(self, queryset, index):
+        """No large sequential scans, and ``index`` is read once the tables are big enough for it to matter."""
+        plan = explain(queryset)
+        problems = self.seq_problems(plan)
+        large = any(rows >= self.min_rows for rows in row_estimates(scanned(plan), connection.alias).values())
+        used = indexes(plan, connection.alias)
+        if large and index not in used:
+            problems.append(f"does not use {index} (uses {', '.join(sorted(used)) or 'no index'})")
+        return problems
+
+    def seq_problems(self, plan):
+        found = seq_scans(plan, self.min_rows, connection.alias)
+        return [f"sequential scan of {', '.join(found)}"] if found else []
@@ -0,0 +1,327 @@
+import json
+import math
+import random
+import time
+from datetime import datetime, time as dt_time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+
+from platform_org.core.counters import reconcile
+from platform_org.core.models import (
+    ContractService, ContractStatus, MEContract, MEKPI, MEOwner, MEService, MicroEnterprise,
+    MicroEnterpriseStatus, MicroEnterpriseType, ServiceSLACost, SLATemplate, TenantCounter, VAMAgreement,
+)
+from platform_org.sla.models import ArchivedServiceRequest, ArchivedSLABreachEvent, ServiceRequest, SLABreachEvent, SLADailyRollup
+from platform_org.sla.partitions import ensure_partitions
+from platform_org.sla.rollups import rebuild as rebuild_rollups
+from platform_org.tenancy.models import Tenant
+
+# Deleted child-first when --reset wipes a synthetic tenant.
+RESET_ORDER = [
+    SLADailyRollup, ArchivedSLABreachEvent, ArchivedServiceRequest, SLABreachEvent, ServiceRequest, ContractService,
+    MEContract, ServiceSLACost, MEKPI, VAMAgreement, MEService, SLATemplate, MEOwner, MicroEnterprise, MicroEnterpriseType, MicroEnterpriseStatus,
+    ContractStatus, TenantCounter,
+]
+
+# (name, response hours, resolution hours, availability %, cost multiplier)
+SLA_TIERS = [
+    ("Bronze", 24, 120, Decimal("98.00"), Decimal("0.80")),
+    ("Silver", 8, 48, Decimal("99.00"), Decimal("1.00")),
+    ("Gold", 4, 24, Decimal("99.50"), Decimal("1.35")),
+    ("Platinum", 1, 8, Decimal("99.90"), Decimal("1.90")),
+]
+PRIORITIES = (["LOW", "MEDIUM", "HIGH", "CRITICAL"], [30, 45, 20, 5])
+SOURCES = ([ServiceRequest.Source.MANUAL, ServiceRequest.Source.JIRA, ServiceRequest.Source.JITBIT], [40, 40, 20])
+CONTRACT_STATUSES = (["ACTIVE", "DRAFT", "EXPIRED"], [75, 10, 15])
+# Tickets cluster in working hours on weekdays.
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 4, 8, 14, 16, 15, 13, 10, 13, 15, 14, 11, 7, 4, 3, 2, 2, 1, 1]
+WEEKDAY_WEIGHTS = [10, 10, 10, 10, 9, 3, 2]
+VERBS = ["Fix", "Provision", "Investigate", "Configure", "Replace", "Review", "Restore", "Upgrade", "Migrate", "Audit"]
+NOUNS = ["VPN access", "payroll export", "printer", "laptop", "mailbox", "SAP role", "firewall rule",
+         "invoice batch", "badge", "database backup", "shipping label", "forklift sensor"]
+UNITS = ["Logistics", "Finance", "HR", "IT", "Procurement", "Quality", "Maintenance", "Sales", "Legal", "R&D"]
+
+
+class Writer:
+    """Stream rows with explicit ids into one table: COPY on Postgres, bulk_create elsewhere."""
+
+    def __init__(self, model, fields, batch_size):
+        self.model = model
+        self.fields = fields
+        self.batch_size = batch_size
+        self.rows = []
+        self.written = 0
+        self.copy = connection.vendor == "postgresql"
+
+    def reserve_ids(self, n):
+        table = self.model._meta.db_table
+        if self.copy:
+            with connection.cursor() as cur:
+                # Advance the sequence by n in one statement; concurrent inserts can't take these ids.
+                cur.execute(
+                    "SELECT setval(pg_get_serial_sequence(%s, 'id'), nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)",
+                    [table, table, n],
+                )
+                last = cur.fetchone()[0]
+            return last - n + 1
+        return (self.model.objects.aggregate(m=Max("id"))["m"] or 0) + 1
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.copy:
+            columns = ", ".join(self.model._meta.get_field(f).column for f in self.fields)
+            with connection.cursor() as cur:
+                with cur.cursor.copy(f"COPY {self.model._meta.db_table} ({columns}) FROM STDIN") as copy:
+                    for row in self.rows:
+                        copy.write_row(row)
+        else:
+            attnames = [self.model._meta.get_field(f).attname for f in self.fields]
+            self.model.objects.bulk_create(
+                [self.model(**dict(zip(attnames, row))) for row in self.rows], batch_size=self.batch_size
+            )
+        self.written += len(self.rows)
+        self.rows = []
+
+
+class Command(BaseCommand):
+    help = "Generate a reproducible synthetic dataset (tenants, MEs, service trees, contracts, requests, breaches)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="synth", help="Tenant code prefix; tenants are <prefix>-1..N.")
+        parser.add_argument("--tenants", type=int, default=1)
+        parser.add_argument("--mes", type=int, default=50, help="Micro-enterprises per tenant.")
+        parser.add_argument("--root-services", type=int, default=3, help="Top-level services per ME.")
+        parser.add_argument("--children", type=int, default=3, help="Sub-services per service.")
+        parser.add_argument("--depth", type=int, default=3, help="Levels in each service tree.")
+        parser.add_argument("--contracts", type=int, default=200, help="Contracts per tenant.")
+        parser.add_argument("--lines", type=int, default=20, help="Service lines per contract.")
+        parser.add_argument("--requests", type=int, default=100_000, help="Service requests per tenant.")
+        parser.add_argument("--kpis", type=int, default=5, help="KPIs per ME.")
+        parser.add_argument("--days", type=int, default=365, help="Spread requests over this many days.")
+        parser.add_argument("--anchor", help="End of the request window (YYYY-MM-DD, UTC); defaults to today.")
+        parser.add_argument("--batch-size", type=int, default=50_000)
+        parser.add_argument("--reset", action="store_true", help="Wipe existing data of the synthetic tenants first.")
+
+    def handle(self, *args, **opts):
+        anchor = datetime.combine(
+            datetime.strptime(opts["anchor"], "%Y-%m-%d").date() if opts["anchor"] else datetime.now(dt_timezone.utc).date(),
+            dt_time.min,
+            tzinfo=dt_timezone.utc,
+        )
+        # COPY skips pre_save, so create the monthly partitions for the whole window up front.
+        ensure_partitions(since=(anchor - timedelta(days=opts["days"] + 1)).date(), until=anchor.date())
+        for i in range(1, opts["tenants"] + 1):
+            code = f"{opts['prefix']}-{i}"
+            rng = random.Random(f"{opts['seed']}:{code}")
+            started = time.monotonic()
+            tenant = self.prepare_tenant(code, opts["reset"])
+            # Django's foreign keys are deferred, so breaches may be flushed ahead of their requests.
+            with transaction.atomic():
+                stats = self.generate(tenant, rng, anchor, opts)
+            reconcile(tenant)
+            rebuild_rollups(tenant=tenant)
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cur:
+                    for model in (ServiceRequest, SLABreachEvent, ContractService, MEService, MEContract, MEKPI, MicroEnterprise):
+                        cur.execute(f"ANALYZE {model._meta.db_table}")
+            summary = ", ".join(f"{k}={v}" for k, v in stats.items())
+            self.stdout.write(self.style.SUCCESS(f"{code}: {summary} in {time.monotonic() - started:.1f}s"))
+
+    def prepare_tenant(self, code, reset):
+        tenant, created = Tenant.objects.get_or_create(code=code, defaults={"slug": code, "name": f"Synthetic {code}"})
+        if created:
+            return tenant
+        if MicroEnterprise.objects.filter(tenant=tenant).exists():
+            if not reset:
+                raise CommandError(f"Tenant {code} already has data; pass --reset to regenerate it.")
+            with transaction.atomic(), connection.cursor() as cur:
+                for model in RESET_ORDER:
+                    cur.execute(f"DELETE FROM {model._meta.db_table} WHERE tenant_id = %s", [tenant.pk])
+        return tenant
+
+    def generate(self, tenant, rng, anchor, opts):
+        templates = SLATemplate.objects.bulk_create([
+            SLATemplate(tenant=tenant, name=name, response_time_hours=resp, resolution_time_hours=res, availability_percent=avail)
+            for name, resp, res, avail, _ in SLA_TIERS
+        ])
+        multipliers = {t.pk: tier[4] for t, tier in zip(templates, SLA_TIERS)}
+        me_types = MicroEnterpriseType.objects.bulk_create([
+            MicroEnterpriseType(tenant=tenant, code=c, name=n) for c, n in [("NODE_ME", "Node ME"), ("SSP", "Shared Service Platform")]
+        ])
+        me_statuses = MicroEnterpriseStatus.objects.bulk_create([
+            MicroEnterpriseStatus(tenant=tenant, code=c, name=n) for c, n in [("ACTIVE", "Active"), ("INCUBATION", "Incubation")]
+        ])
+        ContractStatus.objects.bulk_create([
+            ContractStatus(tenant=tenant, code=c, name=c.title()) for c in CONTRACT_STATUSES[0]
+        ])
+
+        mes = MicroEnterprise.objects.bulk_create([
+            MicroEnterprise(
+                tenant=tenant,
+                code=f"ME-{n:05d}",
+                name=f"{rng.choice(UNITS)} ME {n}",
+                me_type=rng.choices(me_types, [3, 1])[0],
+                status=rng.choices(me_statuses, [9, 1])[0],
+                autonomy_level=rng.choice(["RESTRICTED", "STANDARD", "HIGH"]),
+                department=rng.choice(UNITS),
+                cost_center=f"CC-{rng.randint(1000, 9999)}",
+            )
+            for n in range(1, opts["mes"] + 1)
+        ], batch_size=opts["batch_size"])
+
+        services_by_me = {me.pk: [] for me in mes}
+        level = [None]
+        for depth in range(opts["depth"]):
+            width = opts["root_services"] if depth == 0 else opts["children"]
+            if depth == 0:
+                pending = [
+                    MEService(tenant=tenant, provider_me=me, name=f"{rng.choice(NOUNS).title()} service {k}",
+                              description=f"{me.name} tier-1 service", cost=Decimal(rng.randint(500, 20000)),
+                              sla_template=rng.choice(templates))
+                    for me in mes for k in range(1, width + 1)
+                ]
+            else:
+                pending = [
+                    MEService(tenant=tenant, provider_me_id=parent.provider_me_id, parent=parent,
+                              name=f"{parent.name} / part {k}", description=f"Level {depth + 1} component",
+                              cost=Decimal(rng.randint(0, 1) * rng.randint(50, 5000)),
+                              sla_template=parent.sla_template)
+                    for parent in level for k in range(1, width + 1)
+                ]
+            level = MEService.objects.bulk_create(pending, batch_size=opts["batch_size"])
+            for service in level:
+                services_by_me[service.provider_me_id].append(service)
+        services = [s for group in services_by_me.values() for s in group]
+        sla_costs = {
+            (s.pk, t.pk): (s.cost * multipliers[t.pk]).quantize(Decimal("0.01")) for s in services for t in templates
+        }
+        ServiceSLACost.objects.bulk_create([
+            ServiceSLACost(tenant=tenant, service_id=s, sla_template_id=t, cost=c) for (s, t), c in sla_costs.items()
+        ], batch_size=opts["batch_size"])
+
+        contracts, lines = [], []
+        for n in range(1, opts["contracts"] + 1):
+            provider, consumer = rng.sample(mes, 2)
+            start = (anchor - timedelta(days=rng.randint(30, opts["days"] + 365))).date()
+            contracts.append(MEContract(
+                tenant=tenant, code=f"C-{n:06d}", provider_me=provider, consumer_me=consumer,
+                start_date=start, end_date=start + timedelta(days=rng.choice([365, 730, 1095])),
+                status=rng.choices(*CONTRACT_STATUSES)[0], sla_template=rng.choice(templates),
+            ))
+        contracts = MEContract.objects.bulk_create(contracts, batch_size=opts["batch_size"])
+        for contract in contracts:
+            offered = services_by_me[contract.provider_me_id]
+            chosen = rng.sample(offered, min(opts["lines"], len(offered)))
+            chosen_ids = {s.pk for s in chosen}
+            costs = {}
+            total = Decimal("0")
+            for service in chosen:
+                sla = rng.choice(templates)
+                billing = rng.choices(["PERIOD", "QUANTITY"], [3, 2])[0]
+                quantity = Decimal(rng.randint(1, 50)) if billing == "QUANTITY" else None
+                costs[service.pk] = sla_costs[(service.pk, sla.pk)]
+                lines.append(ContractService(
+                    tenant=tenant, contract=contract, service=service, sla_template=sla, billing_type=billing,
+                    quantity=quantity,
+                    period_start=contract.start_date if billing == "PERIOD" else None,
+                    period_end=contract.end_date if billing == "PERIOD" else None,
+                ))
+                # Same pricing rule as the contract form: a priced parent already covers its children.
+                if service.parent_id in chosen_ids and (costs.get(service.parent_id) or 0) > 0:
+                    continue
+                total += costs[service.pk] * (quantity or 1)
+            contract.contract_value = total
+        ContractService.objects.bulk_create(lines, batch_size=opts["batch_size"])
+        MEContract.objects.bulk_update(contracts, ["contract_value"], batch_size=opts["batch_size"])
+
+        VAMAgreement.objects.bulk_create([
+            VAMAgreement(tenant=tenant, code=f"VAM-{me.code}", me=me, total_committed_amount=Decimal(rng.randint(10, 500) * 1000))
+            for me in mes
+        ])
+        kpis = Writer(MEKPI, ["tenant", "code", "me", "name", "target_value", "actual_value", "created_at", "updated_at"], opts["batch_size"])
+        now = datetime.now(dt_timezone.utc)
+        for me in mes:
+            for k in range(1, opts["kpis"] + 1):
+                target = Decimal(rng.choice([90, 95, 98, 99]))
+                actual = (target * Decimal(str(rng.normalvariate(1.0, 0.05)))).quantize(Decimal("0.01"))
+                kpis.add((tenant.pk, f"KPI-{me.code}-{k}", me.pk, f"{rng.choice(NOUNS).title()} on-time %", target, actual, now, now))
+        kpis.flush()
+
+        requests, breaches = self.generate_requests(tenant, rng, anchor, contracts, templates, opts)
+        return {
+            "mes": len(mes), "services": len(services), "sla_costs": len(sla_costs), "contracts": len(contracts),
+            "contract_lines": len(lines), "kpis": kpis.written, "requests": requests, "breaches": breaches,
+        }
+
+    def generate_requests(self, tenant, rng, anchor, contracts, templates, opts):
+        active = [c for c in contracts if c.status == "ACTIVE"] or contracts
+        # A few contracts carry most of the ticket volume (Zipf-like).
+        cum_weights = list(accumulate(1 / (rank ** 0.8) for rank in range(1, len(active) + 1)))
+        targets = {t.pk: (t.response_time_hours, t.resolution_time_hours) for t in templates}
+        request_writer = Writer(ServiceRequest, [
+            "id", "tenant", "contract", "source", "external_id", "title", "priority",
+            "opened_at", "first_response_at", "resolved_at", "status",
+        ], opts["batch_size"])
+        breach_writer = Writer(SLABreachEvent, ["tenant", "request", "breach_type", "breach_at", "details"], opts["batch_size"])
+
+        total = opts["requests"]
+        next_id = request_writer.reserve_ids(total) if total else 0
+        days = [anchor - timedelta(days=d) for d in range(1, opts["days"] + 1)]
+        day_weights = list(accumulate(WEEKDAY_WEIGHTS[d.weekday()] for d in days))
+        slots = [timedelta(hours=h, seconds=s) for h in range(24) for s in range(0, 3600, 60)]
+        slot_weights = list(accumulate(HOUR_WEIGHTS[i // 60] for i in range(len(slots))))
+        breach_details = {h: json.dumps({"target_hours": h}) for _, resp, res, _, _ in SLA_TIERS for h in (resp, res)}
+        lognormal = rng.lognormvariate
+        chunk = opts["batch_size"]
+        for base in range(next_id, next_id + total, chunk):
+            # Draw the categorical columns a chunk at a time; per-row random.choices dominated the run time.
+            k = min(chunk, next_id + total - base)
+            chosen = zip(
+                range(base, base + k),
+                rng.choices(active, cum_weights=cum_weights, k=k),
+                rng.choices(days, cum_weights=day_weights, k=k),
+                rng.choices(slots, cum_weights=slot_weights, k=k),
+                rng.choices(SOURCES[0], SOURCES[1], k=k),
+                rng.choices(PRIORITIES[0], PRIORITIES[1], k=k),
+                rng.choices(VERBS, k=k),
+                rng.choices(NOUNS, k=k),
+                rng.choices([ServiceRequest.Status.RESOLVED, ServiceRequest.Status.CLOSED], [4, 1], k=k),
+            )
+            for request_id, contract, day, slot, source, priority, verb, noun, done_status in chosen:
+                response_target, resolution_target = targets.get(contract.sla_template_id, (8, 48))
+                opened = day + slot
+                # Most tickets land well inside the target; the lognormal tail produces the breaches.
+                response = timedelta(hours=lognormal(math.log(response_target * 0.4), 0.8))
+                resolution = response + timedelta(hours=lognormal(math.log(resolution_target * 0.5), 0.9))
+                first_response_at = opened + response if opened + response <= anchor else None
+                resolved_at = opened + resolution if opened + resolution <= anchor else None
+                if resolved_at:
+                    status = done_status
+                else:
+                    status = ServiceRequest.Status.IN_PROGRESS if first_response_at else ServiceRequest.Status.OPEN
+                request_writer.add((
+                    request_id, tenant.pk, contract.pk, source,
+                    "" if source == ServiceRequest.Source.MANUAL else f"{source[:2]}-{request_id - next_id + 1}",
+                    f"{verb} {noun} #{request_id - next_id + 1}", priority, opened, first_response_at, resolved_at, status,
+                ))
+                for breach_type, target, elapsed in (
+                    (SLABreachEvent.BreachType.RESPONSE, response_target, response),
+                    (SLABreachEvent.BreachType.RESOLUTION, resolution_target, resolution),
+                ):
+                    deadline = opened + timedelta(hours=target)
+                    if elapsed > timedelta(hours=target) and deadline <= anchor:
+                        breach_writer.add((tenant.pk, request_id, breach_type, deadline, breach_details.get(target) or json.dumps({"target_hours": target})))
+        request_writer.flush()
+        breach_writer.flush()
+        return request_writer.written, breach_writer.written
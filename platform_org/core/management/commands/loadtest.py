@@ -0,0 +1,73 @@
+import asyncio
+import json
+import logging
+from contextlib import ExitStack
+from pathlib import Path
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from platform_org.benchmarks.identity import LocalEntraIssuer
+from platform_org.benchmarks.load import prepare_tenants, run_load
+from platform_org.tenancy.models import Tenant
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive mixed API traffic across tenants with locally minted Entra tokens. "
+        "Without --target the ASGI app runs in-process (functional smoke, limited concurrency); "
+        "point --target at a deployed API started with LOADTEST=true ENTRA_JWKS_URL=http://<this host>:<jwks-port>/keys "
+        "to measure real capacity."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenants", default="synth-1", help="Comma-separated tenant codes.")
+        parser.add_argument("--target", help="Base URL of a running API, e.g. http://localhost:8000")
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds.")
+        parser.add_argument("--read-only", action="store_true", help="Skip the POST/PATCH endpoints.")
+        parser.add_argument("--async-reads", action="store_true", help="Send list reads to their /api/async/ twins.")
+        parser.add_argument("--jwks-host", default="0.0.0.0")
+        parser.add_argument("--jwks-port", type=int, default=8765)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", help="Write the per-endpoint report as JSON.")
+
+    def handle(self, *args, **opts):
+        codes = [c.strip() for c in opts["tenants"].split(",") if c.strip()]
+        tenants = list(Tenant.objects.filter(code__in=codes, is_active=True))
+        missing = set(codes) - {t.code for t in tenants}
+        if missing:
+            raise CommandError(f"Unknown or inactive tenants: {', '.join(sorted(missing))}")
+
+        logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per request otherwise
+        issuer = LocalEntraIssuer.persistent()
+        sessions = prepare_tenants(tenants, issuer)
+        with ExitStack() as stack:
+            if opts["target"]:
+                jwks_url = stack.enter_context(issuer.serve(opts["jwks_host"], opts["jwks_port"]))
+                self.stdout.write(f"Serving JWKS at {jwks_url}; the API must run with LOADTEST=true and ENTRA_JWKS_URL pointing here.")
+                transport, base_url = None, opts["target"].rstrip("/")
+            else:
+                from config.asgi import application
+
+                stack.enter_context(issuer.installed())
+                transport, base_url = httpx.ASGITransport(app=application), "http://testserver"
+            report, elapsed = asyncio.run(run_load(
+                transport, base_url, sessions, opts["concurrency"], opts["duration"], opts["read_only"], opts["seed"],
+                opts["async_reads"],
+            ))
+
+        total = sum(r["requests"] for r in report.values())
+        errors = sum(r["errors"] for r in report.values())
+        self.stdout.write(f"{'endpoint':<34}{'reqs':>8}{'rps':>8}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for name, r in report.items():
+            self.stdout.write(
+                f"{name:<34}{r['requests']:>8}{r['rps']:>8}{r['error_rate'] * 100:>7.1f}"
+                f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}"
+            )
+        self.stdout.write(f"total {total} requests in {elapsed:.1f}s = {total / elapsed:.1f} req/s, {errors} errors")
+        if opts["output"]:
+            Path(opts["output"]).write_text(json.dumps({
+                "tenants": codes, "concurrency": opts["concurrency"], "duration_s": round(elapsed, 1),
+                "target": opts["target"] or "in-process", "async_reads": opts["async_reads"], "endpoints": report,
+            }, indent=2))
@@ -0,0 +1,77 @@
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from platform_org.core.models import MEContract
+from platform_org.sla.models import BreachReevaluation
+from platform_org.sla.reevaluation import pending_shards, run_shard, start, totals
+from platform_org.sla.tasks import reevaluate_breaches
+from platform_org.tenancy.models import Tenant
+
+
+def _day(value, plus=0):
+    day = datetime.strptime(value, "%Y-%m-%d").date() + timedelta(days=plus)
+    return timezone.make_aware(datetime.combine(day, dt_time.min))
+
+
+class Command(BaseCommand):
+    help = "Recompute SLA breaches of existing requests after SLA templates, calendars or contracts changed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenant", help="Tenant code; all tenants when omitted.")
+        parser.add_argument("--contract", action="append", default=[], help="Contract code (repeatable).")
+        parser.add_argument("--template", action="append", default=[], help="Every contract on this SLA template name (repeatable).")
+        parser.add_argument("--since", help="Requests opened on or after this day (YYYY-MM-DD).")
+        parser.add_argument("--until", help="Requests opened on or before this day (YYYY-MM-DD).")
+        parser.add_argument("--shards", type=int, help="Id-range shards (default SLA_REEVALUATION_SHARDS).")
+        parser.add_argument("--dry-run", action="store_true", help="Count the changes without writing them.")
+        parser.add_argument("--celery", action="store_true", help="Queue one task per shard instead of running here.")
+        parser.add_argument("--resume", type=int, metavar="RUN_ID", help="Continue an interrupted or failed run.")
+
+    def handle(self, *args, **opts):
+        if opts["resume"]:
+            run = BreachReevaluation.objects.filter(pk=opts["resume"]).first()
+            if run is None:
+                raise CommandError(f"Unknown run {opts['resume']}")
+        else:
+            run = self.create_run(opts)
+        started = time.monotonic()
+        if opts["celery"]:
+            queued = reevaluate_breaches.delay(run.pk)
+            self.stdout.write(self.style.SUCCESS(f"Run {run.pk} queued as task {queued.id}"))
+            return
+        for shard_id in pending_shards(run):
+            run_shard(shard_id)
+            self.stdout.write(f"run {run.pk}: {totals(run)}")
+        run.refresh_from_db()
+        summary = ", ".join(f"{k}={v}" for k, v in totals(run).items())
+        dry = " (dry run, nothing written)" if run.dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"Run {run.pk} {run.status.lower()}{dry}: {summary} in {time.monotonic() - started:.1f}s"
+        ))
+
+    def create_run(self, opts):
+        tenant = None
+        if opts["tenant"]:
+            tenant = Tenant.objects.filter(code=opts["tenant"]).first()
+            if tenant is None:
+                raise CommandError(f"Unknown tenant {opts['tenant']!r}")
+        contract_ids = set()
+        if opts["contract"] or opts["template"]:
+            contracts = MEContract.objects.filter(tenant=tenant) if tenant else MEContract.objects.all()
+            found = dict(contracts.filter(code__in=opts["contract"]).values_list("code", "id"))
+            missing = set(opts["contract"]) - set(found)
+            if missing:
+                raise CommandError(f"Unknown contracts: {', '.join(sorted(missing))}")
+            contract_ids = set(found.values())
+            contract_ids |= set(contracts.filter(sla_template__name__in=opts["template"]).values_list("id", flat=True))
+            if not contract_ids:
+                raise CommandError("No contracts match the given --contract/--template.")
+        return start(
+            tenant=tenant, contract_ids=contract_ids,
+            opened_from=_day(opts["since"]) if opts["since"] else None,
+            opened_until=_day(opts["until"], plus=1) if opts["until"] else None,
+            dry_run=opts["dry_run"], shards=opts["shards"],
+        )
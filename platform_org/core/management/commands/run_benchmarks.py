@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from platform_org.benchmarks.runner import compare, run
+from platform_org.benchmarks.scenarios import SCENARIOS
+from platform_org.tenancy.models import Tenant
+
+
+class Command(BaseCommand):
+    help = "Run the hot-path benchmark scenarios against a synthetic tenant and optionally gate on a baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenant", default="synth-1", help="Tenant code (generate it with generate_synthetic_data).")
+        parser.add_argument("--only", default="", help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument("--warmup", type=int, default=1)
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+        parser.add_argument("--baseline", help="Compare against a previous --output file.")
+        parser.add_argument("--threshold", type=float, default=20.0, help="Allowed median slowdown in percent.")
+
+    def handle(self, *args, **opts):
+        tenant = Tenant.objects.filter(code=opts["tenant"]).first()
+        if tenant is None:
+            raise CommandError(f"Tenant {opts['tenant']} not found; run generate_synthetic_data first.")
+        names = [n.strip() for n in opts["only"].split(",") if n.strip()] or None
+        unknown = set(names or []) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+        results = run(tenant, names, opts["iterations"], opts["warmup"], log=self.stdout.write)
+        if opts["output"]:
+            Path(opts["output"]).write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Wrote {opts['output']}")
+
+        if opts["baseline"]:
+            regressions = compare(results, json.loads(Path(opts["baseline"]).read_text()), opts["threshold"])
+            if regressions:
+                raise CommandError("Benchmark regressions:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS(f"No regressions beyond {opts['threshold']}%."))
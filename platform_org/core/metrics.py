@@ -0,0 +1,106 @@
+import os
+import time
+
+from celery.signals import task_postrun, task_prerun, worker_init
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess, start_http_server
+
+# With PROMETHEUS_MULTIPROC_DIR set, every gunicorn/uvicorn or Celery child writes its samples to
+# mmap files there and the exposition aggregates them; otherwise the default in-process registry is used.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "platform_org_http_request_duration_seconds",
+    "HTTP request latency.",
+    ["view", "method", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "platform_org_http_request_db_queries",
+    "Database queries per HTTP request.",
+    ["view", "method"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+CACHE_REQUESTS = Counter(
+    "platform_org_cache_requests_total",
+    "Application cache lookups.",
+    ["cache", "result"],
+)
+TASK_DURATION = Histogram(
+    "platform_org_celery_task_duration_seconds",
+    "Celery task run time.",
+    ["task", "state"],
+    buckets=(0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600),
+)
+SLA_OPEN_REQUESTS = Gauge(
+    "platform_org_sla_open_requests",
+    "Open or in-progress service requests at the last breach sweep.",
+    multiprocess_mode="mostrecent",
+)
+SLA_DUE_SOON = Gauge(
+    "platform_org_sla_requests_due_soon",
+    "Open requests whose resolution deadline falls within SLA_DUE_SOON_HOURS, at the last sweep.",
+    multiprocess_mode="mostrecent",
+)
+SLA_BREACHES_CREATED = Counter(
+    "platform_org_sla_breaches_created_total",
+    "Breach events created by SLA evaluation.",
+    ["trigger"],
+)
+WEBHOOK_DELIVERY = Histogram(
+    "platform_org_webhook_delivery_seconds",
+    "Outbound notification webhook round trip.",
+    ["target", "outcome"],
+)
+CELERY_QUEUE_DEPTH = Gauge(
+    "platform_org_celery_queue_depth",
+    "Messages waiting in each Celery queue, sampled by the readiness probe.",
+    ["queue"],
+    multiprocess_mode="mostrecent",
+)
+TICKET_WEBHOOK_LAG = Histogram(
+    "platform_org_ticket_webhook_lag_seconds",
+    "Time from receiving a Jira/Jitbit webhook to applying it.",
+    ["source"],
+    buckets=(0.5, 1, 2, 5, 10, 30, 60, 300),
+)
+
+
+def cache_result(cache_name: str, hit: bool):
+    CACHE_REQUESTS.labels(cache_name, "hit" if hit else "miss").inc()
+
+
+def registry():
+    if not MULTIPROCESS:
+        from prometheus_client import REGISTRY
+
+        return REGISTRY
+    reg = CollectorRegistry()
+    multiprocess.MultiProcessCollector(reg)
+    return reg
+
+
+def exposition():
+    return generate_latest(registry()), CONTENT_TYPE_LATEST
+
+
+_task_started = {}
+
+
+@task_prerun.connect
+def _task_start(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_done(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(getattr(task, "name", "?"), state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+@worker_init.connect
+def _serve_worker_metrics(**kwargs):
+    # Celery workers run in their own containers; expose their samples on a side port when asked to.
+    port = os.environ.get("CELERY_METRICS_PORT")
+    if port:
+        start_http_server(int(port), registry=registry())
@@ -0,0 +1,121 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .db import observe_queries, replica_configured, replica_reads
+from .metrics import REQUEST_LATENCY, REQUEST_QUERIES
+from .profiling import profile_queries
+
+
+class HybridMiddleware:
+    """Wrap-around middleware that runs natively under WSGI and ASGI.
+
+    A single sync-only middleware makes Django run the whole chain below it in a thread under ASGI,
+    so the async views would gain nothing. Subclasses provide ``scope(request)`` (a context manager
+    held around the inner handler) and optionally ``finish(request, response, state)``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with self.scope(request) as state:
+            response = self.get_response(request)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        with self.scope(request) as state:
+            response = await self.get_response(request)
+        return self.finish(request, response, state)
+
+    def scope(self, request):
+        return nullcontext()
+
+    def finish(self, request, response, state):
+        return response
+
+
+class StaticFilesMiddleware(HybridMiddleware, WhiteNoiseMiddleware):
+    """WhiteNoise, minus the sync-only restriction; static files are served from its in-memory index."""
+
+    def __init__(self, get_response):
+        WhiteNoiseMiddleware.__init__(self, get_response)
+        HybridMiddleware.__init__(self, get_response)
+
+    def _static_file(self, request):
+        return self.find_file(request.path_info) if self.autorefresh else self.files.get(request.path_info)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        static_file = self._static_file(request)
+        return self.serve(static_file, request) if static_file is not None else self.get_response(request)
+
+    async def __acall__(self, request):
+        static_file = self._static_file(request)
+        return self.serve(static_file, request) if static_file is not None else await self.get_response(request)
+
+
+class QueryProfilerMiddleware(HybridMiddleware):
+    """Opt-in (QUERY_PROFILER_ENABLED): query count and DB time per request in Server-Timing and the logs."""
+
+    def scope(self, request):
+        return profile_queries(f"{request.method} {request.path}")
+
+    def finish(self, request, response, profile):
+        response["Server-Timing"] = profile.server_timing()
+        profile.log()
+        return response
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """Prometheus latency and query-count histograms labelled by URL name and method."""
+
+    @contextmanager
+    def scope(self, request):
+        state = {"queries": 0, "start": time.perf_counter()}
+
+        def count(execute, sql, params, many, context):
+            state["queries"] += 1
+            return execute(sql, params, many, context)
+
+        with observe_queries(count):
+            yield state
+
+    def finish(self, request, response, state):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unresolved"
+        REQUEST_LATENCY.labels(view, request.method, response.status_code).observe(time.perf_counter() - state["start"])
+        REQUEST_QUERIES.labels(view, request.method).observe(state["queries"])
+        return response
+
+
+class ReplicaRoutingMiddleware(HybridMiddleware):
+    """Serve GET/HEAD/OPTIONS reads from the replica; pin a client to the primary for a while after it writes."""
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+    PIN_COOKIE = "db_pin_primary"
+
+    def scope(self, request):
+        if not replica_configured():
+            return nullcontext()
+        pinned = request.method not in self.SAFE_METHODS or self.PIN_COOKIE in request.COOKIES
+        return replica_reads(primary=pinned)
+
+    def finish(self, request, response, scope):
+        if scope is not None and scope.wrote:
+            response.set_cookie(
+                self.PIN_COOKIE, "1", max_age=settings.DATABASE_REPLICA_PIN_SECONDS, httponly=True, samesite="Lax"
+            )
+        return response
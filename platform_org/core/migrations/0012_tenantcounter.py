@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_merge_0009_mecontract_approved_at_mecontract_approved_by_and_more_0010_alter_mecontract_status'),
+        ('tenancy', '0002_tenant_slug_alter_tenantuser_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='counters', to='tenancy.tenant')),
+            ],
+            options={
+                'unique_together': {('tenant', 'name')},
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:12
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_tenantcounter'),
+        ('tenancy', '0002_tenant_slug_alter_tenantuser_role'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='mecontract',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('code', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='mekpi',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('code', 'name', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='meservice',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('name', 'description', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='microenterprise',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('code', 'name', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='vamagreement',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('code', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='mecontract',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='contract_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mecontract',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('code'), name='gin_trgm_ops'), name='contract_search_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mekpi',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='kpi_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mekpi',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('code'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='kpi_search_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meservice',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='meservice_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meservice',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('description'), name='gin_trgm_ops'), name='meservice_search_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='microenterprise',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='me_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='microenterprise',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('code'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='me_search_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vamagreement',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='vam_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vamagreement',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('code'), name='gin_trgm_ops'), name='vam_search_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:07
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+import django.utils.timezone
+import platform_org.core.business_hours
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_search_vectors_and_trigram_indexes'),
+        ('tenancy', '0002_tenant_slug_alter_tenantuser_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessCalendar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255)),
+                ('timezone', models.CharField(default=platform_org.core.business_hours.default_timezone, max_length=64, validators=[platform_org.core.business_hours.validate_timezone])),
+                ('weekly_hours', models.JSONField(default=platform_org.core.business_hours.default_weekly_hours, validators=[platform_org.core.business_hours.parse_weekly_hours])),
+                ('holidays', django.contrib.postgres.fields.ArrayField(base_field=models.DateField(), blank=True, default=list, size=None)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='business_calendars', to='tenancy.tenant')),
+            ],
+            options={
+                'unique_together': {('tenant', 'name')},
+            },
+        ),
+        migrations.AddField(
+            model_name='slatemplate',
+            name='calendar',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sla_templates', to='core.businesscalendar'),
+        ),
+    ]
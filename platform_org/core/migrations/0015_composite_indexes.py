@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY doesn't lock out writes, but can't run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ('core', '0014_business_calendars'),
+        ('tenancy', '0003_tenant_archive_closed_after_days'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='contractservice',
+            index=models.Index(fields=['contract', 'service'], name='contractservice_contract_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='mecontract',
+            index=models.Index(fields=['tenant', '-created_at'], name='contract_tenant_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='mekpi',
+            index=models.Index(fields=['tenant', '-created_at'], name='kpi_tenant_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='meowner',
+            index=models.Index(fields=['user', 'me'], name='meowner_user_me_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='meservice',
+            index=models.Index(fields=['tenant', 'provider_me', 'parent'], name='meservice_tenant_provider_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='meservice',
+            index=models.Index(fields=['tenant', 'name'], name='meservice_tenant_name_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='microenterprise',
+            index=models.Index(fields=['tenant', '-created_at'], name='me_tenant_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='vamagreement',
+            index=models.Index(fields=['tenant', '-created_at'], name='vam_tenant_created_idx'),
+        ),
+        # The composite indexes above lead with these foreign keys, so their single-column indexes go, once the
+        # composites exist. AlterField would also drop and re-validate the constraints; only the indexes change.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='contractservice',
+                    name='contract',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='contract_services', to='core.mecontract'),
+                ),
+                migrations.AlterField(
+                    model_name='meowner',
+                    name='user',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    'DROP INDEX CONCURRENTLY IF EXISTS "core_contractservice_contract_id_d3b838a1"',
+                    'CREATE INDEX CONCURRENTLY IF NOT EXISTS "core_contractservice_contract_id_d3b838a1" ON "core_contractservice" ("contract_id")',
+                ),
+                migrations.RunSQL(
+                    'DROP INDEX CONCURRENTLY IF EXISTS "core_meowner_user_id_99542abf"',
+                    'CREATE INDEX CONCURRENTLY IF NOT EXISTS "core_meowner_user_id_99542abf" ON "core_meowner" ("user_id")',
+                ),
+            ],
+        ),
+    ]
@@ -1,8 +1,12 @@
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils import timezone
 from platform_org.tenancy.models import Tenant
 from .audit import log_event
+from .business_hours import default_timezone, default_weekly_hours, parse_weekly_hours, validate_timezone
+from .search import stored_search_vector, trigram_index
 
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(default=timezone.now, editable=False)
@@ -56,9 +60,15 @@ class MicroEnterprise(TimeStampedModel):
     department = models.CharField(max_length=100, blank=True)
     cost_center = models.CharField(max_length=100, blank=True)
     owners = models.ManyToManyField(settings.AUTH_USER_MODEL, through="MEOwner", related_name="micro_enterprises")
+    search_vector = stored_search_vector("code", "name")
 
     class Meta:
         unique_together = [("tenant", "code")]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="me_search_vector_idx"),
+            trigram_index("code", "name", name="me_search_trgm_idx"),
+            models.Index(fields=["tenant", "-created_at"], name="me_tenant_created_idx"),  # API list
+        ]
 
     def __str__(self):
         return self.name
@@ -66,11 +76,28 @@ class MicroEnterprise(TimeStampedModel):
 class MEOwner(TimeStampedModel):
     tenant = models.ForeignKey(Tenant, on_delete=models.PROTECT, related_name="me_owners")
     me = models.ForeignKey(MicroEnterprise, on_delete=models.CASCADE, related_name="owner_links")
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False)  # see Meta
     role_in_me = models.CharField(max_length=100, blank=True)
     is_primary = models.BooleanField(default=False)
     class Meta:
         unique_together = [("me","user")]
+        # owned_me_ids() on every non-admin API request, answered from the index alone; also covers user alone.
+        indexes = [models.Index(fields=["user", "me"], name="meowner_user_me_idx")]
+
+class BusinessCalendar(TimeStampedModel):
+    """Working hours per weekday (local to ``timezone``) and holidays; SLA clocks only run inside them."""
+    tenant = models.ForeignKey(Tenant, on_delete=models.PROTECT, related_name="business_calendars")
+    name = models.CharField(max_length=255)
+    timezone = models.CharField(max_length=64, default=default_timezone, validators=[validate_timezone])
+    # {"sun": [["08:00", "16:00"]], ...}; a day may have several spans, "24:00" ends at midnight.
+    weekly_hours = models.JSONField(default=default_weekly_hours, validators=[parse_weekly_hours])
+    holidays = ArrayField(models.DateField(), default=list, blank=True)
+
+    class Meta:
+        unique_together = [("tenant", "name")]
+
+    def __str__(self):
+        return self.name
 
 class SLATemplate(TimeStampedModel):
     tenant = models.ForeignKey(Tenant, on_delete=models.PROTECT, related_name="sla_templates")
@@ -78,6 +105,8 @@ class SLATemplate(TimeStampedModel):
     response_time_hours = models.PositiveIntegerField(null=True, blank=True)
     resolution_time_hours = models.PositiveIntegerField(null=True, blank=True)
     availability_percent = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    # Response/resolution hours are business hours of this calendar; wall-clock hours when unset.
+    calendar = models.ForeignKey(BusinessCalendar, on_delete=models.SET_NULL, null=True, blank=True, related_name="sla_templates")
 
     class Meta:
         unique_together = [("tenant", "name")]
@@ -93,6 +122,16 @@ class MEService(TimeStampedModel):
     description = models.TextField(blank=True)
     cost = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     sla_template = models.ForeignKey(SLATemplate, on_delete=models.SET_NULL, null=True, blank=True, related_name="services")
+    search_vector = stored_search_vector("name", "description")
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="meservice_search_vector_idx"),
+            trigram_index("name", "description", name="meservice_search_trgm_idx"),
+            # An ME's (top-level) services: ME detail page, contract form service picker.
+            models.Index(fields=["tenant", "provider_me", "parent"], name="meservice_tenant_provider_idx"),
+            models.Index(fields=["tenant", "name"], name="meservice_tenant_name_idx"),  # API list, parent pickers
+        ]
 
     def __str__(self):
         if self.parent:
@@ -125,9 +164,15 @@ class MEContract(TimeStampedModel):
     # Kept for backward compatibility or as a primary SLA if needed, 
     # but the request implies per-service SLA.
     sla_template = models.ForeignKey(SLATemplate, on_delete=models.SET_NULL, null=True, blank=True, related_name="contracts")
+    search_vector = stored_search_vector("code")
 
     class Meta:
         unique_together = [("tenant", "code")]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="contract_search_vector_idx"),
+            trigram_index("code", name="contract_search_trgm_idx"),
+            models.Index(fields=["tenant", "-created_at"], name="contract_tenant_created_idx"),  # API list
+        ]
 
     def __str__(self):
         return f"{self.code} ({self.provider_me.name} -> {self.consumer_me.name})"
@@ -138,7 +183,7 @@ class ContractService(TimeStampedModel):
         ('PERIOD', 'Period'),
     ]
     tenant = models.ForeignKey(Tenant, on_delete=models.PROTECT, related_name="contract_services")
-    contract = models.ForeignKey(MEContract, on_delete=models.CASCADE, related_name="contract_services")
+    contract = models.ForeignKey(MEContract, on_delete=models.CASCADE, related_name="contract_services", db_index=False)  # see Meta
     service = models.ForeignKey(MEService, on_delete=models.PROTECT, related_name="contract_links")
     billing_type = models.CharField(max_length=20, choices=BILLING_TYPES, default='PERIOD')
     quantity = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
@@ -146,6 +191,10 @@ class ContractService(TimeStampedModel):
     period_end = models.DateField(null=True, blank=True)
     sla_template = models.ForeignKey(SLATemplate, on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        # A contract's service lines (contract serializer prefetch, contract edit); also covers contract alone.
+        indexes = [models.Index(fields=["contract", "service"], name="contractservice_contract_idx")]
+
     def __str__(self):
         return f"{self.contract.code} - {self.service.name}"
 
@@ -154,9 +203,15 @@ class VAMAgreement(TimeStampedModel):
     code = models.CharField(max_length=50)
     me = models.ForeignKey(MicroEnterprise, on_delete=models.PROTECT, related_name="vam_agreements")
     total_committed_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    search_vector = stored_search_vector("code")
 
     class Meta:
         unique_together = [("tenant", "code")]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="vam_search_vector_idx"),
+            trigram_index("code", name="vam_search_trgm_idx"),
+            models.Index(fields=["tenant", "-created_at"], name="vam_tenant_created_idx"),  # API list
+        ]
 
 class MEKPI(TimeStampedModel):
     tenant = models.ForeignKey(Tenant, on_delete=models.PROTECT, related_name="me_kpis")
@@ -165,10 +220,26 @@ class MEKPI(TimeStampedModel):
     name = models.CharField(max_length=255)
     target_value = models.DecimalField(max_digits=18, decimal_places=2, null=True, blank=True)
     actual_value = models.DecimalField(max_digits=18, decimal_places=2, null=True, blank=True)
+    search_vector = stored_search_vector("code", "name")
 
     class Meta:
         unique_together = [("tenant", "code")]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="kpi_search_vector_idx"),
+            trigram_index("code", "name", name="kpi_search_trgm_idx"),
+            models.Index(fields=["tenant", "-created_at"], name="kpi_tenant_created_idx"),  # API list
+        ]
 
     def delete(self, *args, **kwargs):
         log_event(actor=None, action="DELETE", entity=self, summary=f"Deleted {self.__class__.__name__}")
         super().delete(*args, **kwargs)
+
+class TenantCounter(models.Model):
+    """Denormalised per-tenant row counts for the dashboard, maintained by platform_org.core.counters."""
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name="counters")
+    name = models.CharField(max_length=50)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("tenant", "name")]
@@ -1,19 +1,24 @@
 import os
 import json
+import time
 import requests
 from django.conf import settings
 from django.core.mail import send_mail
+from .metrics import WEBHOOK_DELIVERY
 
 def send_teams_webhook(message: str):
     url = getattr(settings, "TEAMS_WEBHOOK_URL", None) or os.getenv("TEAMS_WEBHOOK_URL")
     if not url:
         return False
     payload = {"text": message}
+    start = time.perf_counter()
     try:
         r = requests.post(url, json=payload, timeout=10)
-        return r.status_code >= 200 and r.status_code < 300
+        ok = r.status_code >= 200 and r.status_code < 300
     except Exception:
-        return False
+        ok = False
+    WEBHOOK_DELIVERY.labels("teams", "ok" if ok else "error").observe(time.perf_counter() - start)
+    return ok
 
 def send_alert_email(subject: str, message: str, to_emails: list[str]):
     if not to_emails:
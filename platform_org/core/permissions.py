@@ -4,6 +4,9 @@ from .models import MEOwner, MicroEnterprise, MEContract, VAMAgreement, MEKPI
 def is_platform_admin(user) -> bool:
     return user and user.is_authenticated and (user.is_staff or user.groups.filter(name="Platform Admin").exists())
 
+async def ais_platform_admin(user) -> bool:
+    return bool(user and user.is_authenticated and (user.is_staff or await user.groups.filter(name="Platform Admin").aexists()))
+
 class IsPlatformAdmin(BasePermission):
     def has_permission(self, request, view):
         return is_platform_admin(request.user)
@@ -0,0 +1,64 @@
+"""Postgres query plans of ORM querysets, for checks that a query prunes partitions and uses its indexes.
+
+``explain`` returns the plan tree of a queryset (executing it when ``analyze``). ``scanned`` lists the tables
+and partitions the plan reads; after ANALYZE it leaves out the ones that were never executed, e.g. the older
+months of a newest-first list that stopped early. ``seq_scans`` lists sequential scans of large tables, and
+``indexes`` the indexes a plan reads.
+"""
+import json
+
+from django.db import connections
+
+
+def explain(queryset, analyze=False):
+    raw = queryset.explain(format="json", analyze=analyze)
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return plan[0]["Plan"]
+
+
+def nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from nodes(child)
+
+
+def executed(node):
+    return node.get("Actual Loops", 1) > 0
+
+
+def scanned(plan, prefix=""):
+    """Relations read by the plan whose names start with ``prefix``, in plan order."""
+    seen = []
+    for node in nodes(plan):
+        name = node.get("Relation Name")
+        if name and name.startswith(prefix) and executed(node) and name not in seen:
+            seen.append(name)
+    return seen
+
+
+def row_estimates(names, using="default"):
+    """{relation: planner row estimate} for ``names``; -1 when never analyzed."""
+    if not names:
+        return {}
+    with connections[using].cursor() as cur:
+        cur.execute("SELECT relname, reltuples FROM pg_class WHERE relname = ANY(%s)", [list(names)])
+        return dict(cur.fetchall())
+
+
+def seq_scans(plan, min_rows=0, using="default"):
+    """Relations read with a sequential scan that hold at least ``min_rows`` rows."""
+    names = {node["Relation Name"] for node in nodes(plan) if node["Node Type"] == "Seq Scan" and executed(node)}
+    return sorted(name for name, rows in row_estimates(names, using).items() if rows >= min_rows)
+
+
+def indexes(plan, using="default"):
+    """Indexes the plan reads, with a partition's index reported as its partitioned parent index."""
+    names = list({node["Index Name"] for node in nodes(plan) if "Index Name" in node and executed(node)})
+    if not names:
+        return set()
+    with connections[using].cursor() as cur:
+        cur.execute(
+            "SELECT coalesce(pg_partition_root(c.oid)::regclass::text, c.relname) FROM pg_class c WHERE c.relname = ANY(%s)",
+            [names],
+        )
+        return {row[0] for row in cur.fetchall()}
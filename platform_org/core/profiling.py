@@ -0,0 +1,166 @@
+import json
+import logging
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.db import transaction
+
+from .db import observe_queries
+from .plans import executed, explain, indexes, nodes
+
+logger = logging.getLogger("platform_org.queries")
+
+PROJECT_ROOT = str(Path(__file__).resolve().parents[1])
+_SKIP_FRAMES = (__file__, "/django/", "/rest_framework/", "/celery/")
+
+_IN_LIST = re.compile(r"IN \((?:%s|\?)(?:, (?:%s|\?))*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def fingerprint(sql: str) -> str:
+    """Collapse literals and IN-lists so repeated per-row queries share one key."""
+    return _LITERAL.sub("?", _IN_LIST.sub("IN (...)", sql))
+
+
+def _caller():
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(PROJECT_ROOT) and not any(s in frame.filename for s in _SKIP_FRAMES):
+            return f"{Path(frame.filename).relative_to(PROJECT_ROOT).as_posix()}:{frame.lineno} in {frame.name}"
+    return "?"
+
+
+class QueryProfile:
+    """Query count, DB time and repeated fingerprints for one request, task or test block."""
+
+    def __init__(self, label=""):
+        self.label = label
+        self.count = 0
+        self.db_ms = 0.0
+        self.started = time.perf_counter()
+        self.elapsed_ms = 0.0
+        self.fingerprints = Counter()
+        self.locations = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - start) * 1000
+            self.count += 1
+            key = fingerprint(sql)
+            self.fingerprints[key] += 1
+            if key not in self.locations:
+                self.locations[key] = _caller()
+
+    def n_plus_one(self, threshold=None):
+        threshold = threshold or getattr(settings, "QUERY_PROFILER_N1_THRESHOLD", 5)
+        return [
+            {"sql": sql[:300], "count": n, "location": self.locations[sql]}
+            for sql, n in self.fingerprints.most_common()
+            if n >= threshold
+        ]
+
+    def server_timing(self):
+        return (
+            f'db;dur={self.db_ms:.1f};desc="{self.count} queries", '
+            f"app;dur={max(self.elapsed_ms - self.db_ms, 0):.1f}"
+        )
+
+    def as_dict(self):
+        return {
+            "label": self.label,
+            "queries": self.count,
+            "db_ms": round(self.db_ms, 1),
+            "total_ms": round(self.elapsed_ms, 1),
+            "n_plus_one": self.n_plus_one(),
+        }
+
+    def log(self):
+        data = self.as_dict()
+        level = logging.WARNING if data["n_plus_one"] else logging.INFO
+        logger.log(level, json.dumps(data, default=str))
+
+
+@contextmanager
+def profile_queries(label=""):
+    """Record every query this context runs, on any database and in sync_to_async threads."""
+    profile = QueryProfile(label)
+    with observe_queries(profile):
+        try:
+            yield profile
+        finally:
+            profile.elapsed_ms = (time.perf_counter() - profile.started) * 1000
+
+
+@contextmanager
+def assert_max_queries(limit, n_plus_one_threshold=None):
+    """Test helper: fail if the block runs more than ``limit`` queries or repeats one past the threshold.
+
+        with assert_max_queries(5, n_plus_one_threshold=3):
+            client.get("/api/micro-enterprises/")
+    """
+    with profile_queries("assertion") as profile:
+        yield profile
+    problems = []
+    if profile.count > limit:
+        problems.append(f"{profile.count} queries executed, expected at most {limit}")
+    if n_plus_one_threshold:
+        for item in profile.n_plus_one(n_plus_one_threshold):
+            problems.append(f"repeated {item['count']}x at {item['location']}: {item['sql']}")
+    if problems:
+        raise AssertionError("\n".join(problems))
+
+
+def assertNoSeqScan(queryset, index=None, analyze=False):
+    """Test helper (Postgres): fail if ``queryset`` can only be answered by a sequential scan, or, given
+    ``index``, if it doesn't read that index. Returns the plan.
+
+    Test tables are small enough that the planner would scan them anyway, so sequential scans are disabled
+    while planning; one that remains means no index fits the query.
+
+        assertNoSeqScan(MEKPI.objects.filter(tenant=tenant).order_by("-created_at")[:20], "kpi_tenant_created_idx")
+    """
+    with transaction.atomic(using=queryset.db), transaction.get_connection(queryset.db).cursor() as cur:
+        cur.execute("SET LOCAL enable_seqscan = off")
+        plan = explain(queryset, analyze=analyze)
+        cur.execute("RESET enable_seqscan")  # releasing a savepoint (a TestCase's) would keep SET LOCAL
+    problems = [
+        f"sequential scan of {node['Relation Name']}"
+        for node in nodes(plan) if node["Node Type"] == "Seq Scan" and executed(node)
+    ]
+    used = indexes(plan, queryset.db)
+    if index and index not in used:
+        problems.append(f"does not use {index} (uses {', '.join(sorted(used)) or 'no index'})")
+    if problems:
+        raise AssertionError("\n".join(problems))
+    return plan
+
+
+def enabled():
+    return getattr(settings, "QUERY_PROFILER_ENABLED", False)
+
+
+_task_profiles = {}
+
+
+@task_prerun.connect
+def _start_task_profile(task_id=None, task=None, **kwargs):
+    if enabled():
+        cm = profile_queries(getattr(task, "name", ""))
+        _task_profiles[task_id] = (cm, cm.__enter__())
+
+
+@task_postrun.connect
+def _finish_task_profile(task_id=None, **kwargs):
+    entry = _task_profiles.pop(task_id, None)
+    if entry:
+        cm, profile = entry
+        cm.__exit__(None, None, None)
+        profile.log()
@@ -0,0 +1,53 @@
+"""JSON renderer and parser backed by orjson when it is installed (the "speedups" extra).
+
+orjson encodes str/int/float/dict/list, dates, datetimes and UUIDs itself, exactly as DRF's encoder does
+(only large float exponents are spelled differently); Decimals, lazy strings and the rest go through DRF's
+encoder as the ``default`` hook. Pretty-printed output (``; indent=N`` or the browsable API), non-default
+UNICODE_JSON/COMPACT_JSON and anything orjson cannot encode, such as integers beyond 64 bits, fall back to
+the stdlib renderer. A NaN or infinite float is written as null, where STRICT_JSON would have raised.
+"""
+import codecs
+
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the install
+    orjson = None
+
+OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        default = self.encoder_class().default
+        try:
+            ret = orjson.dumps(data, default=default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as DRF, so the output stays a strict JavaScript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            # orjson rejects NaN/Infinity, which matches STRICT_JSON.
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
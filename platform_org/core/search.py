@@ -0,0 +1,87 @@
+from functools import reduce
+from operator import or_
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, SearchVectorField, TrigramSimilarity
+from django.db import connection, models
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Greatest, Upper
+
+SEARCH_CONFIG = "simple"
+
+
+def search_vector(*fields):
+    """Expression for a stored tsvector column (Postgres GENERATED ... STORED)."""
+    return SearchVector(*fields, config=SEARCH_CONFIG)
+
+
+def trigram_index(*fields, name):
+    # icontains compiles to UPPER(col) LIKE UPPER(%s); index the same expression so pg_trgm can serve it.
+    return GinIndex(*[OpClass(Upper(f), name="gin_trgm_ops") for f in fields], name=name)
+
+
+def stored_search_vector(*fields):
+    return models.GeneratedField(expression=search_vector(*fields), output_field=SearchVectorField(), db_persist=True)
+
+
+def related_vectors(model, fields):
+    """``<relation>__search_vector`` for each relation of ``fields`` whose model has a stored search vector."""
+    vectors = []
+    for path in fields:
+        if "__" not in path:
+            continue
+        prefix, current = path.rsplit("__", 1)[0], model
+        for name in prefix.split("__"):
+            current = current._meta.get_field(name).related_model
+        vector = f"{prefix}__search_vector"
+        if any(f.name == "search_vector" for f in current._meta.get_fields()) and vector not in vectors:
+            vectors.append(vector)
+    return vectors
+
+
+class TenantSearchFilter:
+    """Shared full-text + trigram search for DRF viewsets and the template list views.
+
+    Views declare ``search_fields`` (substring-matched, trigram indexed) and optionally
+    ``search_vector_field`` (a tsvector column, possibly across a relation). Related models' own search
+    vectors are matched as well, so a contract is found by its provider's name.
+    Results are ranked by ts_rank plus the best trigram similarity of the local fields.
+
+    Postgres can't combine indexes across an OR whose branches sit on different joined tables, so each
+    field and vector is matched by its own subquery (one index each) and the ids are UNIONed.
+    """
+
+    search_param = "q"
+
+    def get_search_terms(self, request):
+        params = getattr(request, "query_params", request.GET)
+        return (params.get(self.search_param) or params.get("search") or "").strip()
+
+    def filter_queryset(self, request, queryset, view):
+        fields = getattr(view, "search_fields", None)
+        q = self.get_search_terms(request)
+        if not fields or not q:
+            return queryset
+
+        condition = reduce(or_, (Q(**{f"{f}__icontains": q}) for f in fields))
+        if connection.vendor != "postgresql":
+            return queryset.filter(condition)
+
+        vector_field = getattr(view, "search_vector_field", "search_vector")
+        query = SearchQuery(q, config=SEARCH_CONFIG, search_type="websearch")
+        vectors = [vector_field, *(v for v in related_vectors(queryset.model, fields) if v != vector_field)]
+        rows = queryset.order_by().values("pk")  # scoped like the list (tenant, owner, window)
+        branches = [rows.filter(**{f"{f}__icontains": q}) for f in fields]
+        branches += [rows.filter(**{v: query}) for v in vectors]
+        similarities = [TrigramSimilarity(f, q) for f in fields if "__" not in f]
+        similarity = (
+            Greatest(*similarities) if len(similarities) > 1
+            else similarities[0] if similarities
+            else Value(0.0, output_field=FloatField())
+        )
+        rank = SearchRank(F(vector_field), query) + similarity
+        return (
+            queryset.filter(pk__in=branches[0].union(*branches[1:]))
+            .annotate(search_rank=rank)
+            .order_by("-search_rank", *queryset.query.order_by)
+        )
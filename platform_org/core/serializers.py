@@ -2,7 +2,7 @@ from rest_framework import serializers
 from .models import (
     MicroEnterprise, SLATemplate, MEContract, VAMAgreement, MEKPI, 
     MicroEnterpriseType, MicroEnterpriseStatus, MEService, ContractService,
-    ServiceSLACost
+    ServiceSLACost, BusinessCalendar
 )
 
 class BaseTenantSerializer(serializers.ModelSerializer):
@@ -28,13 +28,21 @@ class MicroEnterpriseSerializer(BaseTenantSerializer):
 
     class Meta:
         model = MicroEnterprise
-        fields = "__all__"
+        exclude = ["search_vector"]
 
     def get_services(self, obj):
         # Return only top-level services for this ME, they will include sub_services via MEServiceSerializer
-        services = obj.services.filter(parent__isnull=True)
+        if "services" in getattr(obj, "_prefetched_objects_cache", {}):
+            services = [s for s in obj.services.all() if s.parent_id is None]
+        else:
+            services = obj.services.filter(parent__isnull=True)
         return MEServiceSerializer(services, many=True).data
 
+class BusinessCalendarSerializer(BaseTenantSerializer):
+    class Meta:
+        model = BusinessCalendar
+        fields = "__all__"
+
 class SLATemplateSerializer(BaseTenantSerializer):
     class Meta:
         model = SLATemplate
@@ -53,12 +61,11 @@ class MEServiceSerializer(BaseTenantSerializer):
 
     class Meta:
         model = MEService
-        fields = "__all__"
+        exclude = ["search_vector"]
 
     def get_sub_services(self, obj):
-        if obj.sub_services.exists():
-            return MEServiceSerializer(obj.sub_services.all(), many=True).data
-        return []
+        # .all() honours a prefetched cache; an empty result serializes to [] either way.
+        return MEServiceSerializer(obj.sub_services.all(), many=True).data
 
 class ContractServiceSerializer(BaseTenantSerializer):
     service_name = serializers.CharField(source="service.name", read_only=True)
@@ -78,14 +85,14 @@ class MEContractSerializer(BaseTenantSerializer):
     consumer_me_name = serializers.CharField(source="consumer_me.name", read_only=True)
     class Meta:
         model = MEContract
-        fields = "__all__"
+        exclude = ["search_vector"]
 
 class VAMAgreementSerializer(BaseTenantSerializer):
     class Meta:
         model = VAMAgreement
-        fields = "__all__"
+        exclude = ["search_vector"]
 
 class MEKPISerializer(BaseTenantSerializer):
     class Meta:
         model = MEKPI
-        fields = "__all__"
+        exclude = ["search_vector"]
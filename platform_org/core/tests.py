@@ -0,0 +1,181 @@
+from datetime import date
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from platform_org.tenancy.models import Tenant
+from .conditional import ConditionalGetMixin
+from .models import (
+    ContractService, MEContract, MEKPI, MEOwner, MEService, MicroEnterprise, ServiceSLACost, SLATemplate, VAMAgreement,
+)
+from .plans import explain, indexes
+from .profiling import assertNoSeqScan
+from .search import TenantSearchFilter
+
+
+def trigram_indexes():
+    with connection.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'me_search_trgm_idx'")
+        return cur.fetchone() is not None
+
+
+def index_plan(queryset):
+    """The plan Postgres picks once a table is too big to scan: test tables are small enough that it scans them."""
+    with connection.cursor() as cur:
+        cur.execute("SET LOCAL enable_seqscan = off")
+    return explain(queryset)
+
+
+class SearchView:
+    def __init__(self, *fields):
+        self.search_fields = list(fields)
+
+
+@skipUnless(connection.vendor == "postgresql", "full-text search and query plans are Postgres only")
+class SearchPlanTests(TestCase):
+    """Searches across a relation read one index per source instead of scanning the list's table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(code="search", name="Search")
+        mes = MicroEnterprise.objects.bulk_create(
+            MicroEnterprise(tenant=cls.tenant, code=f"ME-{n:05d}", name=f"Unit {n:05d} {'zephyr' if n % 500 == 0 else 'plain'}")
+            for n in range(2000)
+        )
+        MEContract.objects.bulk_create(
+            MEContract(tenant=cls.tenant, code=f"C-{n:05d}", provider_me=mes[n], consumer_me=mes[-n - 1], start_date=date(2024, 1, 1))
+            for n in range(2000)
+        )
+        VAMAgreement.objects.bulk_create(VAMAgreement(tenant=cls.tenant, code=f"V-{n:05d}", me=mes[n]) for n in range(2000))
+        MEKPI.objects.bulk_create(MEKPI(tenant=cls.tenant, code=f"K-{n:05d}", me=mes[n], name="Uptime") for n in range(2000))
+        with connection.cursor() as cur:
+            for model in (MicroEnterprise, MEContract, VAMAgreement, MEKPI):
+                cur.execute(f"ANALYZE {model._meta.db_table}")
+            # Fresh rows sit in the GIN indexes' pending lists, which every scan reads in full (with any rows
+            # earlier tests rolled back); merge them so the planner costs the vector indexes as in production.
+            for index in ("me_search_vector_idx", "contract_search_vector_idx", "vam_search_vector_idx", "kpi_search_vector_idx"):
+                cur.execute("SELECT gin_clean_pending_list(%s::regclass)", [index])
+
+    def search(self, model, fields, q="zephyr"):
+        rows = model.objects.filter(tenant=self.tenant).order_by("-created_at")
+        return TenantSearchFilter().filter_queryset(RequestFactory().get("/", {"q": q}), rows, SearchView(*fields))
+
+    def test_contracts_match_either_party_by_name(self):
+        found = self.search(MEContract, ["code", "provider_me__name", "consumer_me__name"])
+        self.assertEqual(
+            sorted(found.values_list("code", flat=True)),
+            ["C-00000", "C-00499", "C-00500", "C-00999", "C-01000", "C-01499", "C-01500", "C-01999"],
+        )
+        self.assertEqual(list(self.search(MEContract, ["code"], q="C-00042").values_list("code", flat=True)), ["C-00042"])
+
+    LISTS = (
+        (MEContract, ["code", "provider_me__name", "consumer_me__name"], "contract_search_vector_idx", "contract_search_trgm_idx"),
+        (VAMAgreement, ["code", "me__name", "me__code"], "vam_search_vector_idx", "vam_search_trgm_idx"),
+        (MEKPI, ["code", "name", "me__name"], "kpi_search_vector_idx", "kpi_search_trgm_idx"),
+    )
+
+    def test_related_names_are_read_through_the_full_text_index(self):
+        for model, fields, vector_index, _ in self.LISTS:
+            with self.subTest(model=model.__name__):
+                used = indexes(index_plan(self.search(model, fields)))
+                self.assertLessEqual({vector_index, "me_search_vector_idx"}, used)
+
+    def test_search_never_scans_a_whole_table(self):
+        if not trigram_indexes():
+            self.skipTest("needs the pg_trgm indexes")
+        for model, fields, vector_index, trigram_index in self.LISTS:
+            with self.subTest(model=model.__name__):
+                plan = assertNoSeqScan(self.search(model, fields))
+                self.assertLessEqual({vector_index, trigram_index, "me_search_vector_idx", "me_search_trgm_idx"}, indexes(plan))
+
+
+class ConditionalStateTests(TestCase):
+    """Embedded children change the validators without the list being joined to them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(code="etag", name="ETag")
+        cls.template = SLATemplate.objects.create(tenant=cls.tenant, name="Gold")
+        cls.mes = MicroEnterprise.objects.bulk_create(
+            MicroEnterprise(tenant=cls.tenant, code=f"ME-{n}", name=f"Unit {n}") for n in range(3)
+        )
+        cls.services = MEService.objects.bulk_create(
+            MEService(tenant=cls.tenant, provider_me=me, name=f"Service {n}") for me in cls.mes for n in range(3)
+        )
+
+    def state(self):
+        view = ConditionalGetMixin()
+        view.conditional_related = ("services", "services__sla_costs")
+        return view.conditional_state(MicroEnterprise.objects.filter(tenant=self.tenant))
+
+    def test_nested_rows_change_the_state(self):
+        before = self.state()
+        cost = ServiceSLACost.objects.create(tenant=self.tenant, service=self.services[4], sla_template=self.template, cost=1)
+        added = self.state()
+        self.assertNotEqual(added, before)
+        cost.cost = 2
+        cost.save()
+        self.assertNotEqual(self.state(), added)
+        cost.delete()
+        self.assertEqual(self.state()[:4], before[:4])
+
+    def test_list_is_not_joined_to_its_children(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.state()
+        self.assertEqual(len(queries), 3)  # the list, then one per relation
+        self.assertNotIn("JOIN", queries[0]["sql"])
+        self.assertNotIn("DISTINCT", " ".join(q["sql"] for q in queries))
+
+
+@skipUnless(connection.vendor == "postgresql", "query plans are Postgres only")
+class IndexTests(TestCase):
+    """Each index added with AddIndexConcurrently serves the query it was added for."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant, other = (Tenant.objects.create(code=code, name=code) for code in ("idx", "idx-other"))
+        cls.user = get_user_model().objects.create_user("owner")
+        for tenant in (cls.tenant, other):
+            mes = MicroEnterprise.objects.bulk_create(
+                MicroEnterprise(tenant=tenant, code=f"ME-{n}", name=f"Unit {n}") for n in range(200)
+            )
+            services = MEService.objects.bulk_create(MEService(tenant=tenant, provider_me=me, name=me.name) for me in mes)
+            MEService.objects.bulk_create(
+                MEService(tenant=tenant, provider_me=service.provider_me, parent=service, name=f"{service.name} {n}")
+                for service in services for n in range(5)
+            )
+            contracts = MEContract.objects.bulk_create(
+                MEContract(tenant=tenant, code=f"C-{n}", provider_me=me, consumer_me=mes[-n - 1], start_date=date(2024, 1, 1))
+                for n, me in enumerate(mes)
+            )
+            ContractService.objects.bulk_create(
+                ContractService(tenant=tenant, contract=contract, service=service) for contract, service in zip(contracts, services)
+            )
+            VAMAgreement.objects.bulk_create(VAMAgreement(tenant=tenant, code=f"V-{n}", me=me) for n, me in enumerate(mes))
+            MEKPI.objects.bulk_create(MEKPI(tenant=tenant, code=f"K-{n}", me=me, name="Uptime") for n, me in enumerate(mes))
+        MEOwner.objects.create(tenant=cls.tenant, me=mes[0], user=cls.user)
+        with connection.cursor() as cur:
+            for model in (MicroEnterprise, MEService, MEContract, ContractService, VAMAgreement, MEKPI, MEOwner):
+                cur.execute(f"ANALYZE {model._meta.db_table}")
+
+    def test_lists(self):
+        for model, index in (
+            (MicroEnterprise, "me_tenant_created_idx"), (MEContract, "contract_tenant_created_idx"),
+            (VAMAgreement, "vam_tenant_created_idx"), (MEKPI, "kpi_tenant_created_idx"),
+        ):
+            with self.subTest(model=model.__name__):
+                assertNoSeqScan(model.objects.filter(tenant=self.tenant).order_by("-created_at")[:21], index)
+        assertNoSeqScan(MEService.objects.filter(tenant=self.tenant).order_by("name")[:21], "meservice_tenant_name_idx")
+
+    def test_lookups(self):
+        me = MicroEnterprise.objects.filter(tenant=self.tenant).first()
+        contract = MEContract.objects.filter(tenant=self.tenant).first()
+        assertNoSeqScan(
+            MEService.objects.filter(tenant=self.tenant, provider_me=me, parent__isnull=True).order_by("name"),
+            "meservice_tenant_provider_idx",
+        )
+        assertNoSeqScan(ContractService.objects.filter(contract=contract).order_by("service"), "contractservice_contract_idx")
+        assertNoSeqScan(MEOwner.objects.filter(user=self.user).values_list("me_id", flat=True), "meowner_user_me_idx")
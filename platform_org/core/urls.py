@@ -1,9 +1,10 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
+from .async_views import micro_enterprise_detail, micro_enterprise_list
 from .views import (
     MicroEnterpriseViewSet, SLATemplateViewSet, MEContractViewSet, 
     VAMAgreementViewSet, MEKPIViewSet, MicroEnterpriseTypeViewSet, 
-    MicroEnterpriseStatusViewSet, MEServiceViewSet
+    MicroEnterpriseStatusViewSet, MEServiceViewSet, BusinessCalendarViewSet
 )
 router = DefaultRouter()
 router.register("micro-enterprises", MicroEnterpriseViewSet, basename="micro-enterprises")
@@ -11,7 +12,12 @@ router.register("me-types", MicroEnterpriseTypeViewSet, basename="me-types")
 router.register("me-statuses", MicroEnterpriseStatusViewSet, basename="me-statuses")
 router.register("me-services", MEServiceViewSet, basename="me-services")
 router.register("sla-templates", SLATemplateViewSet, basename="sla-templates")
+router.register("business-calendars", BusinessCalendarViewSet, basename="business-calendars")
 router.register("contracts", MEContractViewSet, basename="contracts")
 router.register("vam-agreements", VAMAgreementViewSet, basename="vam-agreements")
 router.register("kpis", MEKPIViewSet, basename="kpis")
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("async/micro-enterprises/", micro_enterprise_list, name="async-micro-enterprises-list"),
+    path("async/micro-enterprises/<int:pk>/", micro_enterprise_detail, name="async-micro-enterprises-detail"),
+    path("", include(router.urls)),
+]
@@ -1,14 +1,21 @@
 from celery import shared_task
 
+from platform_org.core.db import replica_reads
 from platform_org.core.models import MEKPI, MicroEnterprise
-from platform_org.sla.models import SLABreachEvent
+from platform_org.sla.models import SLABreachHistory
 
 
 @shared_task
 def compute_autonomy_scores():
+    # Scores only read breaches and KPIs, so those can lag on the replica; the saves still hit the primary.
+    with replica_reads(sticky=False):
+        return _compute_autonomy_scores()
+
+
+def _compute_autonomy_scores():
     updated = 0
     for me in MicroEnterprise.objects.select_related("tenant").all():
-        breaches = SLABreachEvent.objects.filter(tenant=me.tenant, request__contract__provider_me=me).count()
+        breaches = SLABreachHistory.objects.filter(tenant=me.tenant, request__contract__provider_me=me).count()
         kpis = MEKPI.objects.filter(tenant=me.tenant, me=me)
         kpi_hit = sum(
             1
@@ -3,27 +3,26 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
-from .models import MicroEnterprise, SLATemplate, MEContract, VAMAgreement, MEKPI, MEOwner, MicroEnterpriseType, MicroEnterpriseStatus, MEService
+from .models import BusinessCalendar, MicroEnterprise, SLATemplate, MEContract, VAMAgreement, MEKPI, MEOwner, MicroEnterpriseType, MicroEnterpriseStatus, MEService
 from .serializers import (
     MicroEnterpriseSerializer, SLATemplateSerializer, MEContractSerializer, 
     VAMAgreementSerializer, MEKPISerializer, MicroEnterpriseTypeSerializer, 
-    MicroEnterpriseStatusSerializer, MEServiceSerializer
+    MicroEnterpriseStatusSerializer, MEServiceSerializer, BusinessCalendarSerializer
 )
 from .permissions import RowLevelMEPermission, IsPlatformAdmin, is_platform_admin
 from .audit import log_event
+from .conditional import ConditionalGetMixin
 from platform_org.integrations.tasks import noop_integration_event
-<<<<<<< codex/design-and-implement-platform-org-system-533cfs
 from platform_org.workflows.services import can_transition, execute_state_actions
-=======
-from platform_org.workflows.services import can_transition
->>>>>>> master
 
 def owned_me_ids(user):
     return list(MEOwner.objects.filter(user=user).values_list("me_id", flat=True))
 
-class MicroEnterpriseViewSet(viewsets.ModelViewSet):
+class MicroEnterpriseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = MicroEnterpriseSerializer
+    conditional_related = ("services", "services__sla_costs")
     permission_classes = [IsAuthenticated, RowLevelMEPermission]
+    search_fields = ["code", "name"]
     def get_queryset(self):
         qs = MicroEnterprise.objects.filter(tenant=self.request.tenant).order_by("-created_at")
         return qs if is_platform_admin(self.request.user) else qs.filter(id__in=owned_me_ids(self.request.user))
@@ -34,7 +33,7 @@ class MicroEnterpriseViewSet(viewsets.ModelViewSet):
         obj = serializer.save()
         log_event(actor=self.request.user, action="UPDATE", entity=obj, summary="Updated ME")
 
-class MicroEnterpriseTypeViewSet(viewsets.ModelViewSet):
+class MicroEnterpriseTypeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = MicroEnterpriseTypeSerializer
     permission_classes = [IsAuthenticated]
     def get_queryset(self):
@@ -42,7 +41,7 @@ class MicroEnterpriseTypeViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(tenant=self.request.tenant)
 
-class MicroEnterpriseStatusViewSet(viewsets.ModelViewSet):
+class MicroEnterpriseStatusViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = MicroEnterpriseStatusSerializer
     permission_classes = [IsAuthenticated]
     def get_queryset(self):
@@ -50,9 +49,11 @@ class MicroEnterpriseStatusViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(tenant=self.request.tenant)
 
-class MEServiceViewSet(viewsets.ModelViewSet):
+class MEServiceViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = MEServiceSerializer
+    conditional_related = ("sub_services", "sla_costs")
     permission_classes = [IsAuthenticated, RowLevelMEPermission]
+    search_fields = ["name", "description"]
     def get_queryset(self):
         qs = MEService.objects.filter(tenant=self.request.tenant).select_related("provider_me").all().order_by("name")
         if is_platform_admin(self.request.user): return qs
@@ -60,7 +61,15 @@ class MEServiceViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(tenant=self.request.tenant)
 
-class SLATemplateViewSet(viewsets.ModelViewSet):
+class BusinessCalendarViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    serializer_class = BusinessCalendarSerializer
+    permission_classes = [IsAuthenticated, IsPlatformAdmin]
+    def get_queryset(self):
+        return BusinessCalendar.objects.filter(tenant=self.request.tenant).order_by("name")
+    def perform_create(self, serializer):
+        serializer.save(tenant=self.request.tenant)
+
+class SLATemplateViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = SLATemplateSerializer
     permission_classes = [IsAuthenticated, IsPlatformAdmin]
     def get_queryset(self):
@@ -68,9 +77,11 @@ class SLATemplateViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(tenant=self.request.tenant)
 
-class MEContractViewSet(viewsets.ModelViewSet):
+class MEContractViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = MEContractSerializer
+    conditional_related = ("contract_services",)
     permission_classes = [IsAuthenticated, RowLevelMEPermission]
+    search_fields = ["code", "provider_me__name", "consumer_me__name"]
     def get_queryset(self):
         qs = MEContract.objects.filter(tenant=self.request.tenant).select_related("provider_me","consumer_me").all().order_by("-created_at")
         if is_platform_admin(self.request.user): return qs
@@ -95,18 +106,20 @@ class MEContractViewSet(viewsets.ModelViewSet):
         noop_integration_event.delay("contract_activated", {"code": contract.code})
         return Response({"status": contract.status})
 
-class VAMAgreementViewSet(viewsets.ModelViewSet):
+class VAMAgreementViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = VAMAgreementSerializer
     permission_classes = [IsAuthenticated, RowLevelMEPermission]
+    search_fields = ["code", "me__name", "me__code"]
     def get_queryset(self):
         qs = VAMAgreement.objects.filter(tenant=self.request.tenant).select_related("me").all().order_by("-created_at")
         return qs if is_platform_admin(self.request.user) else qs.filter(me_id__in=owned_me_ids(self.request.user))
     def perform_create(self, serializer):
         serializer.save(tenant=self.request.tenant)
 
-class MEKPIViewSet(viewsets.ModelViewSet):
+class MEKPIViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = MEKPISerializer
     permission_classes = [IsAuthenticated, RowLevelMEPermission]
+    search_fields = ["code", "name", "me__name"]
     def get_queryset(self):
         qs = MEKPI.objects.filter(tenant=self.request.tenant).select_related("me").all().order_by("-created_at")
         return qs if is_platform_admin(self.request.user) else qs.filter(me_id__in=owned_me_ids(self.request.user))
@@ -0,0 +1,119 @@
+"""Dependency checks behind /readyz: each reports ok/error and latency, the whole result is cached briefly."""
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+import redis
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from platform_org.core.db import REPLICA_DB_ALIAS
+from platform_org.core.metrics import CELERY_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+_clients = {}
+_lock = threading.Lock()
+_cached = (0.0, None)
+
+
+def _redis(url, timeout):
+    # One client (and connection pool) per URL, so a probe reuses sockets instead of reconnecting.
+    client = _clients.get(url)
+    if client is None:
+        client = _clients[url] = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+    return client
+
+
+def celery_queues():
+    from config.celery_app import app
+
+    names = {app.conf.task_default_queue or "celery"}
+    for route in (settings.CELERY_TASK_ROUTES or {}).values():
+        if route.get("queue"):
+            names.add(route["queue"])
+    return sorted(names)
+
+
+def check_database(timeout, alias=DEFAULT_DB_ALIAS):
+    conn = connections[alias]
+    try:
+        # connect_timeout bounds reaching the server; the statement timeout bounds a server that can't answer.
+        with transaction.atomic(using=alias), conn.cursor() as cur:
+            if conn.vendor == "postgresql":
+                cur.execute(f"SET LOCAL statement_timeout = {max(int(timeout * 1000), 1)}")
+            cur.execute("SELECT 1")
+            cur.fetchone()
+    except Exception:
+        conn.close()  # reconnect on the next probe instead of reusing a dead socket
+        raise
+    return {}
+
+
+def check_redis(timeout):
+    _redis(settings.REDIS_URL, timeout).ping()
+    return {}
+
+
+def check_broker(timeout):
+    url = settings.CELERY_BROKER_URL
+    queues = celery_queues()
+    if urlparse(url).scheme in ("redis", "rediss"):
+        client = _redis(url, timeout)
+        pipe = client.pipeline(transaction=False)
+        for name in queues:
+            pipe.llen(name)
+        depth = dict(zip(queues, pipe.execute()))
+    else:
+        from config.celery_app import app
+
+        with app.connection_for_read() as conn:
+            conn.ensure_connection(max_retries=1, timeout=timeout)
+            depth = {name: conn.default_channel.queue_declare(queue=name, passive=True).message_count for name in queues}
+    for name, count in depth.items():
+        CELERY_QUEUE_DEPTH.labels(name).set(count)
+    return {"queue_depth": depth}
+
+
+def check_replica(timeout):
+    return check_database(timeout, REPLICA_DB_ALIAS)
+
+
+CHECKS = {"database": check_database, "redis": check_redis, "broker": check_broker}
+if REPLICA_DB_ALIAS in settings.DATABASES:
+    CHECKS["replica"] = check_replica
+
+
+def run_checks(timeout):
+    results, ready = {}, True
+    for name, check in CHECKS.items():
+        start = time.perf_counter()
+        try:
+            extra, ok = check(timeout), True
+        except Exception:
+            # The probe is unauthenticated, so the reason is logged rather than returned.
+            logger.warning("Readiness check %s failed", name, exc_info=True)
+            extra, ok = {}, False
+        latency = time.perf_counter() - start
+        if ok and latency > timeout:
+            logger.warning("Readiness check %s slow: %.0f ms > %.0f ms", name, latency * 1000, timeout * 1000)
+            ok = False
+        results[name] = {"status": "ok" if ok else "error", "latency_ms": round(latency * 1000, 1), **extra}
+        ready = ready and ok
+    return ready, results
+
+
+def readiness():
+    """(ready, report) — served from a per-process cache for HEALTH_CHECK_CACHE_SECONDS."""
+    global _cached
+    expires, value = _cached
+    if value is not None and time.monotonic() < expires:
+        return value
+    with _lock:
+        expires, value = _cached
+        if value is None or time.monotonic() >= expires:
+            ready, checks = run_checks(settings.HEALTH_CHECK_TIMEOUT)
+            value = (ready, {"status": "ok" if ready else "unavailable", "checks": checks})
+            _cached = (time.monotonic() + settings.HEALTH_CHECK_CACHE_SECONDS, value)
+    return value
@@ -0,0 +1,33 @@
+from asgiref.sync import sync_to_async
+
+from platform_org.core.middleware import HybridMiddleware
+from .views import livez, metrics, readyz
+
+PROBES = {"/livez": livez, "/healthz": livez, "/readyz": readyz, "/metrics": metrics}
+
+
+class ProbeMiddleware(HybridMiddleware):
+    """Answer kubelet probes and Prometheus scrapes before host validation, sessions and tenant lookup.
+
+    Both arrive with the pod IP as Host, which ALLOWED_HOSTS rejects and TenantMiddleware
+    would try to resolve as a subdomain, so they are short-circuited here.
+    """
+
+    def _probe(self, request):
+        return PROBES.get(request.path_info) if request.method in ("GET", "HEAD") else None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        view = self._probe(request)
+        return view(request) if view is not None else self.get_response(request)
+
+    async def __acall__(self, request):
+        view = self._probe(request)
+        if view is livez:
+            return view(request)
+        if view is not None:
+            # Readiness is cached; on a miss its DB and Redis calls run in a worker thread, as does the
+            # metrics exposition (it reads the multiprocess files).
+            return await sync_to_async(view)(request)
+        return await self.get_response(request)
@@ -0,0 +1,28 @@
+from django.test import SimpleTestCase, override_settings
+
+POD_IP = "10.42.0.7"  # not in ALLOWED_HOSTS, and no tenant subdomain or header
+
+
+class ProbeTests(SimpleTestCase):
+    """Kubelet probes and Prometheus scrapes address the pod by IP and never name a tenant."""
+
+    def test_scrape_by_pod_ip(self):
+        response = self.client.get("/metrics", HTTP_HOST=POD_IP)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("text/plain", response["Content-Type"])
+
+    async def test_scrape_by_pod_ip_under_asgi(self):
+        response = await self.async_client.get("/metrics", headers={"host": POD_IP})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_scrape_still_needs_the_token(self):
+        self.assertEqual(self.client.get("/metrics", HTTP_HOST=POD_IP).status_code, 401)
+        response = self.client.get("/metrics", HTTP_HOST=POD_IP, HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+
+    def test_liveness_by_pod_ip(self):
+        self.assertEqual(self.client.get("/livez", HTTP_HOST=POD_IP).status_code, 200)
+
+    def test_other_paths_still_validate_the_host(self):
+        self.assertEqual(self.client.get("/api/", HTTP_HOST=POD_IP).status_code, 400)
@@ -1,3 +1,8 @@
 from django.urls import path
-from .views import healthz
-urlpatterns = [path("healthz", healthz)]
+from .views import healthz, livez, metrics, readyz
+urlpatterns = [
+    path("healthz", healthz, name="healthz"),
+    path("livez", livez, name="livez"),
+    path("readyz", readyz, name="readyz"),
+    path("metrics", metrics, name="metrics"),
+]
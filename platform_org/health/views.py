@@ -1,3 +1,16 @@
-from django.http import JsonResponse
-def healthz(request):
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from platform_org.core.metrics import exposition
+from .checks import readiness
+def livez(request):
     return JsonResponse({"status":"ok"})
+healthz = livez
+def readyz(request):
+    ready, report = readiness()
+    return JsonResponse(report, status=200 if ready else 503)
+def metrics(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+    body, content_type = exposition()
+    return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import TicketSource
+
+@admin.register(TicketSource)
+class TicketSourceAdmin(admin.ModelAdmin):
+    list_display = ("tenant", "source", "base_url", "is_active", "cursor_updated_at", "last_synced_at")
+    list_filter = ("tenant", "source", "is_active")
+    readonly_fields = ("cursor_updated_at", "cursor_token", "last_synced_at", "last_error")
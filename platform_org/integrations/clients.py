@@ -0,0 +1,185 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+
+import httpx
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+from platform_org.sla.models import ServiceRequest
+
+
+@dataclass
+class RemoteTicket:
+    external_id: str
+    title: str
+    status: str
+    priority: str
+    opened_at: datetime
+    updated_at: datetime
+    first_response_at: datetime | None = None
+    resolved_at: datetime | None = None
+    contract_code: str = ""
+
+
+@dataclass
+class RemotePage:
+    tickets: list[RemoteTicket]
+    next_token: str = ""
+
+
+def _dt(value):
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    # Jira emits +0000 offsets, which fromisoformat only accepts from Python 3.11.
+    parsed = parse_datetime(value) or datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=dt_timezone.utc)
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=getattr(settings, "INTEGRATION_HTTP_MAX_CONNECTIONS", 10),
+        max_keepalive_connections=getattr(settings, "INTEGRATION_HTTP_MAX_CONNECTIONS", 10),
+    )
+
+
+class TicketClient:
+    """Async, connection-pooled reader for one TicketSource. Use as ``async with`` to fetch pages;
+    ``to_ticket`` also maps webhook payloads and needs no connection."""
+
+    page_size = 100
+
+    def __init__(self, ticket_source, transport=None):
+        self.ticket_source = ticket_source
+        self.field_map = ticket_source.field_map or {}
+        self.transport = transport
+        self.http = None
+
+    async def __aenter__(self):
+        self.http = httpx.AsyncClient(
+            base_url=self.ticket_source.base_url.rstrip("/"),
+            headers=self.headers(),
+            auth=self.auth(),
+            limits=_limits(),
+            timeout=getattr(settings, "INTEGRATION_HTTP_TIMEOUT", 30),
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.http.aclose()
+
+    def headers(self):
+        return {"Accept": "application/json"}
+
+    def auth(self):
+        return None
+
+    async def fetch_page(self, since: datetime | None, token: str) -> RemotePage:
+        raise NotImplementedError
+
+    def from_webhook(self, payload: dict) -> RemoteTicket | None:
+        raise NotImplementedError
+
+
+class JiraClient(TicketClient):
+    STATUS_CATEGORIES = {
+        "new": ServiceRequest.Status.OPEN,
+        "indeterminate": ServiceRequest.Status.IN_PROGRESS,
+        "done": ServiceRequest.Status.RESOLVED,
+    }
+
+    def auth(self):
+        return (self.ticket_source.username, self.ticket_source.api_token)
+
+    def jql(self, since):
+        clauses = [f"({self.ticket_source.query})"] if self.ticket_source.query else []
+        if since:
+            # JQL has minute precision; the overlap is harmless because upserts are idempotent.
+            clauses.append(f'updated >= "{since.astimezone(dt_timezone.utc):%Y-%m-%d %H:%M}"')
+        return " AND ".join(clauses) + " ORDER BY updated ASC"
+
+    async def fetch_page(self, since, token):
+        fields = ["summary", "status", "priority", "created", "updated", "resolutiondate", *self.field_map.values()]
+        params = {"jql": self.jql(since), "maxResults": self.page_size, "fields": ",".join(fields)}
+        if token:
+            params["nextPageToken"] = token
+        resp = await self.http.get("/rest/api/3/search/jql", params=params)
+        resp.raise_for_status()
+        data = resp.json()
+        tickets = [self.to_ticket(issue) for issue in data.get("issues", [])]
+        return RemotePage(tickets, "" if data.get("isLast", True) else data.get("nextPageToken", ""))
+
+    def from_webhook(self, payload):
+        if payload.get("webhookEvent") not in ("jira:issue_created", "jira:issue_updated") or "issue" not in payload:
+            return None
+        return self.to_ticket(payload["issue"])
+
+    def to_ticket(self, issue):
+        f = issue.get("fields", {})
+        category = ((f.get("status") or {}).get("statusCategory") or {}).get("key", "new")
+        contract = f.get(self.field_map["contract"]) if "contract" in self.field_map else ""
+        if isinstance(contract, dict):
+            contract = contract.get("value", "")
+        return RemoteTicket(
+            external_id=issue["key"],
+            title=(f.get("summary") or issue["key"])[:255],
+            status=self.STATUS_CATEGORIES.get(category, ServiceRequest.Status.IN_PROGRESS),
+            priority=((f.get("priority") or {}).get("name") or "MEDIUM").upper()[:30],
+            opened_at=_dt(f.get("created")),
+            updated_at=_dt(f.get("updated")),
+            first_response_at=_dt(f.get(self.field_map["first_response_at"])) if "first_response_at" in self.field_map else None,
+            resolved_at=_dt(f.get("resolutiondate")),
+            contract_code=contract or "",
+        )
+
+
+class JitbitClient(TicketClient):
+    PRIORITIES = {-1: "LOW", 0: "MEDIUM", 1: "HIGH", 2: "CRITICAL"}
+
+    def headers(self):
+        return {**super().headers(), "Authorization": f"Bearer {self.ticket_source.api_token}"}
+
+    async def fetch_page(self, since, token):
+        offset = int(token or 0)
+        params = {"count": self.page_size, "offset": offset, "mode": "all"}
+        if since:
+            params["updatedFrom"] = since.astimezone(dt_timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        if self.ticket_source.query:
+            params["categoryid"] = self.ticket_source.query
+        resp = await self.http.get("/api/Tickets", params=params)
+        resp.raise_for_status()
+        rows = resp.json()
+        tickets = [self.to_ticket(row) for row in rows]
+        return RemotePage(tickets, str(offset + len(rows)) if len(rows) == self.page_size else "")
+
+    def from_webhook(self, payload):
+        # Jitbit automation rules post a configurable body; accept the ticket bare or under "ticket".
+        row = payload.get("ticket", payload)
+        return self.to_ticket(row) if row.get("IssueID") else None
+
+    def to_ticket(self, row):
+        status_name = (row.get("Status") or "").lower()
+        if status_name == "closed":
+            status = ServiceRequest.Status.CLOSED
+        elif row.get("ResolvedDate"):
+            status = ServiceRequest.Status.RESOLVED
+        elif status_name == "new":
+            status = ServiceRequest.Status.OPEN
+        else:
+            status = ServiceRequest.Status.IN_PROGRESS
+        return RemoteTicket(
+            external_id=str(row["IssueID"]),
+            title=(row.get("Subject") or str(row["IssueID"]))[:255],
+            status=status,
+            priority=self.PRIORITIES.get(row.get("Priority"), "MEDIUM"),
+            opened_at=_dt(row.get("IssueDate")),
+            updated_at=_dt(row.get("LastUpdated") or row.get("IssueDate")),
+            first_response_at=_dt(row.get(self.field_map["first_response_at"])) if "first_response_at" in self.field_map else None,
+            resolved_at=_dt(row.get("ResolvedDate")),
+            contract_code=str(row.get(self.field_map["contract"]) or "") if "contract" in self.field_map else "",
+        )
+
+
+CLIENTS = {"JIRA": JiraClient, "JITBIT": JitbitClient}
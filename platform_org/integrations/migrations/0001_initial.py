@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:16
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0013_search_vectors_and_trigram_indexes'),
+        ('tenancy', '0002_tenant_slug_alter_tenantuser_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('JITBIT', 'Jitbit'), ('JIRA', 'Jira')], max_length=20)),
+                ('base_url', models.URLField()),
+                ('username', models.CharField(blank=True, max_length=255)),
+                ('api_token', models.CharField(max_length=512)),
+                ('query', models.CharField(blank=True, help_text='Extra JQL (Jira) or category id (Jitbit).', max_length=500)),
+                ('field_map', models.JSONField(blank=True, default=dict)),
+                ('is_active', models.BooleanField(default=True)),
+                ('cursor_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('cursor_token', models.CharField(blank=True, max_length=500)),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('default_contract', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.mecontract')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_sources', to='tenancy.tenant')),
+            ],
+            options={
+                'unique_together': {('tenant', 'source')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticketsource',
+            name='webhook_secret',
+            field=models.CharField(blank=True, help_text='HMAC-SHA256 key for inbound webhooks; empty disables them.', max_length=255),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.db import models
+from django.utils import timezone
+from platform_org.tenancy.models import Tenant
+from platform_org.core.models import MEContract
+
+
+class TicketSource(models.Model):
+    """A tenant's connection to an external ticketing system plus its incremental sync cursor."""
+
+    class Source(models.TextChoices):
+        JITBIT = "JITBIT", "Jitbit"
+        JIRA = "JIRA", "Jira"
+
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name="ticket_sources")
+    source = models.CharField(max_length=20, choices=Source.choices)
+    base_url = models.URLField()
+    username = models.CharField(max_length=255, blank=True)
+    api_token = models.CharField(max_length=512)
+    query = models.CharField(max_length=500, blank=True, help_text="Extra JQL (Jira) or category id (Jitbit).")
+    # Remote field names for values without a native equivalent, e.g. {"contract": "customfield_10010"}.
+    field_map = models.JSONField(default=dict, blank=True)
+    default_contract = models.ForeignKey(MEContract, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    is_active = models.BooleanField(default=True)
+    webhook_secret = models.CharField(max_length=255, blank=True, help_text="HMAC-SHA256 key for inbound webhooks; empty disables them.")
+
+    cursor_updated_at = models.DateTimeField(null=True, blank=True)
+    cursor_token = models.CharField(max_length=500, blank=True)
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("tenant", "source")]
+
+    def __str__(self):
+        return f"{self.tenant} - {self.get_source_display()}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The webhook receiver caches secrets; drop the entry so rotations apply immediately.
+        cache.delete(f"integrations:webhooks:secret:{self.pk}")
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.utils import timezone
+
+from platform_org.core.models import MEContract
+from platform_org.sla.archive import restore
+from platform_org.sla.models import ServiceRequest
+from platform_org.sla.partitions import cover
+from platform_org.sla.rollups import key_of, mark_keys
+from .clients import CLIENTS
+from .models import TicketSource
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAMESPACE = 3101
+
+SYNCED_FIELDS = ["title", "status", "priority", "opened_at", "first_response_at", "resolved_at", "contract"]
+
+
+@contextmanager
+def advisory_lock(namespace: int, key: int):
+    """Session-level Postgres advisory lock; always granted on other backends."""
+    if connection.vendor != "postgresql":
+        yield True
+        return
+    with connection.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s, %s)", [namespace, key])
+        acquired = cur.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cur:
+                cur.execute("SELECT pg_advisory_unlock(%s, %s)", [namespace, key])
+
+
+def source_lock(source_id: int):
+    """Advisory lock per TicketSource."""
+    return advisory_lock(LOCK_NAMESPACE, source_id)
+
+
+def upsert_tickets(tenant, source: str, tickets, default_contract=None) -> dict:
+    """Create or update ServiceRequests for remote tickets with a fixed number of queries per batch."""
+    stats = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+    if not tickets:
+        return stats
+    latest = {}
+    for t in tickets:
+        latest[t.external_id] = t  # a page may repeat a ticket; keep the last version
+
+    codes = {t.contract_code for t in latest.values() if t.contract_code}
+    contracts = {c.code: c for c in MEContract.objects.filter(tenant=tenant, code__in=codes)} if codes else {}
+    existing = {
+        r.external_id: r
+        for r in ServiceRequest.objects.filter(tenant=tenant, source=source, external_id__in=list(latest))
+    }
+    missing = set(latest) - set(existing)
+    if missing and restore(tenant, source, missing):
+        # Tickets changed after they were archived come back to the hot table instead of being duplicated.
+        existing.update(
+            (r.external_id, r)
+            for r in ServiceRequest.objects.filter(tenant=tenant, source=source, external_id__in=list(missing))
+        )
+
+    to_create, to_update, rollup_keys = [], [], set()
+    for external_id, t in latest.items():
+        contract = contracts.get(t.contract_code) or default_contract
+        row = existing.get(external_id)
+        if row is None and contract is None:
+            stats["skipped"] += 1
+            continue
+        values = {
+            "title": t.title,
+            "status": t.status,
+            "priority": t.priority,
+            "opened_at": t.opened_at or (row.opened_at if row else timezone.now()),
+            "first_response_at": t.first_response_at,
+            "resolved_at": t.resolved_at,
+            # The id keeps the comparison below from loading each existing row's contract.
+            "contract_id": contract.pk if contract else row.contract_id,
+        }
+        if row is None:
+            to_create.append(ServiceRequest(tenant=tenant, source=source, external_id=external_id, **values))
+        elif any(getattr(row, k) != v for k, v in values.items()):
+            rollup_keys.add(key_of(row))  # the key it leaves if contract or opened_at changes
+            for k, v in values.items():
+                setattr(row, k, v)
+            to_update.append(row)
+        else:
+            stats["unchanged"] += 1
+
+    cover(ServiceRequest, [r.opened_at for r in to_create + to_update])  # bulk writes skip pre_save
+    with transaction.atomic():
+        ServiceRequest.objects.bulk_create(to_create, batch_size=500)
+        ServiceRequest.objects.bulk_update(to_update, SYNCED_FIELDS, batch_size=500)
+        # Bulk writes skip the signals that keep SLA rollups current.
+        mark_keys(rollup_keys | {key_of(r) for r in to_create + to_update})
+    stats["created"] = len(to_create)
+    stats["updated"] = len(to_update)
+    return stats
+
+
+def _checkpoint(ticket_source, page, stats):
+    page_stats = upsert_tickets(ticket_source.tenant, ticket_source.source, page.tickets, ticket_source.default_contract)
+    for k, v in page_stats.items():
+        stats[k] += v
+    newest = max((t.updated_at for t in page.tickets if t.updated_at), default=None)
+    if newest and (stats.get("high_water") is None or newest > stats["high_water"]):
+        stats["high_water"] = newest
+    # Persist the continuation token after every page so a crashed run resumes where it stopped.
+    ticket_source.cursor_token = page.next_token
+    ticket_source.save(update_fields=["cursor_token", "updated_at"])
+
+
+async def _run(ticket_source, transport=None):
+    stats = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0, "pages": 0, "high_water": None}
+    since = ticket_source.cursor_updated_at
+    checkpoint = sync_to_async(_checkpoint, thread_sensitive=True)
+    async with CLIENTS[ticket_source.source](ticket_source, transport=transport) as client:
+        pending = asyncio.create_task(client.fetch_page(since, ticket_source.cursor_token))
+        while True:
+            page = await pending
+            if page.next_token:
+                # Fetch the next page while this one is written.
+                pending = asyncio.create_task(client.fetch_page(since, page.next_token))
+            await checkpoint(ticket_source, page, stats)
+            stats["pages"] += 1
+            if not page.next_token:
+                break
+    return stats
+
+
+def sync_ticket_source(ticket_source: TicketSource, transport=None) -> dict:
+    """Pull tickets changed since the stored cursor and advance it once the run completes."""
+    started = timezone.now()
+    try:
+        stats = asyncio.run(_run(ticket_source, transport))
+    except Exception as exc:
+        ticket_source.last_error = str(exc)[:2000]
+        ticket_source.save(update_fields=["last_error", "updated_at"])
+        logger.exception("Ticket sync failed for %s", ticket_source)
+        raise
+    high_water = stats.pop("high_water")
+    if high_water:
+        ticket_source.cursor_updated_at = high_water
+    ticket_source.cursor_token = ""
+    ticket_source.last_synced_at = started
+    ticket_source.last_error = ""
+    ticket_source.save(update_fields=["cursor_updated_at", "cursor_token", "last_synced_at", "last_error", "updated_at"])
+    return stats
@@ -1,4 +1,35 @@
 from celery import shared_task
+
+from .models import TicketSource
+from .sync import source_lock, sync_ticket_source
+from .webhooks import drain
+
+
 @shared_task
 def noop_integration_event(kind: str, payload: dict):
     return {"ok": True, "kind": kind, "payload": payload}
+
+
+@shared_task
+def sync_ticket_sources():
+    ids = list(TicketSource.objects.filter(is_active=True, tenant__is_active=True).values_list("id", flat=True))
+    for source_id in ids:
+        sync_ticket_source_task.delay(source_id)
+    return {"queued": len(ids)}
+
+
+@shared_task
+def sync_ticket_source_task(source_id: int):
+    with source_lock(source_id) as acquired:
+        # Overlapping beats never sync the same source twice at once.
+        if not acquired:
+            return {"skipped": source_id}
+        ticket_source = TicketSource.objects.select_related("tenant", "default_contract").filter(pk=source_id, is_active=True).first()
+        if ticket_source is None:
+            return {"skipped": source_id}
+        return sync_ticket_source(ticket_source)
+
+
+@shared_task
+def drain_ticket_webhooks():
+    return drain()
@@ -0,0 +1,218 @@
+import json
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock, skipUnless
+
+import fakeredis
+import httpx
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from platform_org.core.models import MEContract, MicroEnterprise
+from platform_org.sla.models import ServiceRequest
+from platform_org.tenancy.models import Tenant
+from .clients import JitbitClient, RemoteTicket
+from .models import TicketSource
+from .sync import sync_ticket_source, upsert_tickets
+from .webhooks import DRAIN_LOCK_NAMESPACE, QUEUE_KEY, drain, enqueue
+
+
+class FakeJira:
+    """A Jira Cloud search endpoint over ``issues``, ``page_size`` per page with nextPageToken continuation."""
+
+    def __init__(self, issues, page_size=2):
+        self.issues, self.page_size, self.requests = issues, page_size, []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.url.path != "/rest/api/3/search/jql":
+            return httpx.Response(404)
+        start = int(request.url.params.get("nextPageToken") or 0)
+        page = self.issues[start:start + self.page_size]
+        end = start + len(page)
+        return httpx.Response(200, json={
+            "issues": page, "isLast": end >= len(self.issues), "nextPageToken": str(end),
+        })
+
+
+class FakeJitbit:
+    """A Jitbit /api/Tickets endpoint over ``rows`` with count/offset paging."""
+
+    def __init__(self, rows):
+        self.rows, self.requests = rows, []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.url.path != "/api/Tickets":
+            return httpx.Response(404)
+        offset, count = int(request.url.params["offset"]), int(request.url.params["count"])
+        return httpx.Response(200, json=self.rows[offset:offset + count])
+
+
+def jira_issue(key, created, updated, contract="C-1", status="new", **fields):
+    return {"key": key, "fields": {
+        "summary": f"Issue {key}",
+        "status": {"statusCategory": {"key": status}},
+        "priority": {"name": "High"},
+        "created": created,
+        "updated": updated,
+        "customfield_10010": {"value": contract},
+        **fields,
+    }}
+
+
+# Runs outside a test transaction: the sync writes each page from asgiref's sync thread, on its own connection.
+class TicketSyncTests(TransactionTestCase):
+    def setUp(self):
+        patcher = mock.patch("platform_org.sla.rollups._enqueue")  # rollup keys go to Redis once a write commits
+        self.enqueued = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tenant = Tenant.objects.create(code="acme", name="Acme")
+        provider = MicroEnterprise.objects.create(tenant=self.tenant, code="P", name="Provider")
+        consumer = MicroEnterprise.objects.create(tenant=self.tenant, code="C", name="Consumer")
+        self.contract, self.other = (
+            MEContract.objects.create(
+                tenant=self.tenant, code=code, provider_me=provider, consumer_me=consumer, start_date=date(2024, 1, 1)
+            )
+            for code in ("C-1", "C-2")
+        )
+
+    def source(self, source, **kwargs):
+        return TicketSource.objects.create(
+            tenant=self.tenant, source=source, base_url="https://tickets.example.com/", api_token="t", **kwargs
+        )
+
+    def requests(self):
+        return {r.external_id: r for r in ServiceRequest.objects.filter(tenant=self.tenant)}
+
+    def test_jira_sync_pages_and_advances_cursor(self):
+        server = FakeJira([
+            jira_issue("OPS-1", "2024-03-01T10:00:00.000+0000", "2024-03-02T10:00:00.000+0000"),
+            jira_issue("OPS-2", "2024-03-05T10:00:00.000+0000", "2024-03-06T10:00:00.000+0000", contract="C-2"),
+            jira_issue("OPS-3", "2024-04-01T10:00:00.000+0000", "2024-04-02T10:00:00.000+0000", status="done",
+                       resolutiondate="2024-04-02T09:00:00.000+0000"),
+        ])
+        ticket_source = self.source("JIRA", field_map={"contract": "customfield_10010"})
+
+        stats = sync_ticket_source(ticket_source, transport=httpx.MockTransport(server))
+
+        self.assertEqual(stats, {"created": 3, "updated": 0, "unchanged": 0, "skipped": 0, "pages": 2})
+        self.assertEqual([r.url.params.get("nextPageToken") for r in server.requests], [None, "2"])
+        rows = self.requests()
+        self.assertEqual(rows["OPS-1"].contract_id, self.contract.pk)
+        self.assertEqual(rows["OPS-2"].contract_id, self.other.pk)
+        self.assertEqual(rows["OPS-3"].status, ServiceRequest.Status.RESOLVED)
+        self.assertEqual(rows["OPS-1"].opened_at, datetime(2024, 3, 1, 10, tzinfo=dt_timezone.utc))
+        ticket_source.refresh_from_db()
+        self.assertEqual(ticket_source.cursor_updated_at, datetime(2024, 4, 2, 10, tzinfo=dt_timezone.utc))
+        self.assertEqual((ticket_source.cursor_token, ticket_source.last_error), ("", ""))
+        self.assertIn(f"{self.other.pk}:2024-03-05", set().union(*(c.args[0] for c in self.enqueued.call_args_list)))
+
+        # The next run asks only for tickets updated since the cursor and leaves unchanged ones alone.
+        stats = sync_ticket_source(ticket_source, transport=httpx.MockTransport(server))
+        self.assertEqual(stats["unchanged"], 3)
+        self.assertIn('updated >= "2024-04-02 10:00"', server.requests[-1].url.params["jql"])
+
+    def test_jitbit_sync_updates_existing_rows(self):
+        rows = [
+            {"IssueID": n, "Subject": f"Ticket {n}", "Status": "New", "Priority": 1,
+             "IssueDate": "2024-03-01T10:00:00", "LastUpdated": "2024-03-01T11:00:00"}
+            for n in range(1, 4)
+        ]
+        ticket_source = self.source("JITBIT", default_contract=self.contract)
+        with mock.patch.object(JitbitClient, "page_size", 2):
+            sync_ticket_source(ticket_source, transport=httpx.MockTransport(FakeJitbit(rows)))
+            rows[0].update(Status="Closed", ResolvedDate="2024-03-02T10:00:00", LastUpdated="2024-03-02T10:00:00")
+            stats = sync_ticket_source(ticket_source, transport=httpx.MockTransport(FakeJitbit(rows)))
+
+        self.assertEqual(stats, {"created": 0, "updated": 1, "unchanged": 2, "skipped": 0, "pages": 2})
+        closed = self.requests()["1"]
+        self.assertEqual((closed.status, closed.priority), (ServiceRequest.Status.CLOSED, "HIGH"))
+        self.assertEqual(closed.resolved_at, datetime(2024, 3, 2, 10, tzinfo=dt_timezone.utc))
+
+    def test_failed_page_records_the_error(self):
+        ticket_source = self.source("JIRA")
+        with self.assertRaises(httpx.HTTPStatusError):
+            sync_ticket_source(ticket_source, transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+        ticket_source.refresh_from_db()
+        self.assertIn("503", ticket_source.last_error)
+        self.assertIsNone(ticket_source.cursor_updated_at)
+
+    def test_update_keeps_opened_at_and_contract_when_the_payload_has_none(self):
+        opened = datetime(2024, 3, 1, 10, tzinfo=dt_timezone.utc)
+        for n in range(3):
+            ServiceRequest.objects.create(
+                tenant=self.tenant, contract=self.contract, source="JIRA", external_id=str(n), title="old", opened_at=opened
+            )
+
+        def tickets(count):
+            return [RemoteTicket(str(n), "new", "OPEN", "MEDIUM", opened_at=None, updated_at=None) for n in range(count)]
+
+        with CaptureQueriesContext(connection) as one:
+            upsert_tickets(self.tenant, "JIRA", tickets(1))
+        with CaptureQueriesContext(connection) as three:
+            stats = upsert_tickets(self.tenant, "JIRA", tickets(3))
+
+        self.assertEqual(stats["updated"], 2)
+        self.assertEqual(len(three), len(one))  # existing rows' contracts are never loaded one by one
+        for row in self.requests().values():
+            self.assertEqual((row.title, row.opened_at, row.contract_id), ("new", opened, self.contract.pk))
+
+
+class WebhookDrainTests(TransactionTestCase):
+    def setUp(self):
+        for target in ("platform_org.sla.rollups._enqueue", "platform_org.integrations.tasks.drain_ticket_webhooks"):
+            patcher = mock.patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.redis = fakeredis.FakeRedis()
+        for target in ("platform_org.integrations.webhooks._redis", "platform_org.sla.stream._redis"):
+            patcher = mock.patch(target, self.redis)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        tenant = Tenant.objects.create(code="acme", name="Acme")
+        me = MicroEnterprise.objects.create(tenant=tenant, code="P", name="Provider")
+        contract = MEContract.objects.create(tenant=tenant, code="C-1", provider_me=me, consumer_me=me, start_date=date(2024, 1, 1))
+        self.source = TicketSource.objects.create(
+            tenant=tenant, source="JIRA", base_url="https://tickets.example.com/", api_token="t",
+            field_map={"contract": "customfield_10010"}, default_contract=contract,
+        )
+
+    def send(self, updated, summary):
+        issue = jira_issue("OPS-1", "2024-03-01T10:00:00.000+0000", updated, summary=summary)
+        enqueue(self.source.pk, json.dumps({"webhookEvent": "jira:issue_updated", "issue": issue}).encode())
+
+    def title(self):
+        return ServiceRequest.objects.get(external_id="OPS-1").title
+
+    def test_older_event_never_overwrites_a_newer_one(self):
+        # Within one batch ...
+        self.send("2024-03-02T10:00:00.000+0000", "second")
+        self.send("2024-03-01T11:00:00.000+0000", "first")
+        self.assertEqual(drain()["coalesced"], 1)
+        self.assertEqual(self.title(), "second")
+
+        # ... and when the older event arrives in a later drain.
+        self.send("2024-03-01T11:00:00.000+0000", "first")
+        self.assertEqual(drain()["duplicates"], 1)
+        self.assertEqual(self.title(), "second")
+
+        self.send("2024-03-03T10:00:00.000+0000", "third")
+        drain()
+        self.assertEqual(self.title(), "third")
+
+    @skipUnless(connection.vendor == "postgresql", "the drain lock is a Postgres advisory lock")
+    def test_only_one_drain_runs_at_a_time(self):
+        self.send("2024-03-02T10:00:00.000+0000", "second")
+        other = connections.create_connection(DEFAULT_DB_ALIAS)
+        self.addCleanup(other.close)
+        with other.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s, 0)", [DRAIN_LOCK_NAMESPACE])
+
+        self.assertEqual(drain(), {"busy": 1})
+        self.assertEqual(self.redis.llen(QUEUE_KEY), 1)  # left for the running drain, or the follow-up it scheduled
+
+        with other.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s, 0)", [DRAIN_LOCK_NAMESPACE])
+        self.assertEqual(drain()["events"], 1)
+        self.assertEqual(self.title(), "second")
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import ticket_webhook
+
+urlpatterns = [
+    path("api/integrations/webhooks/<int:source_id>/", ticket_webhook, name="ticket-webhook"),
+]
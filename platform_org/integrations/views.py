@@ -0,0 +1,16 @@
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .webhooks import enqueue, signature_valid, webhook_secret
+
+
+@csrf_exempt
+@require_POST
+def ticket_webhook(request, source_id: int):
+    """Verify and queue; all parsing and database writes happen in the drain worker."""
+    header = request.headers.get("X-Hub-Signature-256") or request.headers.get("X-Hub-Signature", "")
+    if not signature_valid(webhook_secret(source_id), request.body, header):
+        return HttpResponseForbidden()
+    enqueue(source_id, request.body)
+    return HttpResponse(status=202)
@@ -0,0 +1,163 @@
+import hashlib
+import hmac
+import json
+import logging
+import time
+from collections import defaultdict
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from platform_org.core.metrics import TICKET_WEBHOOK_LAG, cache_result
+from platform_org.sla.models import ServiceRequest
+from platform_org.sla.tasks import SWEEP_RELATED, evaluate_breaches
+from .clients import CLIENTS
+from .models import TicketSource
+from .sync import advisory_lock, upsert_tickets
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "integrations:webhooks:events"
+SCHEDULED_KEY = "integrations:webhooks:drain-scheduled"
+VERSION_KEY = "integrations:webhooks:version:{}:{}"
+SECRET_CACHE_KEY = "integrations:webhooks:secret:{}"
+DRAIN_LOCK_NAMESPACE = 3102
+
+_redis = None
+
+
+def get_redis():
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.INTEGRATION_WEBHOOK_REDIS_URL)
+    return _redis
+
+
+def webhook_secret(source_id: int) -> str:
+    """Secret for an active source, cached so the receiver normally skips the database."""
+    key = SECRET_CACHE_KEY.format(source_id)
+    secret = cache.get(key)
+    cache_result("webhook_secret", secret is not None)
+    if secret is None:
+        secret = (
+            TicketSource.objects.filter(pk=source_id, is_active=True).values_list("webhook_secret", flat=True).first()
+            or ""
+        )
+        cache.set(key, secret, 300)
+    return secret
+
+
+def signature_valid(secret: str, body: bytes, header: str) -> bool:
+    if not secret or not header:
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(header.removeprefix("sha256="), expected)
+
+
+def enqueue(source_id: int, body: bytes):
+    """Queue a raw event and make sure exactly one delayed drain is pending for the burst."""
+    r = get_redis()
+    delay = settings.INTEGRATION_WEBHOOK_COALESCE_SECONDS
+    pipe = r.pipeline()
+    pipe.rpush(QUEUE_KEY, json.dumps({"source_id": source_id, "received_at": time.time(), "body": body.decode("utf-8", "replace")}))
+    pipe.set(SCHEDULED_KEY, 1, nx=True, ex=max(int(delay) * 10, 60))
+    _, scheduled = pipe.execute()
+    if scheduled:
+        from .tasks import drain_ticket_webhooks
+
+        drain_ticket_webhooks.apply_async(countdown=delay)
+
+
+def _version(ticket, payload):
+    if ticket.updated_at:
+        return ticket.updated_at.timestamp()
+    return float(payload.get("timestamp") or 0) / 1000.0
+
+
+def apply_events(raw_events, stats):
+    """Deduplicate by (source, external_id, version), keep the newest version per ticket and upsert."""
+    events = [json.loads(e) for e in raw_events]
+    sources = TicketSource.objects.select_related("tenant", "default_contract").in_bulk(
+        {e["source_id"] for e in events}
+    )
+    latest = {}
+    for e in events:
+        ticket_source = sources.get(e["source_id"])
+        ticket = None
+        if ticket_source and ticket_source.is_active:
+            try:
+                payload = json.loads(e["body"])
+                ticket = CLIENTS[ticket_source.source](ticket_source).from_webhook(payload)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                logger.warning("Dropping malformed webhook for source %s", e["source_id"])
+        if ticket is None:
+            stats["dropped"] += 1
+            continue
+        if "received_at" in e:
+            TICKET_WEBHOOK_LAG.labels(ticket_source.source).observe(time.time() - e["received_at"])
+        key = (ticket_source.id, ticket.external_id)
+        version = _version(ticket, payload)
+        if key in latest:
+            stats["coalesced"] += 1
+            if latest[key][0] >= version:
+                continue
+        latest[key] = (version, ticket)
+
+    r = get_redis()
+    keys = list(latest)
+    applied = r.mget([VERSION_KEY.format(*k) for k in keys]) if keys else []
+    by_source = defaultdict(list)
+    for key, seen in zip(keys, applied):
+        version, ticket = latest[key]
+        if seen is not None and float(seen) >= version:
+            stats["duplicates"] += 1
+            continue
+        by_source[key[0]].append(ticket)
+
+    for source_id, tickets in by_source.items():
+        ticket_source = sources[source_id]
+        for k, v in upsert_tickets(ticket_source.tenant, ticket_source.source, tickets, ticket_source.default_contract).items():
+            stats[k] += v
+        touched = ServiceRequest.objects.select_related(*SWEEP_RELATED).filter(
+            tenant=ticket_source.tenant,
+            source=ticket_source.source,
+            external_id__in=[t.external_id for t in tickets],
+            status__in=["OPEN", "IN_PROGRESS"],
+        )
+        stats["breaches"] += evaluate_breaches(touched, timezone.now(), trigger="webhook")
+
+    pipe = r.pipeline()
+    for key in keys:
+        pipe.set(VERSION_KEY.format(*key), latest[key][0], ex=settings.INTEGRATION_WEBHOOK_DEDUP_TTL)
+    pipe.execute()
+
+
+def drain(batch_size: int | None = None) -> dict:
+    """Apply queued events in batches until the queue is empty.
+
+    One drain runs at a time (a Postgres advisory lock held for the whole drain), so the version check in
+    ``apply_events`` and the versions it records never interleave with another drain's; otherwise a drain
+    holding an older event could check before a newer one is recorded and write the older ticket last.
+    Events popped by a worker that then dies are lost; the periodic pull sync picks those tickets up.
+    """
+    r = get_redis()
+    batch_size = batch_size or settings.INTEGRATION_WEBHOOK_BATCH_SIZE
+    with advisory_lock(DRAIN_LOCK_NAMESPACE, 0) as acquired:
+        if not acquired:
+            # The running drain may already have made its last pop; drain again once it is likely done.
+            from .tasks import drain_ticket_webhooks
+
+            drain_ticket_webhooks.apply_async(countdown=settings.INTEGRATION_WEBHOOK_COALESCE_SECONDS)
+            return {"busy": 1}
+        # Clear the flag first so events arriving mid-drain schedule a follow-up run.
+        r.delete(SCHEDULED_KEY)
+        stats = defaultdict(int)
+        while True:
+            raw = r.lpop(QUEUE_KEY, batch_size)
+            if not raw:
+                break
+            stats["events"] += len(raw)
+            apply_events(raw, stats)
+    return dict(stats)
@@ -0,0 +1,185 @@
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+def estimate_count(queryset):
+    """Row estimate from the Postgres planner; None on other backends."""
+    conn = connections[queryset.db]
+    if conn.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with conn.cursor() as cur:
+        cur.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _encode(values):
+    raw = json.dumps([v.isoformat() if hasattr(v, "isoformat") else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        return None
+
+
+class KeysetPage:
+    """Page object for keyset navigation; quacks enough like Django's Page for templates."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor, total, total_is_estimate):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+        self.next_query = ""
+        self.previous_query = ""
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginationMixin:
+    """Replace COUNT(*) + OFFSET paging with (sort_key, id) keyset navigation.
+
+    ``keyset`` lists the ordering, e.g. ("-opened_at", "-id"); the queryset must be ordered the same way.
+    Ranked search results (TenantSearchFilter) are ordered by ``-search_rank`` and then the keyset, and are
+    navigated on that longer key. Navigation uses ?after=<cursor> / ?before=<cursor>. The total comes from
+    planner statistics once it exceeds LIST_COUNT_ESTIMATE_THRESHOLD, otherwise from an exact count.
+    """
+
+    keyset = ("-id",)
+    RANK = "-search_rank"
+
+    def _keys(self, queryset):
+        order = tuple(queryset.query.order_by)
+        if order in (tuple(self.keyset), (self.RANK, *self.keyset)):
+            return order
+        return None
+
+    def _keyset_filter(self, values, forward, keys=None):
+        """Rows after (``forward``) or before the cursor ``values`` in keyset order.
+
+        The OR of key prefixes alone can't start an index range scan, so deep pages would still filter every row
+        from the top of the index. The redundant bound on the first key in front of it starts the scan at the cursor
+        (and prunes partitions)."""
+        keys = keys or self.keyset
+        clauses = []
+        for i, field in enumerate(keys):
+            name = field.lstrip("-")
+            descending = field.startswith("-")
+            lookup = "lt" if descending == forward else "gt"
+            equal = {f.lstrip("-"): values[j] for j, f in enumerate(keys[:i])}
+            clauses.append(Q(**equal, **{f"{name}__{lookup}": values[i]}))
+        first = keys[0]
+        bound = "lte" if first.startswith("-") == forward else "gte"
+        return Q(**{f"{first.lstrip('-')}__{bound}": values[0]}) & reduce(or_, clauses)
+
+    def _parse_values(self, raw, model, keys):
+        if not isinstance(raw, list) or len(raw) != len(keys):
+            return None
+        values = []
+        for field, value in zip(keys, raw):
+            if field == self.RANK:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    return None
+                values.append(value)
+                continue
+            internal = model._meta.get_field(field.lstrip("-")).get_internal_type()
+            if internal == "DateTimeField":
+                value = parse_datetime(value) if isinstance(value, str) else None
+            elif internal == "DateField":
+                value = parse_date(value) if isinstance(value, str) else None
+            if value is None:
+                return None
+            values.append(value)
+        return values
+
+    def _key_of(self, obj, keys):
+        return [getattr(obj, f.lstrip("-")) for f in keys]
+
+    def count_total(self, queryset):
+        threshold = getattr(settings, "LIST_COUNT_ESTIMATE_THRESHOLD", 10000)
+        estimate = estimate_count(queryset)
+        if estimate is not None and estimate > threshold:
+            return estimate, True
+        return queryset.count(), False
+
+    def paginate_queryset(self, queryset, page_size):
+        keys = self._keys(queryset)
+        if keys is None:
+            return super().paginate_queryset(queryset, page_size)
+
+        params = self.request.GET
+        after = _decode(params.get("after", "")) if params.get("after") else None
+        before = _decode(params.get("before", "")) if params.get("before") else None
+        total, is_estimate = self.count_total(queryset)
+
+        qs = queryset
+        forward = before is None
+        cursor = self._parse_values(after if forward else before, queryset.model, keys)
+        if cursor is None:
+            forward = True
+        else:
+            qs = qs.filter(self._keyset_filter(cursor, forward, keys))
+        if not forward:
+            qs = qs.reverse()
+        rows = list(qs[: page_size + 1])
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if not forward:
+            rows.reverse()
+
+        has_next = more if forward else cursor is not None
+        has_previous = cursor is not None if forward else more
+        page = KeysetPage(
+            rows,
+            has_next=has_next and bool(rows),
+            has_previous=has_previous and bool(rows),
+            next_cursor=_encode(self._key_of(rows[-1], keys)) if rows else None,
+            previous_cursor=_encode(self._key_of(rows[0], keys)) if rows else None,
+            total=total,
+            total_is_estimate=is_estimate,
+        )
+        base = params.copy()
+        for key in ("after", "before", "page"):
+            base.pop(key, None)
+        if page.has_next():
+            page.next_query = self._with(base, "after", page.next_cursor)
+        if page.has_previous():
+            page.previous_query = self._with(base, "before", page.previous_cursor)
+        return None, page, rows, page.has_other_pages()
+
+    @staticmethod
+    def _with(base, key, value):
+        query = base.copy()
+        query[key] = value
+        return query.urlencode()
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import ServiceRequest, SLABreachEvent
+from .models import (
+    ArchivedServiceRequest, BreachReevaluation, BreachReevaluationShard, ServiceRequest, SLABreachEvent, SLADailyRollup,
+)
 
 @admin.register(ServiceRequest)
 class ServiceRequestAdmin(admin.ModelAdmin):
@@ -12,3 +14,32 @@ class SLABreachEventAdmin(admin.ModelAdmin):
     list_display = ("request", "breach_type", "breach_at", "tenant")
     list_filter = ("tenant", "breach_type")
     search_fields = ("request__title",)
+
+@admin.register(ArchivedServiceRequest)
+class ArchivedServiceRequestAdmin(admin.ModelAdmin):
+    list_display = ("title", "external_id", "source", "status", "contract", "opened_at", "archived_at", "tenant")
+    list_filter = ("tenant", "status", "source")
+    search_fields = ("title", "external_id")
+    readonly_fields = [f.name for f in ArchivedServiceRequest._meta.fields if f.name != "search_vector"]
+    exclude = ("search_vector",)
+
+@admin.register(SLADailyRollup)
+class SLADailyRollupAdmin(admin.ModelAdmin):
+    list_display = ("contract", "day", "requests", "breached_requests", "resolved", "tenant")
+    list_filter = ("tenant",)
+    date_hierarchy = "day"
+    readonly_fields = [f.name for f in SLADailyRollup._meta.fields]
+
+class BreachReevaluationShardInline(admin.TabularInline):
+    model = BreachReevaluationShard
+    fields = ("id_from", "id_to", "cursor", "status", "scanned", "inserted", "updated", "deleted", "error", "updated_at")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+@admin.register(BreachReevaluation)
+class BreachReevaluationAdmin(admin.ModelAdmin):
+    list_display = ("id", "tenant", "opened_from", "opened_until", "dry_run", "status", "created_at", "finished_at")
+    list_filter = ("status", "dry_run")
+    readonly_fields = ("as_of", "status", "created_at", "finished_at")
+    inlines = [BreachReevaluationShardInline]
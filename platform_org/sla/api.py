@@ -1,5 +1,12 @@
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers, viewsets, permissions
-from .models import ServiceRequest, SLABreachEvent
+from rest_framework.response import Response
+from platform_org.core.conditional import ConditionalGetMixin
+from .archive import windowed
+from .models import ServiceRequest, ServiceRequestHistory, SLABreachEvent, SLABreachHistory
+from .rollups import GROUPS, report
 
 class TenantScopedMixin:
     def get_queryset(self):
@@ -9,10 +16,34 @@ class TenantScopedMixin:
             return qs.filter(tenant=tenant)
         return qs.none()
 
+class ArchiveWindowMixin:
+    """Lists accept ``?<window_param>_after=`` and ``_before=`` on ``window_field``. A window reaching back to
+    archived rows is read from ``history_queryset``, so archived rows appear alongside hot ones."""
+
+    @classmethod
+    def window_queryset(cls, request):
+        tenant = getattr(request, "tenant", None)
+        if tenant is None:
+            return cls.queryset.none()
+        try:
+            return windowed(
+                tenant, cls.queryset.filter(tenant=tenant), cls.history_queryset.filter(tenant=tenant),
+                cls.window_field, request.GET, cls.window_param,
+            )
+        except ValueError:
+            raise serializers.ValidationError(
+                {f"{cls.window_param}_after": "Date filters must be ISO dates or datetimes."}
+            )
+
+    def get_queryset(self):
+        if self.action == "list":
+            return self.window_queryset(self.request)
+        return super().get_queryset()
+
 class ServiceRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = ServiceRequest
-        fields = "__all__"
+        exclude = ["search_vector"]
         read_only_fields = ["tenant"]
 
 class SLABreachSerializer(serializers.ModelSerializer):
@@ -22,15 +53,47 @@ class SLABreachSerializer(serializers.ModelSerializer):
         fields = ["id","tenant","request","request_title","breach_type","breach_at","details"]
         read_only_fields = ["tenant"]
 
-class ServiceRequestViewSet(TenantScopedMixin, viewsets.ModelViewSet):
+class ServiceRequestViewSet(ArchiveWindowMixin, TenantScopedMixin, viewsets.ModelViewSet):
     serializer_class = ServiceRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
+    search_fields = ["title", "external_id"]
     queryset = ServiceRequest.objects.select_related("contract","tenant").all()
+    history_queryset = ServiceRequestHistory.objects.select_related("contract","tenant").all()
+    window_field, window_param = "opened_at", "opened"
 
     def perform_create(self, serializer):
         serializer.save(tenant=self.request.tenant)
 
-class SLABreachViewSet(TenantScopedMixin, viewsets.ReadOnlyModelViewSet):
+class SLABreachViewSet(ArchiveWindowMixin, TenantScopedMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    conditional_field = "id"  # breach events are only ever inserted
     serializer_class = SLABreachSerializer
     permission_classes = [permissions.IsAuthenticated]
+    search_fields = ["request__title", "request__external_id"]
+    search_vector_field = "request__search_vector"
     queryset = SLABreachEvent.objects.select_related("request","tenant").order_by("-breach_at")
+    history_queryset = SLABreachHistory.objects.select_related("request","tenant").order_by("-breach_at")
+    window_field, window_param = "breach_at", "breach"
+
+class ComplianceQuerySerializer(serializers.Serializer):
+    group_by = serializers.ChoiceField(choices=list(GROUPS), default="contract")
+    period = serializers.ChoiceField(choices=["day", "week", "month", "quarter", "year"], default="month")
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault("end", timezone.localdate())
+        attrs.setdefault("start", attrs["end"] - timedelta(days=365))
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError("start must not be after end.")
+        return attrs
+
+class SLAComplianceViewSet(viewsets.ViewSet):
+    """SLA compliance and response/resolution times from the daily rollups; never scans requests."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request):
+        query = ComplianceQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        tenant = getattr(request, "tenant", None)
+        results = report(tenant, **query.validated_data) if tenant else []
+        return Response({**query.validated_data, "results": results})
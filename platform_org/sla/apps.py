@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class SLAConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "platform_org.sla"
+
+    def ready(self):
+        from . import partitions, rollups  # noqa: F401  (connect their signals)
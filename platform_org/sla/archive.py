@@ -0,0 +1,199 @@
+"""Hot/cold archival of closed service requests.
+
+Requests resolved or closed more than a tenant's ``archive_closed_after_days`` ago (SLA_ARCHIVE_AFTER_DAYS
+when unset) move, with their breaches, from ServiceRequest/SLABreachEvent into ArchivedServiceRequest/
+ArchivedSLABreachEvent. Each batch is one statement that deletes the hot rows and inserts them into the archive
+with their ids, so the hot tables, the breach sweep and the default lists only carry live and recent work.
+
+The ``*_history`` views (ServiceRequestHistory, SLABreachHistory) are the UNION ALL of hot and archived rows.
+Rollups, counters, the dashboard and VAM scoring read them, so archiving changes none of their numbers. Lists
+read them only when a date filter reaches back to archived rows (``windowed``). A synced ticket that changes
+after it was archived is moved back first (``restore``).
+"""
+import logging
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from platform_org.tenancy.models import Tenant
+from .models import (
+    ArchivedServiceRequest, ArchivedSLABreachEvent, ServiceRequest, ServiceRequestHistory, SLABreachEvent,
+    SLABreachHistory,
+)
+from .partitions import cover
+
+logger = logging.getLogger(__name__)
+
+ARCHIVABLE = [ServiceRequest.Status.RESOLVED.value, ServiceRequest.Status.CLOSED.value]
+REQUEST_COLUMNS = "id, tenant_id, contract_id, source, external_id, title, priority, opened_at, first_response_at, resolved_at, status"
+BREACH_COLUMNS = "id, tenant_id, request_id, breach_type, breach_at, details"
+# History model -> (archive model, field whose newest archived value bounds the archive).
+ARCHIVES = {
+    ServiceRequestHistory: (ArchivedServiceRequest, "opened_at"),
+    SLABreachHistory: (ArchivedSLABreachEvent, "breach_at"),
+}
+
+REQUEST = ServiceRequest._meta.db_table
+BREACH = SLABreachEvent._meta.db_table
+ARCHIVED_REQUEST = ArchivedServiceRequest._meta.db_table
+ARCHIVED_BREACH = ArchivedSLABreachEvent._meta.db_table
+
+ARCHIVE_SQL = f"""
+WITH moved AS (
+    DELETE FROM {REQUEST}
+    WHERE id = ANY(%(ids)s) AND opened_at BETWEEN %(oldest)s AND %(newest)s  -- only the batch's monthly partitions
+      AND status = ANY(%(statuses)s) AND resolved_at < %(cutoff)s
+    RETURNING {REQUEST_COLUMNS}, search_vector
+), requests AS (
+    INSERT INTO {ARCHIVED_REQUEST} ({REQUEST_COLUMNS}, search_vector, archived_at)
+    SELECT {REQUEST_COLUMNS}, search_vector, %(now)s FROM moved
+    RETURNING id
+), breaches AS (
+    DELETE FROM {BREACH} WHERE request_id IN (SELECT id FROM requests)
+    RETURNING {BREACH_COLUMNS}
+), archived AS (
+    INSERT INTO {ARCHIVED_BREACH} ({BREACH_COLUMNS}, archived_at)
+    SELECT {BREACH_COLUMNS}, %(now)s FROM breaches
+    RETURNING id
+)
+SELECT (SELECT count(*) FROM requests), (SELECT count(*) FROM archived)
+"""
+
+RESTORE_SQL = f"""
+WITH breaches AS (
+    DELETE FROM {ARCHIVED_BREACH} WHERE request_id = ANY(%(ids)s)
+    RETURNING {BREACH_COLUMNS}
+), restored_breaches AS (
+    INSERT INTO {BREACH} ({BREACH_COLUMNS}) SELECT {BREACH_COLUMNS} FROM breaches
+), moved AS (
+    DELETE FROM {ARCHIVED_REQUEST} WHERE id = ANY(%(ids)s)
+    RETURNING {REQUEST_COLUMNS}
+)
+INSERT INTO {REQUEST} ({REQUEST_COLUMNS}) SELECT {REQUEST_COLUMNS} FROM moved
+"""
+
+
+def create_history_views(conn):
+    """(Re)create the views over hot and archived rows; run again whenever either side's columns change."""
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            CREATE OR REPLACE VIEW {ServiceRequestHistory._meta.db_table} AS
+            SELECT {REQUEST_COLUMNS}, search_vector, NULL::timestamptz AS archived_at FROM {REQUEST}
+            UNION ALL
+            SELECT {REQUEST_COLUMNS}, search_vector, archived_at FROM {ARCHIVED_REQUEST}
+        """)
+        cur.execute(f"""
+            CREATE OR REPLACE VIEW {SLABreachHistory._meta.db_table} AS
+            SELECT {BREACH_COLUMNS}, NULL::timestamptz AS archived_at FROM {BREACH}
+            UNION ALL
+            SELECT {BREACH_COLUMNS}, archived_at FROM {ARCHIVED_BREACH}
+        """)
+
+
+def cutoff(tenant, now=None):
+    """Requests resolved before this instant are archived; None when the tenant never archives."""
+    days = tenant.archive_closed_after_days
+    if days is None:
+        days = settings.SLA_ARCHIVE_AFTER_DAYS
+    if not days:
+        return None
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def archive_tenant(tenant, batch_size=None, now=None, dry_run=False):
+    """Move the tenant's archivable requests and their breaches to the archive, ``batch_size`` per transaction."""
+    batch_size = batch_size or settings.SLA_ARCHIVE_BATCH_SIZE
+    now = now or timezone.now()
+    stats = {"requests": 0, "breaches": 0, "batches": 0}
+    before = cutoff(tenant, now)
+    if before is None:
+        return stats
+    candidates = ServiceRequest.objects.filter(tenant=tenant, status__in=ARCHIVABLE, resolved_at__lt=before).order_by("id")
+    if dry_run:
+        stats["requests"] = candidates.count()
+        stats["breaches"] = SLABreachEvent.objects.filter(request__in=candidates).count()
+        return stats
+    last_id = 0
+    while True:
+        # Walk the primary key so each batch starts where the last one stopped instead of rescanning.
+        batch = list(candidates.filter(id__gt=last_id).values_list("id", "opened_at")[:batch_size])
+        if not batch:
+            break
+        ids, opened = zip(*batch)
+        last_id = ids[-1]
+        params = {
+            "ids": list(ids), "oldest": min(opened), "newest": max(opened),
+            "statuses": ARCHIVABLE, "cutoff": before, "now": now,
+        }
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(ARCHIVE_SQL, params)
+            requests, breaches = cursor.fetchone()
+        stats["requests"] += requests
+        stats["breaches"] += breaches
+        stats["batches"] += 1
+    if stats["requests"]:
+        logger.info("Archived %s requests and %s breaches of %s", stats["requests"], stats["breaches"], tenant.code)
+    return stats
+
+
+def archive_all(batch_size=None, dry_run=False):
+    return {tenant.code: archive_tenant(tenant, batch_size, dry_run=dry_run) for tenant in Tenant.objects.filter(is_active=True)}
+
+
+def restore(tenant, source, external_ids):
+    """Move archived requests for these remote tickets (and their breaches) back to the hot tables; their ids."""
+    archived = ArchivedServiceRequest.objects.filter(
+        tenant=tenant, source=source, external_id__in=[e for e in external_ids if e]
+    )
+    ids = list(archived.values_list("id", flat=True))
+    if ids:
+        cover(ServiceRequest, archived.values_list("opened_at", flat=True))
+        cover(SLABreachEvent, ArchivedSLABreachEvent.objects.filter(request_id__in=ids).values_list("breach_at", flat=True))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(RESTORE_SQL, {"ids": ids})
+    return ids
+
+
+def _instant(value):
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_window(params, name):
+    """(start, end) from ``?<name>_after=`` (inclusive) and ``?<name>_before=`` (exclusive), as ISO dates (midnight,
+    TIME_ZONE) or datetimes. Raises ValueError for a malformed bound."""
+    return _instant(params.get(f"{name}_after")), _instant(params.get(f"{name}_before"))
+
+
+def reaches_archive(tenant, history, start, end):
+    """Whether a window can contain archived rows: it has a bound and starts at or before the newest one."""
+    if start is None and end is None:
+        return False
+    model, field = ARCHIVES[history]
+    newest = model.objects.filter(tenant=tenant).aggregate(newest=Max(field))["newest"]
+    return newest is not None and (start is None or start <= newest)
+
+
+def windowed(tenant, hot, history, field, params, name):
+    """``hot`` narrowed to the ``?<name>_after=``/``?<name>_before=`` window on ``field``, read from ``history`` (hot
+    and archived rows) instead when the window reaches archived rows. Raises ValueError for a malformed bound."""
+    start, end = parse_window(params, name)
+    qs = history if tenant is not None and reaches_archive(tenant, history.model, start, end) else hot
+    if start:
+        qs = qs.filter(**{f"{field}__gte": start})
+    if end:
+        qs = qs.filter(**{f"{field}__lt": end})
+    return qs
@@ -0,0 +1,60 @@
+"""Async SLA endpoints: twins of the request and breach lists (see platform_org.core.asyncapi) and the live
+breach stream."""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import exceptions
+
+from platform_org.core.asyncapi import api_view, filter_queryset, paginate
+from .api import ServiceRequestSerializer, ServiceRequestViewSet, SLABreachSerializer, SLABreachViewSet
+from .models import SLABreachEvent
+from .stream import events, frame
+
+
+async def tenant_queryset(request, viewset):
+    # A date window may look up the archive's bounds first.
+    return await sync_to_async(viewset.window_queryset)(request)
+
+
+@api_view
+async def service_request_list(request):
+    qs = filter_queryset(request, await tenant_queryset(request, ServiceRequestViewSet), ServiceRequestViewSet)
+    rows, envelope = await paginate(request, qs)
+    return envelope(ServiceRequestSerializer(rows, many=True, context={"request": request}).data)
+
+
+@api_view
+async def breach_list(request):
+    qs = filter_queryset(request, await tenant_queryset(request, SLABreachViewSet), SLABreachViewSet)
+    rows, envelope = await paginate(request, qs)
+    return envelope(SLABreachSerializer(rows, many=True, context={"request": request}).data)
+
+
+@api_view
+async def breach_stream(request):
+    """text/event-stream of ``breach`` and ``due_soon`` events for the request's tenant (ASGI only).
+
+    A reconnecting EventSource sends Last-Event-ID; breaches created since then are replayed first.
+    """
+    tenant = getattr(request, "tenant", None)
+    if tenant is None:
+        raise exceptions.PermissionDenied("No tenant selected.")
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI the response would be buffered forever instead of streamed.
+        return HttpResponse("Event streams need the ASGI server.", status=501)
+    last_id = request.headers.get("Last-Event-ID", "")
+
+    async def replay():
+        if not last_id.isdigit():
+            return []
+        rows = SLABreachEvent.objects.filter(tenant=tenant, id__gt=int(last_id)).select_related("request")
+        return [
+            frame("breach", SLABreachSerializer(row).data, row.id)
+            async for row in rows.order_by("id")[:settings.SLA_STREAM_REPLAY_LIMIT]
+        ]
+
+    response = StreamingHttpResponse(events(tenant.pk, replay), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx ingress: pass events through unbuffered
+    return response
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_search_vectors_and_trigram_indexes'),
+        ('sla', '0005_servicerequest_search_vector'),
+        ('tenancy', '0002_tenant_slug_alter_tenantuser_role'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['tenant', 'source', 'external_id'], name='request_source_ext_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:00
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+import platform_org.sla.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_search_vectors_and_trigram_indexes'),
+        ('sla', '0006_servicerequest_request_source_ext_idx'),
+        ('tenancy', '0002_tenant_slug_alter_tenantuser_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SLADailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('resolved', models.PositiveIntegerField(default=0)),
+                ('breached_requests', models.PositiveIntegerField(default=0)),
+                ('response_breaches', models.PositiveIntegerField(default=0)),
+                ('resolution_breaches', models.PositiveIntegerField(default=0)),
+                ('responded', models.PositiveIntegerField(default=0)),
+                ('response_seconds', models.BigIntegerField(default=0)),
+                ('resolution_seconds', models.BigIntegerField(default=0)),
+                ('response_histogram', django.contrib.postgres.fields.ArrayField(base_field=models.PositiveIntegerField(), default=platform_org.sla.models.empty_histogram, size=None)),
+                ('resolution_histogram', django.contrib.postgres.fields.ArrayField(base_field=models.PositiveIntegerField(), default=platform_org.sla.models.empty_histogram, size=None)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('consumer_me', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.microenterprise')),
+                ('contract', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sla_rollups', to='core.mecontract')),
+                ('provider_me', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.microenterprise')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sla_rollups', to='tenancy.tenant')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tenant', 'day'], name='sla_rollup_tenant_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('contract', 'day'), name='sla_rollup_contract_day_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:15
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_history_views(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    from platform_org.sla.archive import create_history_views
+
+    create_history_views(schema_editor.connection)
+
+
+def drop_history_views(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cur:
+        cur.execute("DROP VIEW IF EXISTS sla_slabreachevent_history, sla_servicerequest_history")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_business_calendars'),
+        ('sla', '0008_breach_reevaluation'),
+        ('tenancy', '0003_tenant_archive_closed_after_days'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceRequestHistory',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('source', models.CharField(choices=[('JITBIT', 'Jitbit'), ('JIRA', 'Jira'), ('MANUAL', 'Manual')], max_length=20)),
+                ('external_id', models.CharField(max_length=100)),
+                ('title', models.CharField(max_length=255)),
+                ('priority', models.CharField(max_length=30)),
+                ('opened_at', models.DateTimeField()),
+                ('first_response_at', models.DateTimeField(null=True)),
+                ('resolved_at', models.DateTimeField(null=True)),
+                ('status', models.CharField(max_length=50)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+                ('archived_at', models.DateTimeField(null=True)),
+            ],
+            options={
+                'db_table': 'sla_servicerequest_history',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SLABreachHistory',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('breach_type', models.CharField(choices=[('RESPONSE', 'Response Time'), ('RESOLUTION', 'Resolution Time')], max_length=20)),
+                ('breach_at', models.DateTimeField()),
+                ('details', models.JSONField(default=dict)),
+                ('archived_at', models.DateTimeField(null=True)),
+            ],
+            options={
+                'db_table': 'sla_slabreachevent_history',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedServiceRequest',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('source', models.CharField(choices=[('JITBIT', 'Jitbit'), ('JIRA', 'Jira'), ('MANUAL', 'Manual')], max_length=20)),
+                ('external_id', models.CharField(blank=True, max_length=100)),
+                ('title', models.CharField(max_length=255)),
+                ('priority', models.CharField(max_length=30)),
+                ('opened_at', models.DateTimeField()),
+                ('first_response_at', models.DateTimeField(blank=True, null=True)),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(max_length=50)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('contract', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.mecontract')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='tenancy.tenant')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedSLABreachEvent',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('breach_type', models.CharField(choices=[('RESPONSE', 'Response Time'), ('RESOLUTION', 'Resolution Time')], max_length=20)),
+                ('breach_at', models.DateTimeField()),
+                ('details', models.JSONField(blank=True, default=dict)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='breaches', to='sla.archivedservicerequest')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='tenancy.tenant')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedservicerequest',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='archived_request_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedservicerequest',
+            index=models.Index(fields=['tenant', 'opened_at'], name='archived_request_opened_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedservicerequest',
+            index=models.Index(fields=['tenant', 'source', 'external_id'], name='archived_request_ext_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedslabreachevent',
+            index=models.Index(fields=['tenant', 'breach_at'], name='archived_breach_at_idx'),
+        ),
+        migrations.RunPython(create_history_views, drop_history_views),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def partition_tables(apps, schema_editor):
+    """Rebuild both tables partitioned by month (Postgres only); see platform_org.sla.partitions."""
+    conn = schema_editor.connection
+    if conn.vendor != "postgresql":
+        return
+    from platform_org.sla.archive import create_history_views
+    from platform_org.sla.partitions import PARTITIONED, partition_table
+
+    with conn.cursor() as cur:
+        cur.execute("DROP VIEW IF EXISTS sla_slabreachevent_history, sla_servicerequest_history")
+    for model in PARTITIONED:
+        partition_table(model, conn)
+    create_history_views(conn)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_business_calendars'),
+        ('sla', '0009_service_request_archive'),
+        ('tenancy', '0003_tenant_archive_closed_after_days'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='slabreachevent',
+            name='request',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='breaches', to='sla.servicerequest'),
+        ),
+        migrations.RunPython(partition_tables, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['tenant', 'opened_at'], name='request_tenant_opened_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(condition=models.Q(('status__in', ['OPEN', 'IN_PROGRESS'])), fields=['opened_at'], name='request_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='slabreachevent',
+            index=models.Index(fields=['tenant', 'breach_at'], name='breach_tenant_at_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from platform_org.sla.partitions import AddPartitionedIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Built partition by partition with CREATE INDEX CONCURRENTLY, which can't run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ('sla', '0010_partition_requests_and_breaches'),
+    ]
+
+    operations = [
+        AddPartitionedIndexConcurrently(
+            model_name='servicerequest',
+            index=models.Index(fields=['tenant', 'status', 'opened_at'], name='request_tenant_status_idx'),
+        ),
+        AddPartitionedIndexConcurrently(
+            model_name='servicerequest',
+            index=models.Index(fields=['contract', 'opened_at'], name='request_contract_opened_idx'),
+        ),
+        AddPartitionedIndexConcurrently(
+            model_name='servicerequest',
+            index=models.Index(condition=models.Q(('status__in', ['RESOLVED', 'CLOSED'])), fields=['tenant', 'resolved_at'], name='request_closed_idx'),
+        ),
+        # request_contract_opened_idx leads with the contract, so the single-column index goes once it exists.
+        # A partitioned index can't be dropped concurrently; dropping one is quick, though.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='servicerequest',
+                    name='contract',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='service_requests', to='core.mecontract'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    'DROP INDEX IF EXISTS "sla_servicerequest_contract_id_1dd54e40"',
+                    'CREATE INDEX IF NOT EXISTS "sla_servicerequest_contract_id_1dd54e40" ON "sla_servicerequest" ("contract_id")',
+                ),
+            ],
+        ),
+    ]
@@ -1,7 +1,11 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 from platform_org.tenancy.models import Tenant
-from platform_org.core.models import MEContract
+from platform_org.core.models import MEContract, MicroEnterprise
+from platform_org.core.search import stored_search_vector, trigram_index
 
 class ServiceRequest(models.Model):
     class Source(models.TextChoices):
@@ -16,7 +20,7 @@ class ServiceRequest(models.Model):
         CLOSED = "CLOSED", "Closed"
 
     tenant = models.ForeignKey(Tenant, on_delete=models.PROTECT, related_name="service_requests")
-    contract = models.ForeignKey(MEContract, on_delete=models.PROTECT, related_name="service_requests")
+    contract = models.ForeignKey(MEContract, on_delete=models.PROTECT, related_name="service_requests", db_index=False)  # see Meta
     source = models.CharField(max_length=20, choices=Source.choices, default=Source.MANUAL)
     external_id = models.CharField(max_length=100, blank=True)
     title = models.CharField(max_length=255)
@@ -26,6 +30,26 @@ class ServiceRequest(models.Model):
     first_response_at = models.DateTimeField(null=True, blank=True)
     resolved_at = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=50, default=Status.OPEN)
+    search_vector = stored_search_vector("title", "external_id")
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="request_search_vector_idx"),
+            trigram_index("title", "external_id", name="request_search_trgm_idx"),
+            models.Index(fields=["tenant", "source", "external_id"], name="request_source_ext_idx"),
+            # The list's ordering within each monthly partition (see platform_org.sla.partitions).
+            models.Index(fields=["tenant", "opened_at"], name="request_tenant_opened_idx"),
+            # Open requests can be of any age, so the sweep can't prune partitions; this keeps each one a tiny probe.
+            models.Index(fields=["opened_at"], name="request_open_idx", condition=models.Q(status__in=["OPEN", "IN_PROGRESS"])),
+            models.Index(fields=["tenant", "status", "opened_at"], name="request_tenant_status_idx"),  # list ?status=
+            # Rollup recomputes read a contract's requests for a range of days; also covers contract alone.
+            models.Index(fields=["contract", "opened_at"], name="request_contract_opened_idx"),
+            # Archive candidates: closed requests by resolution time.
+            models.Index(
+                fields=["tenant", "resolved_at"], name="request_closed_idx",
+                condition=models.Q(status__in=["RESOLVED", "CLOSED"]),
+            ),
+        ]
 
 class SLABreachEvent(models.Model):
     class BreachType(models.TextChoices):
@@ -33,7 +57,167 @@ class SLABreachEvent(models.Model):
         RESOLUTION = "RESOLUTION", "Resolution Time"
 
     tenant = models.ForeignKey(Tenant, on_delete=models.PROTECT, related_name="sla_breaches")
-    request = models.ForeignKey(ServiceRequest, on_delete=models.CASCADE, related_name="breaches")
+    # No database constraint: ServiceRequest is partitioned, so its id alone is not a unique key. Deletes
+    # still cascade through the ORM.
+    request = models.ForeignKey(ServiceRequest, on_delete=models.CASCADE, related_name="breaches", db_constraint=False)
     breach_type = models.CharField(max_length=20, choices=BreachType.choices)
     breach_at = models.DateTimeField(default=timezone.now)
     details = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["tenant", "breach_at"], name="breach_tenant_at_idx")]
+
+
+class ArchivedServiceRequest(models.Model):
+    """A closed request moved out of ServiceRequest by platform_org.sla.archive; it keeps its id."""
+
+    id = models.BigIntegerField(primary_key=True)
+    tenant = models.ForeignKey(Tenant, on_delete=models.PROTECT, related_name="+")
+    contract = models.ForeignKey(MEContract, on_delete=models.PROTECT, related_name="+")
+    source = models.CharField(max_length=20, choices=ServiceRequest.Source.choices)
+    external_id = models.CharField(max_length=100, blank=True)
+    title = models.CharField(max_length=255)
+    priority = models.CharField(max_length=30)
+    opened_at = models.DateTimeField()
+    first_response_at = models.DateTimeField(null=True, blank=True)
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=50)
+    search_vector = SearchVectorField(null=True)  # copied from the hot row
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="archived_request_search_idx"),
+            models.Index(fields=["tenant", "opened_at"], name="archived_request_opened_idx"),
+            models.Index(fields=["tenant", "source", "external_id"], name="archived_request_ext_idx"),
+        ]
+
+
+class ArchivedSLABreachEvent(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    tenant = models.ForeignKey(Tenant, on_delete=models.PROTECT, related_name="+")
+    request = models.ForeignKey(ArchivedServiceRequest, on_delete=models.CASCADE, related_name="breaches")
+    breach_type = models.CharField(max_length=20, choices=SLABreachEvent.BreachType.choices)
+    breach_at = models.DateTimeField()
+    details = models.JSONField(default=dict, blank=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["tenant", "breach_at"], name="archived_breach_at_idx")]
+
+
+class ServiceRequestHistory(models.Model):
+    """Hot and archived requests together (a UNION ALL view); read-only. ``archived_at`` is None for hot rows."""
+
+    id = models.BigIntegerField(primary_key=True)
+    tenant = models.ForeignKey(Tenant, on_delete=models.DO_NOTHING, related_name="+")
+    contract = models.ForeignKey(MEContract, on_delete=models.DO_NOTHING, related_name="+")
+    source = models.CharField(max_length=20, choices=ServiceRequest.Source.choices)
+    external_id = models.CharField(max_length=100)
+    title = models.CharField(max_length=255)
+    priority = models.CharField(max_length=30)
+    opened_at = models.DateTimeField()
+    first_response_at = models.DateTimeField(null=True)
+    resolved_at = models.DateTimeField(null=True)
+    status = models.CharField(max_length=50)
+    search_vector = SearchVectorField(null=True)
+    archived_at = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = "sla_servicerequest_history"
+
+
+class SLABreachHistory(models.Model):
+    """Hot and archived breaches together (a UNION ALL view); read-only."""
+
+    id = models.BigIntegerField(primary_key=True)
+    tenant = models.ForeignKey(Tenant, on_delete=models.DO_NOTHING, related_name="+")
+    request = models.ForeignKey(ServiceRequestHistory, on_delete=models.DO_NOTHING, related_name="breaches")
+    breach_type = models.CharField(max_length=20, choices=SLABreachEvent.BreachType.choices)
+    breach_at = models.DateTimeField()
+    details = models.JSONField(default=dict)
+    archived_at = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = "sla_slabreachevent_history"
+
+
+# Bounds (minutes) of the duration histogram: bucket i counts durations from bound i-1 up to, not including,
+# bound i; one more bucket holds 30 days and above.
+DURATION_BUCKETS = (15, 30, 60, 120, 240, 480, 720, 1440, 2880, 4320, 7200, 10080, 20160, 43200)
+
+
+def empty_histogram():
+    return [0] * (len(DURATION_BUCKETS) + 1)
+
+
+class SLADailyRollup(models.Model):
+    """Requests opened on ``day`` (TIME_ZONE) under ``contract``; maintained by platform_org.sla.rollups."""
+
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name="sla_rollups")
+    contract = models.ForeignKey(MEContract, on_delete=models.CASCADE, related_name="sla_rollups")
+    provider_me = models.ForeignKey(MicroEnterprise, on_delete=models.CASCADE, related_name="+")
+    consumer_me = models.ForeignKey(MicroEnterprise, on_delete=models.CASCADE, related_name="+")
+    day = models.DateField()
+
+    requests = models.PositiveIntegerField(default=0)
+    resolved = models.PositiveIntegerField(default=0)
+    breached_requests = models.PositiveIntegerField(default=0)
+    response_breaches = models.PositiveIntegerField(default=0)
+    resolution_breaches = models.PositiveIntegerField(default=0)
+
+    responded = models.PositiveIntegerField(default=0)
+    response_seconds = models.BigIntegerField(default=0)
+    resolution_seconds = models.BigIntegerField(default=0)
+    response_histogram = ArrayField(models.PositiveIntegerField(), default=empty_histogram)
+    resolution_histogram = ArrayField(models.PositiveIntegerField(), default=empty_histogram)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["contract", "day"], name="sla_rollup_contract_day_uniq")]
+        indexes = [models.Index(fields=["tenant", "day"], name="sla_rollup_tenant_day_idx")]
+
+
+class BreachReevaluation(models.Model):
+    """Recomputing SLA breaches for requests opened in a window, split into id-range shards that resume."""
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    contract_ids = ArrayField(models.BigIntegerField(), default=list, blank=True, help_text="Empty means every contract.")
+    opened_from = models.DateTimeField(null=True, blank=True)
+    opened_until = models.DateTimeField(null=True, blank=True)
+    # Open requests are judged against this instant, so every shard sees the same clock.
+    as_of = models.DateTimeField(default=timezone.now)
+    dry_run = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Re-evaluation #{self.pk}"
+
+
+class BreachReevaluationShard(models.Model):
+    """Requests with ``id_from <= id < id_to``; ``cursor`` is the last id whose breaches are settled."""
+
+    run = models.ForeignKey(BreachReevaluation, on_delete=models.CASCADE, related_name="shards")
+    id_from = models.BigIntegerField()
+    id_to = models.BigIntegerField()
+    cursor = models.BigIntegerField()
+    status = models.CharField(max_length=20, choices=BreachReevaluation.Status.choices, default=BreachReevaluation.Status.PENDING)
+    scanned = models.PositiveIntegerField(default=0)
+    inserted = models.PositiveIntegerField(default=0)
+    deleted = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["run", "id_from"]
@@ -0,0 +1,210 @@
+"""Monthly range partitions of sla_servicerequest (by opened_at) and sla_slabreachevent (by breach_at).
+
+Each table has one partition per UTC month, named ``<table>_pYYYYMM``. There is deliberately no DEFAULT
+partition: with one, Postgres can't read the partitions in key order, so a newest-first list would have to
+merge every month instead of stopping after the newest ones. Instead, a row's month must exist before it is
+written. ``maintain_sla_partitions`` keeps every month from SLA_PARTITIONS_BEHIND back to SLA_PARTITIONS_AHEAD
+ahead, and bulk writers call ``cover`` with the instants they are about to write, before their transaction.
+Creating a partition locks the whole parent table (ACCESS EXCLUSIVE) until the transaction ends, so a save
+(``pre_save``) only creates its missing month when it runs in autocommit; inside a transaction it relies on
+the months kept ready.
+
+Postgres requires the partition key in every unique index, so the primary keys are (id, <key>), and
+SLABreachEvent.request is not a database foreign key.
+"""
+import datetime as dt
+import logging
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import connection, connections, transaction
+from django.db.models.signals import pre_save
+from django.utils import timezone
+
+from platform_org.audit.partitions import add_months, month_start
+from .models import ServiceRequest, SLABreachEvent
+
+logger = logging.getLogger(__name__)
+
+# model -> (partition key, columns to copy; generated columns are recomputed)
+PARTITIONED = {
+    ServiceRequest: (
+        "opened_at",
+        "id, tenant_id, contract_id, source, external_id, title, priority, opened_at, first_response_at, resolved_at, status",
+    ),
+    SLABreachEvent: ("breach_at", "id, tenant_id, request_id, breach_type, breach_at, details"),
+}
+
+# table -> months with a partition, or None when the table isn't partitioned; loaded once per process.
+_months = {}
+_lock = threading.Lock()
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def is_partitioned(table, conn=connection):
+    if conn.vendor != "postgresql":
+        return False
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s", [table])
+        return cur.fetchone() is not None
+
+
+def list_partitions(table, conn=connection):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s ORDER BY c.relname",
+            [table],
+        )
+        return [row[0] for row in cur.fetchall()]
+
+
+def _month_of(name, table):
+    suffix = name[len(table) + 2:]
+    return dt.date(int(suffix[:4]), int(suffix[4:]), 1) if suffix.isdigit() and len(suffix) == 6 else None
+
+
+def create_partition(table, month, conn=connection):
+    qn = conn.ops.quote_name
+    name = partition_name(table, month)
+    with conn.cursor() as cur:
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(table)} FOR VALUES FROM (%s) TO (%s)",
+            [f"{month:%Y-%m-%d} 00:00:00+00", f"{add_months(month, 1):%Y-%m-%d} 00:00:00+00"],
+        )
+    return name
+
+
+def cover(model, instants, conn=connection):
+    """Make sure ``model``'s table has a partition for the month of every instant in ``instants``; returns the
+    partitions it had to create."""
+    table = model._meta.db_table
+    needed = {month_start(value.astimezone(dt.timezone.utc).date()) for value in instants if value}
+    if table in _months and (_months[table] is None or needed <= _months[table]):
+        return []
+    with _lock:
+        # (Re)load: another process may have created months since this one last looked.
+        if not is_partitioned(table, conn):
+            _months[table] = None
+            return []
+        months = {_month_of(name, table) for name in list_partitions(table, conn)} - {None}
+        created = [create_partition(table, month, conn) for month in sorted(needed - months)]
+    # Inside a transaction, remember the months only once it commits: a rollback takes its partitions with it.
+    transaction.on_commit(partial(_months.__setitem__, table, months | needed), using=conn.alias)
+    if created:
+        logger.info("Created partitions %s", ", ".join(created))
+    return created
+
+
+def ensure_partitions(since=None, until=None, conn=connection):
+    """Partitions of both tables for every month from ``since`` (default: SLA_PARTITIONS_BEHIND months ago)
+    through ``until`` (default: SLA_PARTITIONS_AHEAD months from now); returns the ones created."""
+    current = month_start(timezone.now().date())
+    month = month_start(since) if since else add_months(current, -settings.SLA_PARTITIONS_BEHIND)
+    last = month_start(until) if until else add_months(current, settings.SLA_PARTITIONS_AHEAD)
+    months = []
+    while month <= last:
+        months.append(dt.datetime.combine(month, dt.time.min, tzinfo=dt.timezone.utc))
+        month = add_months(month, 1)
+    return [name for model in PARTITIONED for name in cover(model, months, conn)]
+
+
+def analyze_parents(conn=connection):
+    """ANALYZE the partitioned tables themselves. Autovacuum only analyzes the partitions, so without this the
+    planner has no statistics for the parent (e.g. that ``id`` is all but unique) and misestimates joins through
+    it by orders of magnitude, which is what list totals over a join are estimated from."""
+    tables = [model._meta.db_table for model in PARTITIONED if is_partitioned(model._meta.db_table, conn)]
+    with conn.cursor() as cur:
+        for table in tables:
+            cur.execute(f"ANALYZE {conn.ops.quote_name(table)}")
+    return tables
+
+
+def partition_table(model, conn):
+    """Rebuild ``model``'s table range-partitioned with a partition per month of its data; used by the migration."""
+    table = model._meta.db_table
+    key, columns = PARTITIONED[model]
+    qn = conn.ops.quote_name
+    legacy = f"{table}_legacy"
+    with conn.cursor() as cur:
+        cur.execute("SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s", [table, f"{table}_pkey"])
+        indexes = cur.fetchall()
+        cur.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [table],
+        )
+        foreign_keys = cur.fetchall()
+        cur.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+        for name, _ in indexes:
+            cur.execute(f"DROP INDEX {qn(name)}")
+        cur.execute(f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING GENERATED) PARTITION BY RANGE ({key})")
+
+        cur.execute(f"SELECT min({key}), max({key}), max(id) FROM {qn(legacy)}")
+        oldest, newest, max_id = cur.fetchone()
+        current = month_start(timezone.now().date())
+        month = month_start(oldest.astimezone(dt.timezone.utc).date()) if oldest else current
+        last = max(add_months(current, settings.SLA_PARTITIONS_AHEAD), month_start(newest.astimezone(dt.timezone.utc).date()) if newest else current)
+        while month <= last:
+            create_partition(table, month, conn)
+            month = add_months(month, 1)
+
+        cur.execute(f"INSERT INTO {qn(table)} ({columns}) SELECT {columns} FROM {qn(legacy)}")
+        cur.execute(f"DROP TABLE {qn(legacy)}")
+
+        seq = f"{table}_id_seq"
+        cur.execute(f"CREATE SEQUENCE {qn(seq)} OWNED BY {qn(table)}.id")
+        cur.execute("SELECT setval(%s, %s, false)", [seq, (max_id or 0) + 1])
+        cur.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval('{seq}')")
+        cur.execute(f"ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, {key})")
+        for name, definition in foreign_keys:
+            cur.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+        for _, definition in indexes:
+            cur.execute(definition)  # read before the rename, so they already name the new table
+
+
+class AddPartitionedIndexConcurrently(AddIndexConcurrently):
+    """AddIndexConcurrently for a partitioned table. Postgres can't build an index on a partitioned table
+    concurrently, so this creates it on the parent alone (invalid until complete), builds it concurrently on every
+    partition and attaches each one. Partitions created later get the index from the parent. Tables that
+    aren't partitioned get a plain AddIndexConcurrently."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        conn, table = schema_editor.connection, model._meta.db_table
+        if not self.allow_migrate_model(conn.alias, model) or not is_partitioned(table, conn):
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        self._ensure_not_in_transaction(schema_editor)
+        qn = schema_editor.quote_name
+        schema_editor.execute(
+            self.index.create_sql(model, schema_editor, sql=schema_editor.sql_create_index.replace(" ON ", " ON ONLY ", 1))
+        )
+        for partition in list_partitions(table, conn):
+            name = f"{self.index.name}_{partition[len(table) + 1:]}"
+            statement = self.index.create_sql(model, schema_editor, concurrently=True)
+            statement.rename_table_references(table, partition)
+            statement.parts["name"] = qn(name)
+            schema_editor.execute(statement)
+            schema_editor.execute(f"ALTER INDEX {qn(self.index.name)} ATTACH PARTITION {qn(name)}")
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        conn = schema_editor.connection
+        if not self.allow_migrate_model(conn.alias, model) or not is_partitioned(model._meta.db_table, conn):
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        schema_editor.remove_index(model, self.index)  # a partitioned index can't be dropped concurrently either
+
+
+def _on_save(sender, instance, raw=False, using=None, **kwargs):
+    conn = connections[using]
+    if not raw and not conn.in_atomic_block:
+        cover(sender, [getattr(instance, PARTITIONED[sender][0])], conn)
+
+
+for _model in PARTITIONED:
+    pre_save.connect(_on_save, sender=_model, weak=False, dispatch_uid=f"sla-partition-{_model._meta.model_name}")
@@ -0,0 +1,232 @@
+"""Re-evaluating SLA breaches after templates, calendars or contract templates change.
+
+A run covers the requests of a tenant, contract set and ``opened_at`` window, hot and archived alike:
+rollups, counters and reports read both through the history views. Archived requests keep their hot ids, so
+one id range spans both tables. It is cut into shards, which run in parallel (one Celery task each) or one
+after another in a management command. A shard walks its requests in id order, ``chunk_size`` at a time.
+It computes the breaches each request should have under its contract's current SLA template, then applies
+the difference to SLABreachEvent (ArchivedSLABreachEvent for archived requests) as bulk inserts, updates and
+deletes. The diff and the shard's cursor are committed together, so a crashed or cancelled shard resumes
+after the last chunk it finished, and a rerun changes nothing.
+
+A request should have a RESPONSE (RESOLUTION) breach when its first response (resolution), or the run's
+``as_of`` if there is none yet, is later than its deadline. Breaches inserted here carry the deadline
+as ``breach_at``; an archived request's go to the archive, with ids from the hot sequence so a restore can move
+them back. They are not pushed to the live stream or to Teams.
+"""
+import logging
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from platform_org.core.caching import invalidate
+from platform_org.core.counters import reconcile
+from platform_org.tenancy.models import Tenant
+from .models import (
+    ArchivedServiceRequest, ArchivedSLABreachEvent, BreachReevaluation, BreachReevaluationShard, ServiceRequest,
+    SLABreachEvent,
+)
+from .partitions import cover
+from .rollups import mark
+from .tasks import SWEEP_RELATED, deadlines
+
+logger = logging.getLogger(__name__)
+
+Status = BreachReevaluation.Status
+TARGETS = (
+    (SLABreachEvent.BreachType.RESPONSE, "response_time_hours", "first_response_at"),
+    (SLABreachEvent.BreachType.RESOLUTION, "resolution_time_hours", "resolved_at"),
+)
+# Request model -> the model holding its breaches.
+BREACHES = {ServiceRequest: SLABreachEvent, ArchivedServiceRequest: ArchivedSLABreachEvent}
+
+
+def scope(run, model=ServiceRequest):
+    requests = model.objects.all()
+    if run.tenant_id:
+        requests = requests.filter(tenant_id=run.tenant_id)
+    if run.contract_ids:
+        requests = requests.filter(contract_id__in=run.contract_ids)
+    if run.opened_from:
+        requests = requests.filter(opened_at__gte=run.opened_from)
+    if run.opened_until:
+        requests = requests.filter(opened_at__lt=run.opened_until)
+    return requests
+
+
+def plan(run, shards=None):
+    """Split the run's id range into ``shards`` equal ranges (fewer when the range is small)."""
+    shards = shards or settings.SLA_REEVALUATION_SHARDS
+    bounds = [scope(run, model).aggregate(lo=Min("id"), hi=Max("id")) for model in BREACHES]
+    bounds = [b for b in bounds if b["lo"] is not None]
+    if not bounds:
+        return []
+    lo, hi = min(b["lo"] for b in bounds), max(b["hi"] for b in bounds) + 1
+    step = max(-(-(hi - lo) // shards), 1)
+    return BreachReevaluationShard.objects.bulk_create([
+        BreachReevaluationShard(run=run, id_from=start, id_to=min(start + step, hi), cursor=start - 1)
+        for start in range(lo, hi, step)
+    ])
+
+
+def expected(chunk, as_of):
+    """{(request id, breach type): (deadline, target hours)} for the breaches ``chunk`` should have."""
+    want = {}
+    for breach_type, target, done_field in TARGETS:
+        due = deadlines(chunk, target)
+        for r in chunk:
+            deadline = due.get(r.id)
+            if deadline and (getattr(r, done_field) or as_of) > deadline:
+                want[(r.id, breach_type)] = (deadline, getattr(r.contract.sla_template, target))
+    return want
+
+
+def diff(chunk, as_of, breaches=SLABreachEvent):
+    """The ``breaches`` rows to insert, update and delete to bring ``chunk`` in line with its SLA."""
+    want = expected(chunk, as_of)
+    tenants = {r.id: r.tenant_id for r in chunk}
+    to_update, to_delete, seen = [], [], set()
+    for event in breaches.objects.filter(request_id__in=tenants).order_by("id"):
+        key = (event.request_id, event.breach_type)
+        if key not in want or key in seen:  # no longer breached, or a duplicate
+            to_delete.append(event)
+            continue
+        seen.add(key)
+        deadline, hours = want[key]
+        if event.details.get("target_hours") != hours or event.breach_at != deadline:  # e.g. a new calendar
+            event.details = {**event.details, "target_hours": hours}
+            event.breach_at = deadline
+            to_update.append(event)
+    to_insert = [
+        breaches(
+            tenant_id=tenants[request_id], request_id=request_id, breach_type=breach_type, breach_at=deadline,
+            details={"target_hours": hours, "reevaluated": True},
+        )
+        for (request_id, breach_type), (deadline, hours) in want.items()
+        if (request_id, breach_type) not in seen
+    ]
+    return to_insert, to_update, to_delete
+
+
+def next_ids(model, count):
+    """``count`` fresh ids from ``model``'s id sequence."""
+    with connection.cursor() as cur:
+        cur.execute("SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)", [model._meta.db_table, count])
+        return [row[0] for row in cur.fetchall()]
+
+
+def write(breaches, to_insert, to_update, to_delete):
+    if breaches is SLABreachEvent:
+        cover(SLABreachEvent, [e.breach_at for e in to_insert + to_update])  # bulk writes skip pre_save
+    else:
+        for event, pk in zip(to_insert, next_ids(SLABreachEvent, len(to_insert))):
+            event.id = pk
+    breaches.objects.bulk_create(to_insert, batch_size=1000)
+    breaches.objects.bulk_update(to_update, ["details", "breach_at"], batch_size=1000)
+    breaches.objects.filter(id__in=[e.id for e in to_delete]).delete()
+
+
+def _chunk(shard):
+    """Settle the next chunk of ``shard``; False once the shard is exhausted."""
+    run = shard.run
+    with transaction.atomic():
+        # Row lock: a second worker on the same shard waits here and then continues from the new cursor.
+        shard = BreachReevaluationShard.objects.select_for_update().get(pk=shard.pk)
+        if shard.status == Status.DONE:
+            return False
+        size = settings.SLA_REEVALUATION_CHUNK_SIZE
+        chunk = sorted(
+            (
+                r for model in BREACHES
+                for r in scope(run, model).select_related(*SWEEP_RELATED)
+                .filter(id__gt=shard.cursor, id__lt=shard.id_to).order_by("id")[:size]
+            ),
+            key=lambda r: r.id,
+        )[:size]
+        if not chunk:
+            shard.status = Status.DONE
+            shard.save(update_fields=["status", "updated_at"])
+            return False
+        to_insert, to_update, to_delete = [], [], []
+        for model, breaches in BREACHES.items():
+            requests = [r for r in chunk if isinstance(r, model)]
+            if not requests:
+                continue
+            changes = diff(requests, run.as_of, breaches)
+            if not run.dry_run:
+                write(breaches, *changes)
+            for total, rows in zip((to_insert, to_update, to_delete), changes):
+                total += rows
+        if not run.dry_run:
+            changed = {e.request_id for e in to_insert + to_update + to_delete}
+            mark([r for r in chunk if r.id in changed])  # bulk writes bypass the rollup signals
+        shard.cursor = chunk[-1].id
+        shard.status = Status.RUNNING
+        shard.scanned += len(chunk)
+        shard.inserted += len(to_insert)
+        shard.updated += len(to_update)
+        shard.deleted += len(to_delete)
+        shard.save()
+        return True
+
+
+def run_shard(shard_id):
+    shard = BreachReevaluationShard.objects.select_related("run").get(pk=shard_id)
+    try:
+        while _chunk(shard):
+            pass
+    except Exception as exc:
+        BreachReevaluationShard.objects.filter(pk=shard_id).update(status=Status.FAILED, error=repr(exc), updated_at=timezone.now())
+        BreachReevaluation.objects.filter(pk=shard.run_id).update(status=Status.FAILED)
+        raise
+    finish(shard.run_id)
+    return totals(shard.run)
+
+
+def finish(run_id):
+    """Close the run once every shard is done: resync the breach counters and dashboards it touched."""
+    with transaction.atomic():
+        run = BreachReevaluation.objects.select_for_update().get(pk=run_id)
+        if run.status in (Status.DONE, Status.FAILED) or run.shards.exclude(status=Status.DONE).exists():
+            return run
+        run.status, run.finished_at = Status.DONE, timezone.now()
+        run.save(update_fields=["status", "finished_at"])
+    if not run.dry_run:
+        tenants = Tenant.objects.filter(pk=run.tenant_id) if run.tenant_id else Tenant.objects.filter(
+            Q(pk__in=scope(run).values("tenant_id")) | Q(pk__in=scope(run, ArchivedServiceRequest).values("tenant_id"))
+        )
+        for tenant in tenants:
+            reconcile(tenant, ["breach_count"])  # bulk writes bypass the counter signals
+            invalidate(tenant, "dashboard")
+    logger.info("Breach re-evaluation %s finished: %s", run.pk, totals(run))
+    return run
+
+
+def totals(run):
+    fields = ["scanned", "inserted", "updated", "deleted"]
+    rows = run.shards.values_list(*fields)
+    return {field: sum(row[i] for row in rows) for i, field in enumerate(fields)}
+
+
+def start(tenant=None, contract_ids=(), opened_from=None, opened_until=None, dry_run=False, shards=None):
+    """Create a run and its shards; process them with ``run_shard`` (or the Celery task per shard)."""
+    run = BreachReevaluation.objects.create(
+        tenant=tenant, contract_ids=sorted(contract_ids),
+        opened_from=opened_from, opened_until=opened_until, dry_run=dry_run,
+    )
+    if not plan(run, shards):
+        return finish(run.pk)
+    run.status = Status.RUNNING
+    run.save(update_fields=["status"])
+    return run
+
+
+def pending_shards(run):
+    """Shards still to do; a failed run's shards are reset so a resume retries them."""
+    if run.status == Status.FAILED:
+        run.shards.filter(status=Status.FAILED).update(status=Status.RUNNING, error="")
+        BreachReevaluation.objects.filter(pk=run.pk).update(status=Status.RUNNING)
+        run.status = Status.RUNNING
+    return list(run.shards.exclude(status=Status.DONE).values_list("id", flat=True))
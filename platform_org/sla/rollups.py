@@ -0,0 +1,280 @@
+"""SLA compliance rollups per (contract, day), maintained incrementally.
+
+A request counts towards the day it was opened (TIME_ZONE) under its contract. Whenever a request is
+created, changes or gets a breach, its (contract, day) key is added to a Redis set, and one coalesced
+Celery task recomputes the marked rows from hot and archived requests/breaches in batches, each batch one
+``INSERT ... SELECT ... ON CONFLICT`` aggregated by Postgres. Recomputing a whole key instead of applying
+deltas keeps rows exact however often, and in whatever order, a key is marked. Anything Redis loses (or a request moved to another contract or day) is repaired by the daily
+``repair_sla_rollups`` sweep over the last SLA_ROLLUP_REPAIR_DAYS.
+"""
+import logging
+from datetime import datetime, time, timedelta
+
+import redis
+from celery import shared_task
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Trunc, TruncDate
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+
+from platform_org.core.models import MEContract
+from .models import DURATION_BUCKETS, ServiceRequest, ServiceRequestHistory, SLABreachEvent, SLABreachHistory, SLADailyRollup
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = "sla:rollups:dirty"
+SCHEDULED_KEY = "sla:rollups:drain-scheduled"
+GROUPS = {
+    "tenant": ("tenant_id", "tenant__code"),
+    "provider_me": ("provider_me_id", "provider_me__name"),
+    "consumer_me": ("consumer_me_id", "consumer_me__name"),
+    "contract": ("contract_id", "contract__code"),
+}
+PERCENTILES = (50, 90, 95)
+COUNTERS = ["requests", "resolved", "breached_requests", "response_breaches", "resolution_breaches", "responded",
+            "response_seconds", "resolution_seconds"]
+
+_redis = None
+
+
+def get_redis():
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis
+
+
+def day_of(opened_at):
+    return timezone.localtime(opened_at, timezone.get_default_timezone()).date()
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_default_timezone())
+
+
+def key_of(request):
+    return request.contract_id, day_of(request.opened_at)
+
+
+def mark(requests):
+    """Queue the rollup keys of ``requests`` for recomputation once the transaction commits."""
+    mark_keys(key_of(r) for r in requests if r.opened_at)
+
+
+def mark_keys(keys):
+    members = {f"{contract_id}:{day.isoformat()}" for contract_id, day in keys}
+    if members:
+        transaction.on_commit(lambda: _enqueue(members))
+
+
+def _enqueue(members):
+    delay = settings.SLA_ROLLUP_COALESCE_SECONDS
+    try:
+        pipe = get_redis().pipeline()
+        pipe.sadd(DIRTY_KEY, *members)
+        pipe.set(SCHEDULED_KEY, 1, nx=True, ex=max(int(delay) * 10, 60))
+        _, scheduled = pipe.execute()
+    except redis.RedisError:
+        logger.warning("Could not queue SLA rollup keys %s; the daily repair rebuilds them", sorted(members), exc_info=True)
+        return
+    if scheduled:
+        try:
+            drain_sla_rollups.apply_async(countdown=delay)
+        except OperationalError:
+            logger.warning("Could not schedule the SLA rollup drain; the next change retries", exc_info=True)
+            get_redis().delete(SCHEDULED_KEY)
+
+
+def _runs(keys):
+    """(contract_id, first day, last day) for each run of consecutive days in ``keys``."""
+    runs = []
+    for contract_id, day in sorted(keys):
+        if runs and runs[-1][0] == contract_id and runs[-1][2] + timedelta(days=1) == day:
+            runs[-1][2] = day
+        else:
+            runs.append([contract_id, day, day])
+    return runs
+
+
+def _histogram_sql(column):
+    # width_bucket() gives the number of bounds <= the duration in minutes, i.e. the histogram index (0 for
+    # negative durations, nothing for NULL).
+    bucket = f"width_bucket({column} / 60.0, %(bounds)s::float8[])"
+    return "ARRAY[%s]" % ", ".join(f"count(*) FILTER (WHERE {bucket} = {i})" for i in range(len(DURATION_BUCKETS) + 1))
+
+
+RECOMPUTE_SQL = f"""
+WITH keys AS (
+    SELECT * FROM unnest(%(contracts)s::bigint[], %(starts)s::timestamptz[], %(ends)s::timestamptz[]) AS k(contract_id, lo, hi)
+), req AS (
+    SELECT r.contract_id,
+           (r.opened_at AT TIME ZONE %(tz)s)::date AS day,
+           extract(epoch FROM r.first_response_at - r.opened_at) AS response,
+           extract(epoch FROM r.resolved_at - r.opened_at) AS resolution,
+           EXISTS (SELECT 1 FROM {SLABreachHistory._meta.db_table} b WHERE b.request_id = r.id AND b.breach_type = %(response)s) AS response_breach,
+           EXISTS (SELECT 1 FROM {SLABreachHistory._meta.db_table} b WHERE b.request_id = r.id AND b.breach_type = %(resolution)s) AS resolution_breach
+    FROM {ServiceRequestHistory._meta.db_table} r
+    JOIN keys k ON r.contract_id = k.contract_id AND r.opened_at >= k.lo AND r.opened_at < k.hi
+)
+INSERT INTO {SLADailyRollup._meta.db_table} (
+    tenant_id, contract_id, provider_me_id, consumer_me_id, day, requests, resolved, breached_requests,
+    response_breaches, resolution_breaches, responded, response_seconds, resolution_seconds,
+    response_histogram, resolution_histogram, updated_at
+)
+SELECT c.tenant_id, q.contract_id, c.provider_me_id, c.consumer_me_id, q.day,
+       count(*),
+       count(q.resolution),
+       count(*) FILTER (WHERE q.response_breach OR q.resolution_breach),
+       count(*) FILTER (WHERE q.response_breach),
+       count(*) FILTER (WHERE q.resolution_breach),
+       count(q.response),
+       coalesce(sum(greatest(q.response, 0)), 0)::bigint,
+       coalesce(sum(greatest(q.resolution, 0)), 0)::bigint,
+       {_histogram_sql("q.response")},
+       {_histogram_sql("q.resolution")},
+       now()
+FROM req q JOIN {MEContract._meta.db_table} c ON c.id = q.contract_id
+GROUP BY c.tenant_id, q.contract_id, c.provider_me_id, c.consumer_me_id, q.day
+ON CONFLICT (contract_id, day) DO UPDATE SET
+    {", ".join(f"{col} = EXCLUDED.{col}" for col in ["tenant_id", "provider_me_id", "consumer_me_id", *COUNTERS, "response_histogram", "resolution_histogram", "updated_at"])}
+RETURNING contract_id, day
+"""
+
+
+def recompute(keys):
+    """Rebuild the rollup rows for (contract_id, day) keys from the source tables; returns rows written."""
+    keys = set(keys)
+    if not keys:
+        return 0
+    runs = _runs(keys)
+    params = {
+        "contracts": [contract_id for contract_id, _, _ in runs],
+        "starts": [day_start(first) for _, first, _ in runs],
+        "ends": [day_start(last + timedelta(days=1)) for _, _, last in runs],
+        "tz": timezone.get_default_timezone_name(),
+        "bounds": list(DURATION_BUCKETS),
+        "response": SLABreachEvent.BreachType.RESPONSE,
+        "resolution": SLABreachEvent.BreachType.RESOLUTION,
+    }
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(RECOMPUTE_SQL, params)
+        written = set(cursor.fetchall())
+        empty = keys - written
+        if empty:
+            gone = Q()
+            for contract_id, day in empty:
+                gone |= Q(contract_id=contract_id, day=day)
+            SLADailyRollup.objects.filter(gone).delete()
+    return len(written)
+
+
+def percentile(histogram, q):
+    """Minutes below which ``q`` percent of the histogram falls, interpolated linearly within a bucket."""
+    total = sum(histogram)
+    if not total:
+        return None
+    target = total * q / 100
+    lower, seen = 0, 0
+    for upper, count in zip(DURATION_BUCKETS, histogram):
+        if count and seen + count >= target:
+            return round(lower + (upper - lower) * (target - seen) / count, 1)
+        lower, seen = upper, seen + count
+    return float(lower)  # falls in the open-ended bucket; report its lower bound
+
+
+def report(tenant, group_by, period, start, end):
+    """Compliance per ``group_by`` and ``period`` for requests opened from ``start`` to ``end`` (inclusive)."""
+    key, label = GROUPS[group_by]
+    sums = {name: Sum(name) for name in COUNTERS}
+    buckets = range(len(DURATION_BUCKETS) + 1)
+    for kind in ("response", "resolution"):
+        sums.update({f"{kind}_{i}": Sum(F(f"{kind}_histogram__{i}")) for i in buckets})
+    rows = (
+        SLADailyRollup.objects.filter(tenant=tenant, day__gte=start, day__lte=end)
+        .annotate(period=Trunc("day", period))
+        .values("period", key, label)
+        .annotate(**sums)
+        .order_by("period", label, key)
+    )
+    results = []
+    for row in rows:
+        requests, responded, resolved = row["requests"], row["responded"], row["resolved"]
+        result = {
+            "period": row["period"],
+            "group": {"id": row[key], "name": row[label]},
+            **{name: row[name] for name in COUNTERS if not name.endswith("_seconds")},
+            "compliance_pct": round(100 * (requests - row["breached_requests"]) / requests, 2) if requests else None,
+        }
+        for kind, count in (("response", responded), ("resolution", resolved)):
+            histogram = [row[f"{kind}_{i}"] for i in buckets]
+            result[f"{kind}_minutes"] = {
+                "avg": round(row[f"{kind}_seconds"] / count / 60, 1) if count else None,
+                **{f"p{q}": percentile(histogram, q) for q in PERCENTILES},
+            }
+        results.append(result)
+    return results
+
+
+def _parse(member):
+    contract_id, day = member.decode().split(":")
+    return int(contract_id), datetime.strptime(day, "%Y-%m-%d").date()
+
+
+def drain(batch_size=None):
+    r = get_redis()
+    batch_size = batch_size or settings.SLA_ROLLUP_BATCH_SIZE
+    # Clear the flag first so keys marked mid-drain schedule a follow-up run.
+    r.delete(SCHEDULED_KEY)
+    stats = {"keys": 0, "rows": 0}
+    while True:
+        members = r.spop(DIRTY_KEY, batch_size)
+        if not members:
+            break
+        stats["keys"] += len(members)
+        stats["rows"] += recompute(_parse(m) for m in members)
+    return stats
+
+
+def rebuild(since=None, tenant=None, batch_size=None):
+    """Recompute every key with requests (or existing rows) opened on or after ``since``; all history when None."""
+    batch_size = batch_size or settings.SLA_ROLLUP_BATCH_SIZE
+    requests, rollups = ServiceRequestHistory.objects.all(), SLADailyRollup.objects.all()
+    if since:
+        requests, rollups = requests.filter(opened_at__gte=day_start(since)), rollups.filter(day__gte=since)
+    if tenant:
+        requests, rollups = requests.filter(tenant=tenant), rollups.filter(tenant=tenant)
+    keys = set(requests.annotate(day=TruncDate("opened_at", tzinfo=timezone.get_default_timezone())).values_list("contract_id", "day").distinct())
+    keys |= set(rollups.values_list("contract_id", "day"))
+    keys = sorted(keys)
+    rows = 0
+    for i in range(0, len(keys), batch_size):
+        rows += recompute(keys[i:i + batch_size])
+    return {"keys": len(keys), "rows": rows}
+
+
+@shared_task
+def drain_sla_rollups():
+    return drain()
+
+
+@shared_task
+def repair_sla_rollups():
+    return rebuild(since=timezone.localdate() - timedelta(days=settings.SLA_ROLLUP_REPAIR_DAYS))
+
+
+def _on_request_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark([instance])
+
+
+def _on_breach_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        mark([instance.request])
+
+
+post_save.connect(_on_request_change, sender=ServiceRequest, weak=False, dispatch_uid="sla-rollup-request-save")
+post_delete.connect(_on_request_change, sender=ServiceRequest, weak=False, dispatch_uid="sla-rollup-request-delete")
+post_save.connect(_on_breach_created, sender=SLABreachEvent, weak=False, dispatch_uid="sla-rollup-breach-save")
@@ -0,0 +1,133 @@
+"""Live SLA events over Server-Sent Events, fanned out from Redis pub/sub.
+
+Publishers (the breach sweep and the webhook drain) send a ready-made SSE frame to
+``sla:stream:<tenant id>``. Each ASGI worker holds one pattern subscription for all tenants and copies
+frames into a bounded queue per connected client. A client whose queue fills up (it reads slower than
+events arrive) has its backlog replaced by a single ``resync`` event, telling it to refetch
+/api/sla/breaches/; the worker never buffers without bound or blocks other clients on it.
+"""
+import asyncio
+import logging
+import weakref
+from collections import defaultdict
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.db import transaction
+
+from platform_org.core.renderers import FastJSONRenderer
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "sla:stream:"
+RESYNC = b"event: resync\ndata: {}\n\n"
+KEEPALIVE = b": keepalive\n\n"
+
+_redis = None
+_broadcasters = weakref.WeakKeyDictionary()
+
+
+def get_redis():
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.SLA_STREAM_REDIS_URL)
+    return _redis
+
+
+def frame(event, data, event_id=None):
+    lines = [f"id: {event_id}".encode()] if event_id is not None else []
+    lines += [f"event: {event}".encode(), b"data: " + FastJSONRenderer().render(data)]
+    return b"\n".join(lines) + b"\n\n"
+
+
+def publish(tenant_id, event, data, event_id=None):
+    """Send an event to the tenant's streams once the surrounding transaction commits."""
+    message = frame(event, data, event_id)
+
+    def send():
+        try:
+            get_redis().publish(f"{CHANNEL_PREFIX}{tenant_id}", message)
+        except redis.RedisError:
+            logger.warning("Could not publish SLA %s event for tenant %s", event, tenant_id, exc_info=True)
+
+    transaction.on_commit(send)
+
+
+class Broadcaster:
+    """One Redis subscription per event loop, shared by every stream served on it."""
+
+    def __init__(self):
+        self.queues = defaultdict(set)
+        self.task = None
+
+    def subscribe(self, tenant_id):
+        queue = asyncio.Queue(maxsize=settings.SLA_STREAM_QUEUE_SIZE)
+        self.queues[tenant_id].add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.listen())
+        return queue
+
+    def unsubscribe(self, tenant_id, queue):
+        self.queues[tenant_id].discard(queue)
+        if not self.queues[tenant_id]:
+            del self.queues[tenant_id]
+
+    def dispatch(self, channel, message):
+        tenant_id = int(channel.rsplit(b":", 1)[1])
+        for queue in self.queues.get(tenant_id, ()):
+            offer(queue, message)
+
+    async def listen(self):
+        while True:
+            try:
+                client = redis.asyncio.Redis.from_url(settings.SLA_STREAM_REDIS_URL)
+                async with client, client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                    async for message in pubsub.listen():
+                        if message["type"] == "pmessage":
+                            self.dispatch(message["channel"], message["data"])
+            except redis.RedisError:
+                logger.warning("SLA stream subscription lost; reconnecting", exc_info=True)
+                # Events published while the subscription was down are gone; have every client refetch.
+                for queues in self.queues.values():
+                    for queue in queues:
+                        offer(queue, RESYNC)
+                await asyncio.sleep(1)
+
+
+def offer(queue, message):
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC)
+
+
+def broadcaster():
+    loop = asyncio.get_running_loop()
+    if loop not in _broadcasters:
+        _broadcasters[loop] = Broadcaster()
+    return _broadcasters[loop]
+
+
+async def events(tenant_id, replay=None):
+    """SSE body for one client: frames from ``await replay()`` first, then live events and keepalives.
+
+    The client is subscribed before ``replay`` runs, so an event published in between is delivered
+    (possibly twice; clients dedupe on the event id) instead of lost.
+    """
+    hub = broadcaster()
+    queue = hub.subscribe(tenant_id)
+    try:
+        yield f"retry: {settings.SLA_STREAM_RETRY_MS}\n\n".encode()
+        for message in await replay() if replay else ():
+            yield message
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), settings.SLA_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield KEEPALIVE
+    finally:
+        hub.unsubscribe(tenant_id, queue)
@@ -1,47 +1,126 @@
+from collections import defaultdict
+from datetime import timedelta
+
 from celery import shared_task
+from django.conf import settings
 from django.utils import timezone
-from .models import ServiceRequest, SLABreachEvent
+from .api import SLABreachSerializer
+from .models import BreachReevaluation, ServiceRequest, SLABreachEvent
+from .stream import publish
+from platform_org.core.business_hours import add_business_hours_many
+from platform_org.core.metrics import SLA_BREACHES_CREATED, SLA_DUE_SOON, SLA_OPEN_REQUESTS
 from platform_org.core.notifications import send_teams_webhook
 
-def _hours(opened_at, now):
-    return (now - opened_at).total_seconds() / 3600.0
+SWEEP_RELATED = ("contract", "tenant", "contract__sla_template", "contract__sla_template__calendar")
+
+def deadlines(reqs, target):
+    """{request id: due at} for the SLA template's ``target`` ("response_time_hours" or
+    "resolution_time_hours"), in the template calendar's business hours; one batched lookup per template."""
+    by_template = defaultdict(list)
+    for r in reqs:
+        template = r.contract.sla_template
+        if template and getattr(template, target):
+            by_template[template.pk].append(r)
+    due = {}
+    for group in by_template.values():
+        template = group[0].contract.sla_template
+        at = add_business_hours_many(template.calendar, [r.opened_at for r in group], getattr(template, target))
+        due.update(zip((r.id for r in group), at))
+    return due
 
 @shared_task
 def check_sla_breaches():
     now = timezone.now()
-    reqs = ServiceRequest.objects.select_related("contract", "tenant", "contract__sla_template").filter(
+    reqs = list(ServiceRequest.objects.select_related(*SWEEP_RELATED).filter(
         status__in=["OPEN", "IN_PROGRESS"]
-    )
+    ))
+    soon = now + timedelta(hours=getattr(settings, "SLA_DUE_SOON_HOURS", 4))
+    due_soon = {r.tenant_id: [] for r in reqs}
+    resolution_due = deadlines([r for r in reqs if r.resolved_at is None], "resolution_time_hours")
+    for r in reqs:
+        due_at = resolution_due.get(r.id)
+        if due_at and now <= due_at <= soon:
+            due_soon[r.tenant_id].append({"request": r.id, "title": r.title, "due_at": due_at})
+    SLA_OPEN_REQUESTS.set(len(reqs))
+    SLA_DUE_SOON.set(sum(len(warnings) for warnings in due_soon.values()))
+    for tenant_id, warnings in due_soon.items():
+        warnings.sort(key=lambda w: w["due_at"])
+        publish(tenant_id, "due_soon", {"count": len(warnings), "requests": warnings[:50]})
+    return {"created": evaluate_breaches(reqs, now, trigger="sweep")}
+
+
+def evaluate_breaches(reqs, now, trigger="sweep"):
+    """Record the breaches of ``reqs`` whose deadline has passed by ``now``. A breach is dated at its deadline,
+    like those written by re-evaluation, so a later re-evaluation finds it unchanged."""
+    from .partitions import cover
 
     created = 0
+    response_due = deadlines([r for r in reqs if r.first_response_at is None], "response_time_hours")
+    resolution_due = deadlines([r for r in reqs if r.resolved_at is None], "resolution_time_hours")
+    cover(SLABreachEvent, [at for due in (response_due, resolution_due) for at in due.values() if now > at])
     for r in reqs:
         template = r.contract.sla_template
         if not template:
             continue
 
         # Check Response Time
-        if template.response_time_hours and r.first_response_at is None:
-            if _hours(r.opened_at, now) > template.response_time_hours:
-                _, created_flag = SLABreachEvent.objects.get_or_create(
+        if r.id in response_due:
+            if now > response_due[r.id]:
+                event, created_flag = SLABreachEvent.objects.get_or_create(
                     tenant=r.tenant,
                     request=r,
                     breach_type="RESPONSE",
-                    defaults={"details": {"target_hours": template.response_time_hours}}
+                    defaults={"breach_at": response_due[r.id], "details": {"target_hours": template.response_time_hours}}
                 )
                 if created_flag:
+                    publish(r.tenant_id, "breach", SLABreachSerializer(event).data, event.id)
                     send_teams_webhook(f"SLA BREACH (RESPONSE): {r.title} | Contract {r.contract.code}")
                     created += 1
 
         # Check Resolution Time
-        if template.resolution_time_hours and r.resolved_at is None:
-            if _hours(r.opened_at, now) > template.resolution_time_hours:
-                _, created_flag = SLABreachEvent.objects.get_or_create(
+        if r.id in resolution_due:
+            if now > resolution_due[r.id]:
+                event, created_flag = SLABreachEvent.objects.get_or_create(
                     tenant=r.tenant,
                     request=r,
                     breach_type="RESOLUTION",
-                    defaults={"details": {"target_hours": template.resolution_time_hours}}
+                    defaults={"breach_at": resolution_due[r.id], "details": {"target_hours": template.resolution_time_hours}}
                 )
                 if created_flag:
+                    publish(r.tenant_id, "breach", SLABreachSerializer(event).data, event.id)
                     send_teams_webhook(f"SLA BREACH (RESOLUTION): {r.title} | Contract {r.contract.code}")
                     created += 1
-    return {"created": created}
+    SLA_BREACHES_CREATED.labels(trigger).inc(created)
+    return created
+
+
+@shared_task
+def reevaluate_breaches(run_id):
+    """Fan a re-evaluation run out to one task per unfinished shard (also resumes a failed run)."""
+    from .reevaluation import pending_shards
+
+    shard_ids = pending_shards(BreachReevaluation.objects.get(pk=run_id))
+    for shard_id in shard_ids:
+        reevaluate_breach_shard.delay(shard_id)
+    return {"queued": len(shard_ids)}
+
+
+@shared_task
+def reevaluate_breach_shard(shard_id):
+    from .reevaluation import run_shard
+
+    return run_shard(shard_id)
+
+
+@shared_task
+def maintain_sla_partitions():
+    from .partitions import analyze_parents, ensure_partitions
+
+    return {"created": ensure_partitions(), "analyzed": analyze_parents()}
+
+
+@shared_task
+def archive_closed_requests():
+    from .archive import archive_all
+
+    return archive_all()
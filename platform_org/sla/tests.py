@@ -0,0 +1,180 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock, skipUnless
+
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from platform_org.audit.partitions import add_months, month_start
+from platform_org.core.models import MEContract, MicroEnterprise, SLATemplate
+from platform_org.core.plans import scanned
+from platform_org.core.profiling import assertNoSeqScan
+from platform_org.pagination import KeysetPaginationMixin
+from platform_org.tenancy.models import Tenant
+from platform_org.views import ServiceRequestListView, SLABreachesView
+from .archive import archive_tenant
+from .models import ArchivedSLABreachEvent, ServiceRequest, SLABreachEvent
+from .partitions import ensure_partitions, list_partitions, partition_name
+from .reevaluation import diff, run_shard, start
+from .rollups import key_of
+from .tasks import SWEEP_RELATED, evaluate_breaches
+
+OPENED = datetime(2024, 3, 1, 10, tzinfo=dt_timezone.utc)
+
+
+class SLATestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Saves inside a transaction (every test) don't create partitions; the months have to be there already.
+        ensure_partitions(since=date(2023, 1, 1))
+        cls.tenant = Tenant.objects.create(code="acme", name="Acme")
+        me = MicroEnterprise.objects.create(tenant=cls.tenant, code="P", name="Provider")
+        cls.template = SLATemplate.objects.create(tenant=cls.tenant, name="Gold", response_time_hours=4, resolution_time_hours=8)
+        cls.contract = MEContract.objects.create(
+            tenant=cls.tenant, code="C-1", provider_me=me, consumer_me=me, start_date=date(2024, 1, 1), sla_template=cls.template
+        )
+
+    def setUp(self):
+        patcher = mock.patch("platform_org.sla.rollups._enqueue")  # rollup keys go to Redis once a write commits
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def open_request(self, opened_at=OPENED, **kwargs):
+        request = ServiceRequest.objects.create(
+            tenant=self.tenant, contract=self.contract, external_id=str(opened_at.timestamp()), title="Down",
+            opened_at=opened_at, **kwargs,
+        )
+        return ServiceRequest.objects.select_related(*SWEEP_RELATED).get(pk=request.pk)
+
+
+class SweepTests(SLATestCase):
+    def test_breaches_are_dated_at_their_deadline(self):
+        request = self.open_request()
+        now = OPENED + timedelta(days=3)
+
+        self.assertEqual(evaluate_breaches([request], now), 2)
+
+        breaches = dict(SLABreachEvent.objects.filter(request_id=request.pk).values_list("breach_type", "breach_at"))
+        self.assertEqual(breaches, {"RESPONSE": OPENED + timedelta(hours=4), "RESOLUTION": OPENED + timedelta(hours=8)})
+        # Re-evaluation under the same template leaves what the sweep recorded alone.
+        self.assertEqual(diff([request], now), ([], [], []))
+
+
+class ReevaluationTests(SLATestCase):
+    def reevaluate(self):
+        run = start(tenant=self.tenant)
+        with mock.patch("platform_org.sla.reevaluation.mark") as mark:
+            for shard in run.shards.all():
+                run_shard(shard.pk)
+        return {key_of(r) for call in mark.call_args_list for r in call.args[0]}
+
+    def test_archived_requests_follow_their_template(self):
+        resolved = OPENED + timedelta(hours=6)
+        request = self.open_request(first_response_at=OPENED + timedelta(hours=5), resolved_at=resolved, status="CLOSED")
+        SLABreachEvent.objects.create(tenant=self.tenant, request_id=request.pk, breach_type="RESPONSE", breach_at=OPENED + timedelta(hours=4))
+        self.assertEqual(archive_tenant(self.tenant, now=resolved + timedelta(days=400))["breaches"], 1)
+        self.template.response_time_hours, self.template.resolution_time_hours = 8, 5
+        self.template.save()
+
+        marked = self.reevaluate()
+
+        breaches = ArchivedSLABreachEvent.objects.filter(request_id=request.pk)
+        self.assertEqual(dict(breaches.values_list("breach_type", "breach_at")), {"RESOLUTION": OPENED + timedelta(hours=5)})
+        self.assertFalse(SLABreachEvent.objects.filter(request_id=request.pk).exists())
+        self.assertEqual(marked, {(self.contract.pk, date(2024, 3, 1))})
+
+
+@skipUnless(connection.vendor == "postgresql", "the SLA tables are partitioned on Postgres only")
+class PartitionMaintenanceTests(SLATestCase):
+    @override_settings(SLA_PARTITIONS_BEHIND=60)
+    def test_maintenance_keeps_past_months_ready(self):
+        oldest = add_months(month_start(timezone.now().date()), -60)
+        ensure_partitions()
+        self.assertIn(partition_name(ServiceRequest._meta.db_table, oldest), list_partitions(ServiceRequest._meta.db_table))
+
+    def test_save_in_a_transaction_never_creates_a_partition(self):
+        # CREATE TABLE ... PARTITION OF would lock the whole table until the surrounding transaction ends.
+        table = ServiceRequest._meta.db_table
+        before = list_partitions(table)
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            self.open_request(opened_at=datetime(2019, 1, 10, tzinfo=dt_timezone.utc))
+        self.assertEqual(list_partitions(table), before)
+
+
+@skipUnless(connection.vendor == "postgresql", "the SLA tables are partitioned on Postgres only")
+class QueryPlanTests(SLATestCase):
+    """The lists read only the months they show; the sweep reads every month, through the open-request index;
+    the other request queries each read the index added for them."""
+
+    MONTHS = [date(2024, month, 1) for month in range(1, 7)]
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        requests = ServiceRequest.objects.bulk_create(
+            ServiceRequest(
+                tenant=cls.tenant, contract=cls.contract, external_id=f"{month:%Y%m}-{n}", title="Down",
+                opened_at=datetime(month.year, month.month, 10 + n, tzinfo=dt_timezone.utc), status="OPEN" if n else "CLOSED",
+                resolved_at=None if n else datetime(month.year, month.month, 20, tzinfo=dt_timezone.utc),
+            )
+            for month in cls.MONTHS for n in range(3)
+        )
+        SLABreachEvent.objects.bulk_create(
+            SLABreachEvent(tenant=cls.tenant, request_id=r.pk, breach_type="RESPONSE", breach_at=r.opened_at + timedelta(hours=4))
+            for r in requests
+        )
+
+    def months(self, model, first, last):
+        month, names = first, set()
+        while month <= last:
+            names.add(partition_name(model._meta.db_table, month))
+            month = add_months(month, 1)
+        return names
+
+    def lists(self):
+        for model, view in ((ServiceRequest, ServiceRequestListView), (SLABreachEvent, SLABreachesView)):
+            yield model, view, model.objects.filter(tenant=self.tenant).order_by(*view.keyset)
+
+    def test_first_page_stops_in_the_newest_month(self):
+        for model, view, rows in self.lists():
+            with self.subTest(model=model.__name__):
+                # A page of 3 plus the row that tells whether there is a next one: June's three and May's newest.
+                read = scanned(assertNoSeqScan(rows[:4], analyze=True), f"{model._meta.db_table}_p")
+                self.assertLessEqual(self.months(model, date(2024, 5, 1), date(2024, 6, 1)), set(read))
+                self.assertFalse(set(read) & self.months(model, date(2023, 1, 1), date(2024, 4, 1)))
+
+    def test_next_page_prunes_the_months_after_the_cursor(self):
+        for model, view, rows in self.lists():
+            with self.subTest(model=model.__name__):
+                cursor = rows.filter(**{f"{view.keyset[0][1:]}__lt": datetime(2024, 4, 1, tzinfo=dt_timezone.utc)}).first()
+                keyset = KeysetPaginationMixin()
+                keyset.keyset = view.keyset
+                page = rows.filter(keyset._keyset_filter([getattr(cursor, f.lstrip("-")) for f in view.keyset], forward=True))
+                read = scanned(assertNoSeqScan(page[:3]), f"{model._meta.db_table}_p")
+                self.assertEqual(max(read), partition_name(model._meta.db_table, date(2024, 3, 1)))
+
+    def test_window_reads_its_months_only(self):
+        for model, view, rows in self.lists():
+            with self.subTest(model=model.__name__):
+                field = view.keyset[0][1:]
+                window = rows.filter(**{
+                    f"{field}__gte": datetime(2024, 2, 1, tzinfo=dt_timezone.utc),
+                    f"{field}__lt": datetime(2024, 4, 1, tzinfo=dt_timezone.utc),
+                })
+                read = scanned(assertNoSeqScan(window), f"{model._meta.db_table}_p")
+                self.assertEqual(set(read), self.months(model, date(2024, 2, 1), date(2024, 3, 1)))
+
+    def test_sweep_probes_every_month_through_the_open_index(self):
+        plan = assertNoSeqScan(ServiceRequest.objects.filter(status__in=["OPEN", "IN_PROGRESS"]), "request_open_idx")
+        self.assertLessEqual(self.months(ServiceRequest, self.MONTHS[0], self.MONTHS[-1]), set(scanned(plan)))
+
+    def test_request_lookups(self):
+        requests = ServiceRequest.objects.filter(tenant=self.tenant)
+        assertNoSeqScan(
+            requests.filter(status="CLOSED").order_by(*ServiceRequestListView.keyset)[:21], "request_tenant_status_idx"
+        )
+        assertNoSeqScan(requests.filter(status__in=["RESOLVED", "CLOSED"], resolved_at__lt=OPENED), "request_closed_idx")
+        assertNoSeqScan(
+            ServiceRequest.objects.filter(contract=self.contract, opened_at__gte=OPENED, opened_at__lt=OPENED + timedelta(days=7)),
+            "request_contract_opened_idx",
+        )
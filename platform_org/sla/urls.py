@@ -1,11 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .api import ServiceRequestViewSet, SLABreachViewSet
+from .api import ServiceRequestViewSet, SLABreachViewSet, SLAComplianceViewSet
+from .async_views import breach_list, breach_stream, service_request_list
 
 router = DefaultRouter()
 router.register(r"sla/requests", ServiceRequestViewSet, basename="sla-requests")
 router.register(r"sla/breaches", SLABreachViewSet, basename="sla-breaches")
+router.register(r"sla/compliance", SLAComplianceViewSet, basename="sla-compliance")
 
 urlpatterns = [
+    path("api/async/sla/requests/", service_request_list, name="async-sla-requests-list"),
+    path("api/async/sla/breaches/", breach_list, name="async-sla-breaches-list"),
+    path("api/async/sla/breaches/stream/", breach_stream, name="async-sla-breaches-stream"),
     path("api/", include(router.urls)),
 ]
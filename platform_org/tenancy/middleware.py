@@ -1,41 +1,61 @@
 from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 
-from .models import Tenant, TenantUser
+from .models import Tenant
 
 
 class TenantMiddleware(MiddlewareMixin):
     """Resolve tenant from subdomain, header, Entra claims, or user mapping."""
 
-    def process_request(self, request):
-        tenant = None
+    def candidates(self, request, user):
+        """Lookups in priority order; each is a lazy queryset whose first row wins."""
         host = request.get_host().split(":")[0]
         subdomain = host.split(".")[0] if host and "." in host else None
 
         if subdomain and subdomain not in {"www", "localhost"}:
-            tenant = Tenant.objects.filter(slug=subdomain, is_active=True).first()
+            yield Tenant.objects.filter(slug=subdomain, is_active=True)
 
-        if not tenant:
-            tenant_header = request.headers.get("X-Tenant")
-            if tenant_header:
-                tenant = Tenant.objects.filter(slug=tenant_header, is_active=True).first()
+        tenant_header = request.headers.get("X-Tenant")
+        if tenant_header:
+            yield Tenant.objects.filter(slug=tenant_header, is_active=True)
 
         claims = getattr(request, "entra_claims", None)
-        if not tenant and claims:
+        if claims:
             tid = claims.get("tid")
             groups = claims.get("groups") or []
             if tid:
-                tenant = Tenant.objects.filter(entra_tenant_id=tid, is_active=True).first()
-            if not tenant and groups:
-                tenant = Tenant.objects.filter(entra_group_id__in=groups, is_active=True).first()
+                yield Tenant.objects.filter(entra_tenant_id=tid, is_active=True)
+            if groups:
+                yield Tenant.objects.filter(entra_group_id__in=groups, is_active=True)
+
+        if user is not None and user.is_authenticated:
+            # Same pick as the first active TenantUser row (by membership id).
+            yield Tenant.objects.filter(
+                tenant_users__user=user, tenant_users__is_active=True, is_active=True
+            ).order_by("tenant_users__id")
 
-        user = getattr(request, "user", None)
-        if not tenant and user is not None and user.is_authenticated:
-            membership = TenantUser.objects.filter(user=user, is_active=True, tenant__is_active=True).first()
-            if membership:
-                tenant = membership.tenant
+    def process_request(self, request):
+        tenant = None
+        for queryset in self.candidates(request, getattr(request, "user", None)):
+            tenant = queryset.first()
+            if tenant:
+                break
 
         if not tenant and getattr(settings, "DEBUG", False):
             tenant, _ = Tenant.objects.get_or_create(slug="default", defaults={"name": "Default Tenant"})
 
         request.tenant = tenant
+
+    async def __acall__(self, request):
+        tenant = None
+        user = await request.auser() if hasattr(request, "auser") else None
+        for queryset in self.candidates(request, user):
+            tenant = await queryset.afirst()
+            if tenant:
+                break
+
+        if not tenant and getattr(settings, "DEBUG", False):
+            tenant, _ = await Tenant.objects.aget_or_create(slug="default", defaults={"name": "Default Tenant"})
+
+        request.tenant = tenant
+        return await self.get_response(request)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenancy', '0002_tenant_slug_alter_tenantuser_role'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenant',
+            name='archive_closed_after_days',
+            field=models.PositiveIntegerField(blank=True, help_text='Archive requests resolved or closed this many days ago. Empty uses SLA_ARCHIVE_AFTER_DAYS; 0 never archives.', null=True),
+        ),
+    ]
@@ -10,6 +10,10 @@ class Tenant(models.Model):
     entra_tenant_id = models.CharField(max_length=64, blank=True, db_index=True)
     entra_group_id = models.CharField(max_length=64, blank=True, db_index=True)
     is_active = models.BooleanField(default=True)
+    archive_closed_after_days = models.PositiveIntegerField(
+        null=True, blank=True,
+        help_text="Archive requests resolved or closed this many days ago. Empty uses SLA_ARCHIVE_AFTER_DAYS; 0 never archives.",
+    )
     created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -1,7 +1,7 @@
+from decimal import Decimal
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.urls import reverse_lazy
-from django.db.models import Q
 from django.views.generic import TemplateView, ListView, CreateView, UpdateView, DeleteView, DetailView
 from django.shortcuts import redirect
 
@@ -13,8 +13,12 @@ from .core.models import (
     MicroEnterpriseType, MicroEnterpriseStatus, MEService, 
     ContractService, MEOwner
 )
-from .sla.models import ServiceRequest, SLABreachEvent
+from .sla.archive import windowed
+from .sla.models import ServiceRequest, ServiceRequestHistory, SLABreachEvent, SLABreachHistory
 from .workflows.models import WorkflowDefinition, WorkflowState, WorkflowTransition, WorkflowStateAction
+from .core.search import TenantSearchFilter
+from .pagination import KeysetPaginationMixin
+from .core.counters import COUNTED_MODELS, get_counts, get_summary
 from .workflows.services import get_active_workflow, get_initial_state_code, get_state_choices, can_transition, execute_state_actions, build_mermaid
 
 
@@ -62,6 +66,16 @@ class TenantScopedMixin:
             return qs.filter(tenant=tenant)
         return qs
 
+    def search(self, qs):
+        return TenantSearchFilter().filter_queryset(self.request, qs, self)
+
+    def archive_window(self, hot, history, field, name):
+        """``hot`` within the ?<name>_after=/?<name>_before= window, with archived rows once it reaches them."""
+        try:
+            return windowed(self.get_tenant(), self.scope_queryset(hot), self.scope_queryset(history), field, self.request.GET, name)
+        except ValueError:
+            return self.scope_queryset(hot)  # a malformed date is ignored, like the other filters
+
     def dispatch(self, request, *args, **kwargs):
         if request.method in {"POST", "PUT", "PATCH", "DELETE"} and not has_write_access(request.user, self.get_tenant()):
             raise PermissionDenied("You do not have permission to modify tenant data.")
@@ -87,13 +101,12 @@ class DashboardView(TenantScopedMixin, TemplateView):
         tenant = self.get_tenant()
 
         ctx["tenant"] = tenant
-        ctx["me_count"] = self.scope_queryset(MicroEnterprise.objects.all()).count()
-        ctx["service_count"] = self.scope_queryset(MEService.objects.all()).count()
-        ctx["contract_count"] = self.scope_queryset(MEContract.objects.all()).count()
-        ctx["vam_count"] = self.scope_queryset(VAMAgreement.objects.all()).count()
-        ctx["kpi_count"] = self.scope_queryset(MEKPI.objects.all()).count()
-        ctx["request_count"] = self.scope_queryset(ServiceRequest.objects.all()).count()
-        ctx["breach_count"] = self.scope_queryset(SLABreachEvent.objects.all()).count()
+        if tenant:
+            # Counts come from the per-tenant counter table; the live COUNT(*) is only the reconcile path.
+            ctx.update(get_counts(tenant))
+            ctx["summary"] = get_summary(tenant)
+        else:
+            ctx.update({name: model.objects.count() for name, model in COUNTED_MODELS.items()})
         return ctx
 
 
@@ -105,19 +118,17 @@ class MicroEnterpriseListView(TenantScopedMixin, ListView):
     model = MicroEnterprise
     context_object_name = "items"
     template_name = "platform_org/micro_enterprise_list.html"
+    search_fields = ["code", "name"]
 
     def get_queryset(self):
         qs = self.scope_queryset(super().get_queryset().select_related("tenant", "me_type", "status"))
-        q = self.request.GET.get("q")
         status = self.request.GET.get("status")
         me_type = self.request.GET.get("me_type")
-        if q:
-            qs = qs.filter(Q(code__icontains=q) | Q(name__icontains=q))
         if status:
             qs = qs.filter(status_id=status)
         if me_type:
             qs = qs.filter(me_type_id=me_type)
-        return qs.order_by("name")
+        return self.search(qs.order_by("name"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -198,23 +209,16 @@ class MEServiceListView(TenantScopedMixin, ListView):
     model = MEService
     context_object_name = "items"
     template_name = "platform_org/service_list.html"
+    search_fields = ["name", "description"]
 
     def get_queryset(self):
         qs = self.scope_queryset(super().get_queryset().select_related("provider_me", "sla_template", "parent"))
-        q = self.request.GET.get("q")
         provider = self.request.GET.get("provider")
-        if q:
-            qs = qs.filter(Q(name__icontains=q) | Q(description__icontains=q))
         if provider:
             qs = qs.filter(provider_me_id=provider)
-        
-        # If filtering by provider, we might want to show the tree for that provider
-        # but the current logic only shows parents.
-        if provider and not q:
-            return qs.filter(parent__isnull=True).order_by("name")
 
         # Only show parent services in the main list
-        return qs.filter(parent__isnull=True).order_by("name")
+        return self.search(qs.filter(parent__isnull=True).order_by("name"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -377,10 +381,12 @@ def service_sla_cost_delete(request, service_id):
 # Contracts
 # -------------------------
 @method_decorator(login_required, name="dispatch")
-class ContractListView(TenantScopedMixin, ListView):
+class ContractListView(KeysetPaginationMixin, TenantScopedMixin, ListView):
     model = MEContract
     context_object_name = "items"
     template_name = "platform_org/contract_list.html"
+    keyset = ("-start_date", "-id")
+    search_fields = ["code", "provider_me__name", "consumer_me__name"]
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -395,19 +401,16 @@ class ContractListView(TenantScopedMixin, ListView):
             .get_queryset()
             .select_related("tenant", "provider_me", "consumer_me")
         )
-        q = self.request.GET.get("q")
         status = self.request.GET.get("status")
         provider = self.request.GET.get("provider")
         consumer = self.request.GET.get("consumer")
-        if q:
-            qs = qs.filter(Q(code__icontains=q) | Q(provider_me__name__icontains=q) | Q(consumer_me__name__icontains=q))
         if status:
             qs = qs.filter(status=status)
         if provider:
             qs = qs.filter(provider_me__id=provider)
         if consumer:
             qs = qs.filter(consumer_me__id=consumer)
-        return qs.order_by("-start_date")
+        return self.search(qs.order_by(*self.keyset))
 
 
 @method_decorator(login_required, name="dispatch")
@@ -533,7 +536,7 @@ class ContractCreateView(TenantScopedMixin, TenantAssignMixin, CreateView):
                 
                 if should_add_cost:
                     if billing_type == "QUANTITY" and quantity:
-                        total_value += actual_cost * float(quantity)
+                        total_value += actual_cost * Decimal(quantity)
                     else:
                         total_value += actual_cost
             
@@ -642,7 +645,7 @@ class ContractUpdateView(TenantScopedMixin, UpdateView):
                 
                 if should_add_cost:
                     if billing_type == "QUANTITY" and quantity:
-                        total_value += actual_cost * float(quantity)
+                        total_value += actual_cost * Decimal(quantity)
                     else:
                         total_value += actual_cost
             
@@ -689,16 +692,14 @@ class VAMAgreementListView(TenantScopedMixin, ListView):
     model = VAMAgreement
     context_object_name = "items"
     template_name = "platform_org/vam_list.html"
+    search_fields = ["code", "me__name", "me__code"]
 
     def get_queryset(self):
         qs = self.scope_queryset(super().get_queryset().select_related("tenant", "me"))
-        q = self.request.GET.get("q")
         me_id = self.request.GET.get("me")
-        if q:
-            qs = qs.filter(Q(code__icontains=q) | Q(me__name__icontains=q) | Q(me__code__icontains=q))
         if me_id:
             qs = qs.filter(me__id=me_id)
-        return qs.order_by("-created_at")
+        return self.search(qs.order_by("-created_at"))
 
 
 @method_decorator(login_required, name="dispatch")
@@ -749,16 +750,14 @@ class KPIListView(TenantScopedMixin, ListView):
     model = MEKPI
     context_object_name = "items"
     template_name = "platform_org/kpi_list.html"
+    search_fields = ["code", "name", "me__name"]
 
     def get_queryset(self):
         qs = self.scope_queryset(super().get_queryset().select_related("tenant", "me"))
-        q = self.request.GET.get("q")
         me_id = self.request.GET.get("me")
-        if q:
-            qs = qs.filter(Q(code__icontains=q) | Q(name__icontains=q) | Q(me__name__icontains=q))
         if me_id:
             qs = qs.filter(me__id=me_id)
-        return qs.order_by("-created_at")
+        return self.search(qs.order_by("-created_at"))
 
 
 @method_decorator(login_required, name="dispatch")
@@ -805,10 +804,12 @@ class KPIDeleteView(TenantScopedMixin, DeleteView):
 # Service Requests (SLA)
 # -------------------------
 @method_decorator(login_required, name="dispatch")
-class ServiceRequestListView(TenantScopedMixin, ListView):
+class ServiceRequestListView(KeysetPaginationMixin, TenantScopedMixin, ListView):
     model = ServiceRequest
     context_object_name = "items"
     template_name = "platform_org/service_request_list.html"
+    keyset = ("-opened_at", "-id")
+    search_fields = ["title", "external_id"]
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -818,20 +819,21 @@ class ServiceRequestListView(TenantScopedMixin, ListView):
         return context
 
     def get_queryset(self):
-        qs = self.scope_queryset(super().get_queryset().select_related("tenant", "contract"))
-        q = self.request.GET.get("q")
+        qs = self.archive_window(
+            super().get_queryset().select_related("tenant", "contract"),
+            ServiceRequestHistory.objects.select_related("tenant", "contract"),
+            "opened_at", "opened",
+        )
         status = self.request.GET.get("status")
         source = self.request.GET.get("source")
         contract = self.request.GET.get("contract")
-        if q:
-            qs = qs.filter(Q(title__icontains=q) | Q(external_id__icontains=q))
         if status:
             qs = qs.filter(status=status)
         if source:
             qs = qs.filter(source=source)
         if contract:
             qs = qs.filter(contract__id=contract)
-        return qs.order_by("-opened_at")
+        return self.search(qs.order_by(*self.keyset))
 
 
 @method_decorator(login_required, name="dispatch")
@@ -889,7 +891,8 @@ class ServiceRequestDetailView(TenantScopedMixin, DetailView):
     template_name = "platform_org/service_request_detail.html"
 
     def get_queryset(self):
-        return self.scope_queryset(super().get_queryset().select_related("contract"))
+        # Archived requests stay viewable.
+        return self.scope_queryset(ServiceRequestHistory.objects.select_related("contract"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -909,20 +912,25 @@ class ServiceRequestDeleteView(TenantScopedMixin, DeleteView):
 
 
 @method_decorator(login_required, name="dispatch")
-class SLABreachesView(TenantScopedMixin, ListView):
+class SLABreachesView(KeysetPaginationMixin, TenantScopedMixin, ListView):
     model = SLABreachEvent
     context_object_name = "items"
     template_name = "platform_org/sla_breaches.html"
+    keyset = ("-breach_at", "-id")
+    search_fields = ["request__title", "request__external_id"]
+    search_vector_field = "request__search_vector"
 
     def get_queryset(self):
-        qs = self.scope_queryset(super().get_queryset().select_related("request", "tenant", "request__contract"))
+        related = ("request", "tenant", "request__contract")
+        qs = self.archive_window(
+            super().get_queryset().select_related(*related),
+            SLABreachHistory.objects.select_related(*related),
+            "breach_at", "breach",
+        )
         breach_type = self.request.GET.get("breach_type")
-        q = self.request.GET.get("q")
         if breach_type:
             qs = qs.filter(breach_type=breach_type)
-        if q:
-            qs = qs.filter(Q(request__title__icontains=q) | Q(request__external_id__icontains=q))
-        return qs.order_by("-breach_at")
+        return self.search(qs.order_by(*self.keyset))
 
 
 @method_decorator(login_required, name="dispatch")
@@ -43,7 +43,6 @@ class WorkflowTransition(models.Model):
 
     class Meta:
         unique_together = [("workflow", "from_state", "to_state")]
-<<<<<<< codex/design-and-implement-platform-org-system-533cfs
 
 
 class WorkflowStateAction(models.Model):
@@ -61,5 +60,3 @@ class WorkflowStateAction(models.Model):
 
     class Meta:
         unique_together = [("workflow", "state", "name")]
-=======
->>>>>>> master